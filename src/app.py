@@ -1,5 +1,6 @@
 # src/app.py
 
+import logging
 from pathlib import Path
 import ccxt.async_support as ccxt
 
@@ -7,13 +8,21 @@ from datetime import datetime
 from textual.app import App, ComposeResult
 from textual.reactive import reactive
 from textual.widgets import Header, Footer, Static, Button, Digits
+from textual.logging import TextualHandler
+
+from . import logger
 
 from .client.manager import DexManager, DexchangeClient
+from .client.metrics import MetricsServer, DEFAULT_METRICS_PORT
 
 from .workers.markets import fetch_ohlcv, fetch_prices, ApiDataFetched
+from .workers.pipeline import StrategyPipeline
+from .workers.snapshot import StrategySnapshot
+from .workers.events import EventBus, Scheduler, AdaptiveCadence
 
 from .screens.home import HomeScreen
 from .screens.settings import SettingsScreen
+from .screens.metrics import MetricsScreen
 from .screens.error import ErrorScreen
 
 PROJECT_ROOT = Path(__file__).parent.parent
@@ -59,23 +68,35 @@ class RealTimeTUIApp(App):
   
     dexchange_client: DexchangeClient | None = None
     dex_manager: DexManager | None = None
-    strategy_data = reactive(b"")  # Global reactive state for market data
+    strategy_exchange: str | None = None
+    strategy_pipeline: StrategyPipeline | None = None
+    strategy_data: reactive[StrategySnapshot | None] = reactive(None)  # Global reactive state for market data
     symbols: list[str] = []
+    bus: EventBus | None = None  # "prices" (venue names) and "stale" events; strategy data arrives as ApiDataFetched
+    scheduler: Scheduler | None = None
+    price_cadence: AdaptiveCadence | None = None
+    metrics_server: MetricsServer | None = None
 
     SCREENS = {
         "home": HomeScreen,
         "settings": SettingsScreen,
+        "metrics": MetricsScreen,
         "error": ErrorScreen
     }
     
     BINDINGS = [
         ("q", "quit", "quit"),
         ("s", "push_screen('settings')", "settings"), # Direct key navigation
+        ("m", "push_screen('metrics')", "metrics"),
     ]
     
     async def on_mount(self):
+        self._setup_logging()
+        self.bus = EventBus()
         try:
             self.dex_manager = DexManager(CONFIG_FILE_PATH)
+            self._setup_logging(self.dex_manager.config.get('log_file'))
+            self.strategy_pipeline = StrategyPipeline(self.dex_manager)
             
             # await self._initialize_clients()
             
@@ -95,6 +116,7 @@ class RealTimeTUIApp(App):
                 first_client_name = list(self.dex_manager.clients.keys())[0]
                 
                 self.dexchange_client = self.dex_manager.clients[first_client_name]
+                self.strategy_exchange = first_client_name
                 
                 self.symbols = self.dexchange_client.symbols
                 
@@ -105,11 +127,43 @@ class RealTimeTUIApp(App):
             self.show_error_screen()
             return
         
+        self.dex_manager.start_streams()
+        # Every price batch, polled or streamed, reaches subscribers as it lands
+        self.dex_manager.add_price_listener(lambda name, prices: self.bus.publish("prices", name))
+        
         self.push_screen("home")
         
-        self.set_interval(60.0, self.start_strategy_fetch)
-        self.set_interval(2.0, self.start_tickers_fetch)
+        config = self.dex_manager.config
+        self.price_cadence = AdaptiveCadence(
+            base=config.get('price_interval', 2.0),
+            minimum=config.get('min_price_interval', 0.5),
+            maximum=config.get('max_price_interval', 10.0),
+        )
+        self.scheduler = Scheduler(self.bus)
+        self.scheduler.every("prices", self.fetch_tickers, self.price_cadence, topic="stale")
+        self.scheduler.every("strategy", self.fetch_strategy, config.get('strategy_interval', 60.0))
+
+        # Prometheus text at /metrics, JSON at /metrics.json; metrics_port = 0 disables it
+        port = config.get('metrics_port', DEFAULT_METRICS_PORT)
+        if port:
+            self.metrics_server = MetricsServer(port=port)
+            try:
+                await self.metrics_server.start()
+            except OSError as e:
+                self.log(f"Metrics endpoint unavailable on port {port}: {e}")
+                self.metrics_server = None
    
+    def _setup_logging(self, log_file: str | None = None):
+        """Sends the package's "trader" logs to the Textual log (and `log_file`), never over the screen."""
+        if not logger.handlers:
+            logger.addHandler(TextualHandler())
+            logger.setLevel(logging.INFO)
+            logger.propagate = False
+        if log_file and not any(isinstance(handler, logging.FileHandler) for handler in logger.handlers):
+            handler = logging.FileHandler(PROJECT_ROOT / log_file)
+            handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+            logger.addHandler(handler)
+
     async def _initialize_clients(self):
         """Initialize all exchange clients asynchronously"""
         if not self.dex_manager or not self.dex_manager.clients:
@@ -127,6 +181,7 @@ class RealTimeTUIApp(App):
         # Set default strategy client
         first_client_name = list(self.dex_manager.clients.keys())[0]
         self.dexchange_client = self.dex_manager.clients[first_client_name]
+        self.strategy_exchange = first_client_name
         self.symbols = self.dexchange_client.symbols
         
         self.log(f"📊 Default strategy client: {first_client_name}")
@@ -137,11 +192,25 @@ class RealTimeTUIApp(App):
                 balance = await client.solana_client.get_balance()
                 self.log(f"💰 {client_name} wallet balance: {balance:.4f} SOL")
      
-    def start_tickers_fetch(self):
-        self.run_worker(fetch_prices(self), exclusive=True)
+    async def fetch_tickers(self):
+        """One price poll; the next comes sooner when prices move, never faster than rate limits allow."""
+        await fetch_prices(self)
+        self.price_cadence.observe(self.dex_manager.price_move())
+        self.price_cadence.floor = self.dex_manager.min_poll_interval()
                 
-    def start_strategy_fetch(self):
-        self.run_worker(fetch_ohlcv(self), exclusive=True)
+    async def fetch_strategy(self):
+        await fetch_ohlcv(self)
+        
+    async def on_unmount(self):
+        if self.scheduler is not None:
+            self.scheduler.close()
+        if self.metrics_server is not None:
+            await self.metrics_server.close()
+        # Process pools, shared memory, streams and pooled HTTP sessions all outlive the UI otherwise
+        if self.strategy_pipeline is not None:
+            self.strategy_pipeline.close()
+        if self.dex_manager is not None:
+            await self.dex_manager.close_all()
         
     def on_api_data_fetched(self, message: ApiDataFetched):
             """Called when ApiDataFetched message is received from the worker."""
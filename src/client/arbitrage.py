@@ -0,0 +1,110 @@
+# src/client/arbitrage.py
+
+import heapq
+import time
+from typing import Callable, Dict, List, Optional
+
+DEFAULT_TAKER_FEE = 0.001  # 0.1% when a venue doesn't say otherwise
+
+
+class Opportunity:
+    """Buy `symbol` on one venue and sell it on another, net of both taker fees."""
+    __slots__ = ("symbol", "buy_venue", "sell_venue", "buy_price", "sell_price", "net_spread", "timestamp")
+
+    def __init__(self, symbol: str, buy_venue: str, sell_venue: str,
+                 buy_price: float, sell_price: float, net_spread: float):
+        self.symbol = symbol
+        self.buy_venue = buy_venue
+        self.sell_venue = sell_venue
+        self.buy_price = buy_price
+        self.sell_price = sell_price
+        self.net_spread = net_spread # fraction of notional kept after fees
+        self.timestamp = time.time()
+
+    def __repr__(self) -> str:
+        return (f"Opportunity({self.symbol}: buy {self.buy_venue} @ {self.buy_price}, "
+                f"sell {self.sell_venue} @ {self.sell_price}, net {self.net_spread:.4%})")
+
+
+class ArbitrageScanner:
+    """
+    Watches prices across every venue and keeps the best fee-adjusted
+    cross-venue trade per symbol. Prices are indexed symbol -> venue -> price,
+    so an update only re-evaluates the symbols whose price actually changed,
+    at O(venues) each, instead of rescanning the whole universe.
+    """
+    def __init__(self, fees: Optional[Dict[str, float]] = None, min_spread: float = 0.0,
+                 on_opportunity: Optional[Callable[[Opportunity], None]] = None):
+        self.fees = fees or {}
+        self.min_spread = min_spread
+        self.on_opportunity = on_opportunity
+        self._prices: Dict[str, Dict[str, float]] = {}
+        self._best: Dict[str, Opportunity] = {}
+        self.last_eval_ns = 0 # cost of the most recent update() call
+
+    def fee(self, venue: str) -> float:
+        return self.fees.get(venue, DEFAULT_TAKER_FEE)
+
+    def update(self, venue: str, prices: Dict[str, float | None]) -> List[str]:
+        """
+        Records a venue's latest prices and re-evaluates the symbols that
+        changed. Returns those symbols.
+        """
+        start = time.perf_counter_ns()
+        changed = []
+        for symbol, price in prices.items():
+            venues = self._prices.setdefault(symbol, {})
+            if price is None or price <= 0:
+                if venues.pop(venue, None) is None:
+                    continue
+            elif venues.get(venue) == price:
+                continue
+            else:
+                venues[venue] = price
+            changed.append(symbol)
+            self._evaluate(symbol)
+        self.last_eval_ns = time.perf_counter_ns() - start
+        return changed
+
+    def remove_venue(self, venue: str):
+        """Drops a venue's prices, e.g. when it goes stale."""
+        self.update(venue, {symbol: None for symbol, venues in self._prices.items() if venue in venues})
+
+    def _evaluate(self, symbol: str):
+        venues = self._prices[symbol]
+        if len(venues) < 2:
+            self._best.pop(symbol, None)
+            return
+
+        # Best two effective buy costs and sell proceeds, so the best pair
+        # can fall back to the runner-up when both sides land on one venue
+        buys = heapq.nsmallest(2, ((price * (1 + self.fee(venue)), venue, price) for venue, price in venues.items()))
+        sells = heapq.nlargest(2, ((price * (1 - self.fee(venue)), venue, price) for venue, price in venues.items()))
+
+        buy, sell = buys[0], sells[0]
+        if buy[1] == sell[1]:
+            alt_buy, alt_sell = buys[1], sells[1]
+            if sell[0] / alt_buy[0] >= alt_sell[0] / buy[0]:
+                buy = alt_buy
+            else:
+                sell = alt_sell
+
+        net_spread = sell[0] / buy[0] - 1
+        if net_spread <= self.min_spread:
+            self._best.pop(symbol, None)
+            return
+
+        opportunity = Opportunity(symbol, buy[1], sell[1], buy[2], sell[2], net_spread)
+        self._best[symbol] = opportunity
+        if self.on_opportunity:
+            self.on_opportunity(opportunity)
+
+    def opportunities(self, limit: int | None = None) -> List[Opportunity]:
+        """Current opportunities, best net spread first."""
+        ranked = self._best.values()
+        if limit is not None:
+            return heapq.nlargest(limit, ranked, key=lambda o: o.net_spread)
+        return sorted(ranked, key=lambda o: o.net_spread, reverse=True)
+
+    def best(self, symbol: str) -> Opportunity | None:
+        return self._best.get(symbol)
@@ -0,0 +1,124 @@
+# src/client/candles.py
+
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Tuple
+
+from .metrics import metrics
+from .store import MarketStore
+
+CandleKey = Tuple[str, str, str]  # (exchange, symbol, timeframe)
+
+logger = logging.getLogger("trader.client.candles")
+
+
+class CandleStore:
+    """
+    Per-(exchange, symbol, timeframe) OHLCV cache.
+    After the first full download only bars from the last cached timestamp
+    onwards are fetched; the still-open candle is replaced in place and old
+    bars fall off the end of a fixed-size ring buffer.
+
+    With a MarketStore attached, a cold cache is filled from disk first and
+    every fetched bar is persisted, so a restart only downloads the bars
+    that closed while the app was down. Store reads and writes run on a
+    worker thread, so a slow disk (or a tick flush holding the store)
+    never stalls the event loop.
+    """
+    def __init__(self, max_bars: int = 500, store: MarketStore | None = None):
+        self.max_bars = max_bars
+        self.store = store
+        self._candles: Dict[CandleKey, Deque[list]] = {}
+        self._warmed: set[CandleKey] = set()
+        # Largest `limit` fully downloaded per key; a series shorter than that has no more history to fetch
+        self._history: Dict[CandleKey, int] = {}
+
+    def get(self, exchange: str, symbol: str, timeframe: str, limit: int | None = None) -> List[list]:
+        """Cached candles, oldest first, optionally only the last `limit`."""
+        candles = list(self._candles.get((exchange, symbol, timeframe), ()))
+        if limit is not None:
+            candles = candles[-limit:]
+        return candles
+
+    def last_timestamp(self, exchange: str, symbol: str, timeframe: str) -> int | None:
+        candles = self._candles.get((exchange, symbol, timeframe))
+        return candles[-1][0] if candles else None
+
+    def merge(self, exchange: str, symbol: str, timeframe: str, new_candles: List[list]) -> int:
+        """
+        Merges freshly fetched candles into the cache. Any cached bar at or
+        after the first new timestamp (normally just the open candle) is
+        replaced. Returns the number of bars that were not cached before.
+        """
+        key = (exchange, symbol, timeframe)
+        candles = self._candles.setdefault(key, deque(maxlen=self.max_bars))
+        if not new_candles:
+            return 0
+
+        new_candles = sorted(new_candles, key=lambda candle: candle[0])
+        first_ts = new_candles[0][0]
+        last_cached_ts = candles[-1][0] if candles else None
+
+        while candles and candles[-1][0] >= first_ts:
+            candles.pop()
+
+        added = 0
+        for candle in new_candles:
+            if candles and candle[0] <= candles[-1][0]:
+                continue # Exchanges occasionally repeat a bar in one response
+            candles.append(candle)
+            if last_cached_ts is None or candle[0] > last_cached_ts:
+                added += 1
+        return added
+
+    async def update(self, client: Any, exchange: str, symbol: str, timeframe: str, limit: int) -> List[list]:
+        """
+        Brings the cache up to date from `client.fetch_ohlcv` and returns the
+        last `limit` candles. Only the first call downloads the full history.
+        """
+        key = (exchange, symbol, timeframe)
+        candles = self._candles.get(key)
+        if candles is None or (candles.maxlen or 0) < limit:
+            self._candles[key] = deque(candles or (), maxlen=max(self.max_bars, limit))
+
+        if self.store is not None and key not in self._warmed:
+            self._warmed.add(key)
+            await self._warm_start(key)
+        last_ts = self.last_timestamp(exchange, symbol, timeframe)
+
+        short = len(self._candles[key]) < limit and self._history.get(key, 0) < limit
+        if last_ts is None or short or self._too_old(client, timeframe, last_ts, limit):
+            new_candles = await client.fetch_ohlcv(symbol, timeframe, limit=limit)
+            self._history[key] = max(self._history.get(key, 0), limit)
+        else:
+            # `since` is inclusive, so the still-open candle comes back updated
+            new_candles = await client.fetch_ohlcv(symbol, timeframe, since=last_ts)
+
+        self.merge(exchange, symbol, timeframe, new_candles or [])
+        if self.store is not None and new_candles:
+            try:
+                await asyncio.to_thread(self.store.append_candles, exchange, symbol, timeframe, new_candles)
+            except Exception as e:
+                metrics.increment('failures', component='candle_store')
+                logger.warning("Could not persist candles for %s %s %s: %s", exchange, symbol, timeframe, e)
+        return self.get(exchange, symbol, timeframe, limit)
+
+    async def _warm_start(self, key: CandleKey):
+        """Loads the newest stored bars for `key` into the cache."""
+        stored = await asyncio.to_thread(self.store.candles, *key, limit=self._candles[key].maxlen)
+        if len(stored):
+            self.merge(*key, [[int(row[0]), *row[1:]] for row in stored.tolist()])
+
+    @staticmethod
+    def _too_old(client: Any, timeframe: str, last_ts: int, limit: int) -> bool:
+        """
+        Whether more than `limit` bars have closed since `last_ts`; fetching
+        from there would page through old history instead of reaching now.
+        """
+        try:
+            bar_ms = client.parse_timeframe(timeframe) * 1000
+        except Exception:
+            return False
+        return time.time() * 1000 - last_ts > bar_ms * limit
@@ -0,0 +1,214 @@
+# src/client/endpoints.py
+
+import asyncio
+import logging
+import time
+from typing import Awaitable, Callable, List, TypeVar
+from urllib.parse import urlparse
+
+from solana.rpc.async_api import AsyncClient
+from solana.rpc.commitment import Confirmed
+
+from .metrics import metrics
+from .sessions import SessionRegistry
+
+SLOT_TIME = 0.4              # seconds per slot; turns slot lag into latency
+LATENCY_SMOOTHING = 0.3      # EWMA weight of the newest sample
+DEFAULT_HEDGE = 2            # endpoints raced per read
+DEFAULT_PROBE_INTERVAL = 5.0 # seconds between getSlot health probes
+DEFAULT_MAX_SLOT_LAG = 20    # slots behind the best node before ejection
+DEFAULT_EJECT_AFTER = 3      # consecutive failures before ejection
+DEFAULT_EJECT_SECONDS = 30.0 # minimum time out of rotation
+
+T = TypeVar("T")
+
+logger = logging.getLogger("trader.client.endpoints")
+
+
+def redact_url(url: str) -> str:
+    """scheme://host[:port] of an RPC URL; providers put API keys in the path, query or userinfo"""
+    parsed = urlparse(url)
+    host = parsed.hostname or "?"
+    if parsed.port:
+        host = f"{host}:{parsed.port}"
+    return f"{parsed.scheme}://{host}" if parsed.scheme else host
+
+
+class Endpoint:
+    """One RPC node and its health: smoothed latency, slot and failure streak."""
+    def __init__(self, url: str, client: AsyncClient, order: int):
+        self.url = url
+        self.name = redact_url(url) # for logs and metric labels, never the raw URL
+        self.client = client
+        self.order = order # config position, breaks ties before anything is measured
+        self.latency: float | None = None
+        self.slot = 0
+        self.slot_lag = 0
+        self.failures = 0
+        self.ejected_until = 0.0
+        self.eject_reason = ""
+
+    @property
+    def healthy(self) -> bool:
+        return time.monotonic() >= self.ejected_until
+
+    @property
+    def score(self) -> float:
+        """Expected seconds to a fresh answer; lower is better"""
+        return (self.latency or 0.0) + self.slot_lag * SLOT_TIME
+
+    def record_success(self, elapsed: float):
+        self.failures = 0
+        if self.latency is None:
+            self.latency = elapsed
+        else:
+            self.latency += LATENCY_SMOOTHING * (elapsed - self.latency)
+
+    def __repr__(self) -> str:
+        latency = f"{self.latency * 1000:.0f}ms" if self.latency is not None else "?"
+        state = "up" if self.healthy else f"ejected ({self.eject_reason})"
+        return f"Endpoint({self.name}, {latency}, lag {self.slot_lag}, {state})"
+
+
+class EndpointPool:
+    """
+    Several RPC endpoints for one DEX behind a single read interface.
+    Reads are hedged: the best `hedge` healthy endpoints get the same
+    request and the first answer wins. A background probe tracks every
+    node's getSlot latency and slot lag; nodes that fail repeatedly or
+    fall too far behind are ejected and come back once a probe finds
+    them healthy again.
+    """
+    def __init__(self, urls: List[str], sessions: SessionRegistry | None = None,
+                 hedge: int = DEFAULT_HEDGE,
+                 probe_interval: float = DEFAULT_PROBE_INTERVAL,
+                 max_slot_lag: int = DEFAULT_MAX_SLOT_LAG,
+                 eject_after: int = DEFAULT_EJECT_AFTER,
+                 eject_seconds: float = DEFAULT_EJECT_SECONDS):
+        self.sessions = sessions
+        self.hedge = hedge
+        self.probe_interval = probe_interval
+        self.max_slot_lag = max_slot_lag
+        self.eject_after = eject_after
+        self.eject_seconds = eject_seconds
+        self.endpoints = [
+            Endpoint(url, sessions.acquire_rpc(url) if sessions else AsyncClient(url), order)
+            for order, url in enumerate(dict.fromkeys(urls))
+        ]
+        # Endpoints on the same host (different keys or paths) still need distinct names
+        hosts = [endpoint.name for endpoint in self.endpoints]
+        for endpoint in self.endpoints:
+            if hosts.count(endpoint.name) > 1:
+                endpoint.name = f"{endpoint.name}#{endpoint.order}"
+        self._probe_task: asyncio.Task | None = None
+
+    def start(self):
+        """Starts health probing; must be called from a running event loop."""
+        if len(self.endpoints) > 1 and (self._probe_task is None or self._probe_task.done()):
+            self._probe_task = asyncio.create_task(self._probe_loop())
+
+    def ranked(self) -> List[Endpoint]:
+        """Healthy endpoints, best first; every endpoint if none is healthy."""
+        healthy = [endpoint for endpoint in self.endpoints if endpoint.healthy]
+        return sorted(healthy or self.endpoints, key=lambda e: (e.score, e.order))
+
+    @property
+    def primary(self) -> AsyncClient:
+        return self.ranked()[0].client
+
+    def eject(self, endpoint: Endpoint, reason: str):
+        if endpoint.healthy:
+            metrics.increment('rpc_ejections', endpoint=endpoint.name)
+            logger.warning("Ejecting RPC %s: %s", endpoint.name, reason)
+        endpoint.ejected_until = time.monotonic() + self.eject_seconds
+        endpoint.eject_reason = reason
+
+    def _record_failure(self, endpoint: Endpoint, error: Exception):
+        endpoint.failures += 1
+        if endpoint.failures >= self.eject_after:
+            self.eject(endpoint, f"{endpoint.failures} consecutive failures ({error!r})")
+
+    async def _timed(self, endpoint: Endpoint, call: Callable[[AsyncClient], Awaitable[T]]) -> T:
+        start = time.perf_counter()
+        try:
+            result = await call(endpoint.client)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            metrics.increment('rpc_errors', endpoint=endpoint.name)
+            self._record_failure(endpoint, e)
+            raise
+        elapsed = time.perf_counter() - start
+        endpoint.record_success(elapsed)
+        metrics.observe('rpc_seconds', elapsed, endpoint=endpoint.name)
+        return result
+
+    async def read(self, call: Callable[[AsyncClient], Awaitable[T]]) -> T:
+        """
+        Runs `call(client)` on the top endpoints at once and returns the first
+        successful result, cancelling the rest. If the raced endpoints all fail,
+        the remaining ones are tried in rank order before giving up.
+        """
+        ranked = self.ranked()
+        racers, reserves = ranked[:self.hedge], ranked[self.hedge:]
+
+        tasks = {asyncio.create_task(self._timed(endpoint, call)) for endpoint in racers}
+        error: Exception | None = None
+        try:
+            while tasks:
+                done, tasks = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+                    error = task.exception()
+        finally:
+            for task in tasks:
+                task.cancel()
+
+        for endpoint in reserves:
+            try:
+                return await self._timed(endpoint, call)
+            except Exception as e:
+                error = e
+        raise error
+
+    async def probe(self):
+        """One health pass: getSlot on every endpoint, then slot lag and ejection."""
+        async def probe_one(endpoint: Endpoint):
+            try:
+                endpoint.slot = (await self._timed(endpoint, lambda client: client.get_slot(Confirmed))).value
+            except Exception:
+                pass
+
+        await asyncio.gather(*(probe_one(endpoint) for endpoint in self.endpoints))
+        best_slot = max(endpoint.slot for endpoint in self.endpoints)
+        for endpoint in self.endpoints:
+            if not endpoint.slot:
+                continue
+            endpoint.slot_lag = best_slot - endpoint.slot
+            if endpoint.slot_lag > self.max_slot_lag:
+                self.eject(endpoint, f"{endpoint.slot_lag} slots behind")
+            elif not endpoint.healthy and endpoint.failures == 0:
+                # Answering and caught up again: back into rotation
+                endpoint.ejected_until = 0.0
+                logger.info("RPC %s back in rotation", endpoint.name)
+
+    async def _probe_loop(self):
+        while True:
+            try:
+                await self.probe()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                metrics.increment('failures', component='rpc_probe')
+                logger.warning("RPC health probe failed: %s", e)
+            await asyncio.sleep(self.probe_interval)
+
+    async def close(self):
+        if self._probe_task is not None:
+            self._probe_task.cancel()
+        for endpoint in self.endpoints:
+            if self.sessions:
+                await self.sessions.release_rpc(endpoint.url)
+            else:
+                await endpoint.client.close()
@@ -1,17 +1,34 @@
 # src/client/manager.py
 
 import ccxt.async_support as ccxt
+import ccxt.pro as ccxtpro
 import toml
 import asyncio
+import contextlib
 import os
+import time
+import logging
 import base58                
+import numpy as np
+from pathlib import Path
 from solders.keypair import Keypair
 
 
-from typing import Dict, Any, List
+from typing import Callable, Dict, Any, Iterable, List, Tuple
 
 
-from .solana import SolanaClient
+from .solana import SolanaClient, STREAM_BACKOFF_MIN, STREAM_BACKOFF_MAX
+from .candles import CandleStore
+from .prices import PriceMatrix
+from .store import MarketStore, DEFAULT_MAX_OPEN_FILES
+from .arbitrage import ArbitrageScanner, DEFAULT_TAKER_FEE
+from .routes import TokenGraph, DEFAULT_MAX_HOPS
+from .sessions import SessionRegistry
+from .endpoints import DEFAULT_HEDGE, DEFAULT_MAX_SLOT_LAG
+from .orderbook import OrderBook, executable_arbitrage
+from .orders import OrderEngine, OrderBatch, OrderRequest, DEFAULT_VENUE_CONCURRENCY
+from .ratelimit import VenueLimiter, PRIORITY_ORDER, PRIORITY_MARKET_DATA, retry_after
+from .metrics import metrics
 
 MAINNET_TOKEN_PAIRS = {
             "SOL/USDC": ("So11111111111111111111111111111111111111112", "EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v"),
@@ -34,21 +51,35 @@ DEV_PAIR_ADDRESSES = {
         }   
 
 
+logger = logging.getLogger("trader.client.manager")
+
+
 class DexchangeClient:
     """
     Manages all API interaction for a single dexchange.
     """
-    def __init__(self, ccxt_client_instance: ccxt.Exchange, symbols_list: List[str], client_config: Dict[str, Any]):
+    def __init__(self, ccxt_client_instance: ccxt.Exchange, symbols_list: List[str], client_config: Dict[str, Any],
+                 sessions: SessionRegistry | None = None, limiter: VenueLimiter | None = None):
        self._client = ccxt_client_instance
+       self.sessions = sessions
+       # REST budget shared by every call to this venue; None leaves throttling to ccxt
+       self.limiter = limiter
        self.symbols = symbols_list
        self.config = client_config 
        self.symbols = client_config.get('symbols', [])
        self.is_dex = client_config.get('is_dex', False)
+       self.stream = client_config.get('stream', False)
        self.id = client_config.get('id', 'unknown_exchange')
        
        self.solana_client = None
+       self.pool_prices: Dict[str, float] = {}
+       # symbol -> latest ccxt ticker, so bid/ask reach the price matrix alongside last
+       self.tickers: Dict[str, Dict[str, Any]] = {}
+       self._latest: Dict[str, float | None] = dict.fromkeys(self.symbols)
+       # symbol -> local L2 book, kept current by stream_order_books()
+       self.order_books: Dict[str, OrderBook] = {}
        
-       if self.is_dex and client_config.get('rpc_url'):
+       if self.is_dex and (client_config.get('rpc_url') or client_config.get('rpc_urls')):
             self._initialize_solana_client(client_config)
    
     def __getattr__(self, name: str) -> Any:
@@ -64,29 +95,65 @@ class DexchangeClient:
             private_key = self.config.get('wallet_private_key', '')
             
             if not private_key or private_key == "3SbpjTnpowgFhvgZwpTeqKK86DdbJRdvQTYk5LBtZxjY":
-                print(f"Warning: No private key found for DEX {self.id}")
+                logger.warning("No private key found for DEX %s", self.id)
                 test_wallet = Keypair()
                 private_key = base58.b58encode(bytes(test_wallet)).decode('utf-8')
                 
-                print(f"📝 Generated test wallet: {test_wallet.pubkey()}")
+                logger.info("Generated test wallet: %s", test_wallet.pubkey())
                 
             self.solana_client = SolanaClient(
-                rpc_url=config['rpc_url'],
+                rpc_url=config.get('rpc_url') or config['rpc_urls'][0],
                 wallet_private_key=private_key,
-                program_id=config.get('program_id', 'Gz1uGFbdpM9Bn255ydYmCRgM1JZNiEYFC68pVi3Bhwfg')
+                program_id=config.get('program_id', 'Gz1uGFbdpM9Bn255ydYmCRgM1JZNiEYFC68pVi3Bhwfg'),
+                ws_url=config.get('ws_url'),
+                compute_unit_limit=config.get('compute_unit_limit'),
+                compute_unit_price=config.get('compute_unit_price'),
+                sessions=self.sessions,
+                rpc_urls=config.get('rpc_urls'),
+                rpc_hedge=config.get('rpc_hedge', DEFAULT_HEDGE),
+                rpc_max_slot_lag=config.get('rpc_max_slot_lag', DEFAULT_MAX_SLOT_LAG),
             )
             
-            print(f"✅ Solana client initialized for {self.id}")
+            logger.info("Solana client initialized for %s", self.id)
 
         except ImportError:
-            print("Solana dependencies not available")
+            logger.error("Solana dependencies not available")
         except Exception as e:
-            print(f"Failed to initialize Solana client: {e}")
+            metrics.increment('failures', component='client_init', venue=self.id)
+            logger.error("Failed to initialize Solana client: %s", e)
     
+    async def _request(self, priority: int, method: str, *args, **kwargs) -> Any:
+        """Calls a ccxt REST method once the venue's limiter has budget for it."""
+        call = getattr(self._client, method)
+        if self.limiter is not None:
+            queued = time.perf_counter()
+            await self.limiter.acquire(self.limiter.cost(method), priority)
+            metrics.observe('request_wait_seconds', time.perf_counter() - queued, venue=self.id)
+        start = time.perf_counter()
+        try:
+            result = await call(*args, **kwargs)
+        except (ccxt.RateLimitExceeded, ccxt.DDoSProtection):
+            metrics.increment('request_errors', venue=self.id, method=method, reason='rate_limit')
+            if self.limiter is not None:
+                self.limiter.penalize(retry_after(self._client))
+            raise
+        except Exception:
+            metrics.increment('request_errors', venue=self.id, method=method, reason='error')
+            raise
+        finally:
+            metrics.observe('request_seconds', time.perf_counter() - start, venue=self.id, method=method)
+        if self.limiter is not None:
+            self.limiter.reward()
+        return result
+
+    async def fetch_ohlcv(self, symbol: str, timeframe: str = '1m', since: int | None = None,
+                          limit: int | None = None) -> List[list]:
+        return await self._request(PRIORITY_MARKET_DATA, 'fetch_ohlcv', symbol, timeframe, since=since, limit=limit)
+
     def _parse_symbol(self, symbol: str) -> tuple[str, str]:
         """Parse trading symbol into token addresses"""
         # Map symbols to actual Solana token addresses
-        token_map = TOKEN_PAIRS
+        token_map = MAINNET_TOKEN_PAIRS
         base, quote = symbol.split('/')
         return token_map.get(symbol, (base, quote))
     
@@ -96,16 +163,31 @@ class DexchangeClient:
         amm_map = MAINNET_PAIR_ADDRESSES
         return amm_map.get(symbol, "")
 
-    async def create_order(self, symbol: str, side: str, amount: float, price: float = None):
+    def _resolve_pools(self) -> Dict[str, tuple[str, str, str]]:
+        """Map every known pool and configured symbol to (amm_address, token_a, token_b)"""
+        pools = {}
+        for symbol in list(MAINNET_PAIR_ADDRESSES) + self.symbols:
+            amm_address = self._get_amm_address(symbol)
+            if amm_address:
+                # Map symbol to Solana token addresses
+                token_a, token_b = self._parse_symbol(symbol)
+                pools[symbol] = (amm_address, token_a, token_b)
+        return pools
+
+    async def create_order(self, symbol: str, side: str, amount: float, price: float = None,
+                           params: Dict[str, Any] | None = None, raise_errors: bool = False):
         """
         Overrides the create_order method.
-        Executes custom DEX logic or falls back to ccxt.
+        Executes custom DEX logic or falls back to ccxt. `params` go to the venue
+        as-is (e.g. clientOrderId); with `raise_errors` failures propagate instead
+        of returning None, so callers can tell a timeout from a rejection.
         """
         order_type = 'limit' if price else 'market'
+        params = params or {}
 
         if self.is_dex:
             # --- CUSTOM DEX LOGIC ---
-            print(f"Executing custom DEX order logic for {self.id}...")
+            logger.info("Executing custom DEX order logic for %s", self.id)
             # Placeholder for your Rust interaction:
             # Example:
             # command = [
@@ -134,29 +216,33 @@ class DexchangeClient:
             #      return None
 
             # --- For now, just simulate ---
-            print("SIMULATED DEX order placed.")
+            logger.info("SIMULATED DEX order placed")
             await asyncio.sleep(0.1) # Simulate async work
-            return {"info": "Simulated DEX Order", "id": "dex-order-123", "symbol": symbol}
+            return {"info": "Simulated DEX Order", "id": "dex-order-123", "symbol": symbol,
+                    "clientOrderId": params.get('clientOrderId')}
             # --- END CUSTOM DEX LOGIC ---
 
         else:
             if not self._client:
-                 print(f"Error: ccxt client not available for {self.id}")
+                 logger.error("ccxt client not available for %s", self.id)
                  return None
             try:
-                order = await self._client.create_order(symbol, order_type, side, amount, price)
+                order = await self._request(PRIORITY_ORDER, 'create_order', symbol, order_type, side, amount, price, params)
                 return order
             except Exception as e:
+                if raise_errors:
+                    raise
                 # Use self.id (from __getattr__) for logging CEX ID
-                print(f"CEX Order failed on {self.id}: {e}")
+                logger.error("CEX Order failed on %s: %s", self.id, e)
                 return None
 
     async def fetch_latest_prices(self) -> Dict[str, float]:
         """
         Fetches the most recent price for all tracked symbols.
-        Returns a dict like {'BTC/USDT': 60000.50}
+        Returns a dict like {'BTC/USDT': 60000.50}; the same dict is
+        refilled on every call, so copy it to keep a tick's prices.
         """
-        prices = {}
+        prices = self._latest
        
         if self.is_dex:
             try:
@@ -164,29 +250,24 @@ class DexchangeClient:
                     await self.solana_client.initialize()
                     self._solana_initialized = True
                 
+                # Resolve every known pool plus every configured symbol in one batched call
+                self.pool_prices = await self.solana_client.get_amm_prices(self._resolve_pools())
+                
                 for symbol in self.symbols:
-                    # Map symbol to Solana token addresses
-                    token_a, token_b = self._parse_symbol(symbol)
-                    amm_address = self._get_amm_address(symbol)
-                    
-                    if amm_address:
-                        price = await self.solana_client.get_amm_price(
-                            amm_address, token_a, token_b
-                        )
-                        prices[symbol] = price
-                    else:
-                        prices[symbol] = None
+                    prices[symbol] = self.pool_prices.get(symbol)
                         
             except Exception as e:
-                print(f"Error fetching {self.id} DEX prices from SOL: {e}")
+                metrics.increment('failures', component='price_fetch', venue=self.id)
+                logger.warning("Error fetching %s DEX prices from SOL: %s", self.id, e)
                 for symbol in self.symbols:
                     prices[symbol] = None
         else:
             if not self._client:
-                print(f"Error: ccxt client not available for {self.id}")
+                logger.error("ccxt client not available for %s", self.id)
                 return None
             try:
-                tickers = await self._client.fetch_tickers(self.symbols)
+                tickers = await self._request(PRIORITY_MARKET_DATA, 'fetch_tickers', self.symbols)
+                self.tickers = tickers
                 for symbol in self.symbols:
                     # 3. Look up the symbol in the (potentially unordered) tickers dict
                     ticker_data = tickers.get(symbol)
@@ -198,20 +279,155 @@ class DexchangeClient:
                         # Handle if dexchange didn't return data for a symbol
                         prices[symbol] = None
             except Exception as e:
-                print(f"Error fetching prices for {self.id}: {e}")
+                metrics.increment('failures', component='price_fetch', venue=self.id)
+                logger.warning("Error fetching prices for %s: %s", self.id, e)
                 for symbol in self.symbols:
                     prices[symbol] = None
                 
         return prices
 
+    async def stream_prices(self, on_update: Callable[[str, float], None]):
+        """
+        Pushes prices to `on_update(symbol, price)` as they change instead of polling.
+        DEX clients subscribe to their pool accounts, CEX clients use ccxt's
+        websocket watchers; runs until cancelled.
+        """
+        if not self.is_dex:
+            await self._stream_tickers(on_update)
+            return
+        
+        if not self.solana_client:
+            logger.warning("Streaming not supported for %s", self.id)
+            return
+        
+        if not hasattr(self, '_solana_initialized'):
+            await self.solana_client.initialize()
+            self._solana_initialized = True
+        
+        def on_pool_price(symbol: str, price: float):
+            self.pool_prices[symbol] = price
+            if symbol in self.symbols:
+                on_update(symbol, price)
+        
+        await self.solana_client.stream_pool_prices(self._resolve_pools(), on_pool_price)
+
+    async def _stream_tickers(self, on_update: Callable[[str, float], None]):
+        """
+        Streams CEX tickers with watch_tickers, or one watch_ticker per symbol,
+        falling back to REST polling when the venue has no websocket support.
+        """
+        if not self._client:
+            logger.error("ccxt client not available for %s", self.id)
+            return
+        
+        has = getattr(self._client, 'has', {}) or {}
+        
+        if has.get('watchTickers'):
+            logger.info("%s: streaming via watch_tickers", self.id)
+            await self._watch_loop(lambda: self._client.watch_tickers(self.symbols), on_update)
+        elif has.get('watchTicker'):
+            logger.info("%s: streaming via watch_ticker", self.id)
+            # Without ccxt's throttle (our limiter owns REST), space out the subscribe messages ourselves
+            spacing = 0.0 if self._client.enableRateLimit else (getattr(self._client, 'rateLimit', 0) or 0) / 1000
+            await asyncio.gather(*(
+                self._watch_loop(lambda symbol=symbol: self._watch_one(symbol), on_update, delay=i * spacing)
+                for i, symbol in enumerate(self.symbols)
+            ))
+        else:
+            logger.info("%s has no websocket tickers, falling back to REST polling", self.id)
+            interval = self.config.get('poll_interval', 2.0)
+            while True:
+                prices = await self.fetch_latest_prices() or {}
+                for symbol, price in prices.items():
+                    on_update(symbol, price)
+                await asyncio.sleep(interval)
+
+    async def _watch_one(self, symbol: str) -> Dict[str, Any]:
+        ticker = await self._client.watch_ticker(symbol)
+        return {symbol: ticker}
+
+    async def _watch_loop(self, watch: Callable, on_update: Callable[[str, float], None], delay: float = 0.0):
+        """Awaits `watch()` forever, after `delay`, forwarding every ticker update and backing off on errors."""
+        if delay > 0:
+            await asyncio.sleep(delay)
+        backoff = STREAM_BACKOFF_MIN
+        while True:
+            try:
+                tickers = await watch()
+                backoff = STREAM_BACKOFF_MIN
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                metrics.increment('failures', component='ticker_stream', venue=self.id)
+                logger.warning("Ticker stream error for %s (%s), retrying in %.0fs", self.id, e, backoff)
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, STREAM_BACKOFF_MAX)
+                continue
+            
+            for symbol, ticker in tickers.items():
+                if symbol in self.symbols and ticker and ticker.get('last') is not None:
+                    self.tickers[symbol] = ticker
+                    on_update(symbol, ticker['last'])
+
+    async def stream_order_books(self, on_update: Callable[[str, OrderBook], None] | None = None):
+        """
+        Keeps `order_books` current from watch_order_book, one watcher per symbol.
+        ccxt.pro merges the venue's deltas itself and hands back the merged book,
+        so each update lands as a snapshot; a nonce that goes backwards or a
+        stream error triggers a REST resync. Runs until cancelled.
+        """
+        has = getattr(self._client, 'has', {}) or {}
+        if self.is_dex or not has.get('watchOrderBook'):
+            logger.info("%s has no websocket order books", self.id)
+            return
+        await asyncio.gather(*(self._watch_book(symbol, on_update) for symbol in self.symbols))
+
+    async def _resync_book(self, symbol: str) -> OrderBook:
+        book = self.order_books.setdefault(symbol, OrderBook(symbol))
+        snapshot = await self._request(PRIORITY_MARKET_DATA, 'fetch_order_book', symbol, self.config.get('book_depth'))
+        book.apply_snapshot(snapshot['bids'], snapshot['asks'], snapshot.get('nonce'), snapshot.get('timestamp'))
+        book.resyncs += 1
+        return book
+
+    async def _watch_book(self, symbol: str, on_update: Callable[[str, OrderBook], None] | None):
+        backoff = STREAM_BACKOFF_MIN
+        depth = self.config.get('book_depth')
+        book = self.order_books.setdefault(symbol, OrderBook(symbol))
+        while True:
+            try:
+                if not book.synced:
+                    book = await self._resync_book(symbol)
+                update = await self._client.watch_order_book(symbol, depth)
+                backoff = STREAM_BACKOFF_MIN
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                book.synced = False
+                metrics.increment('failures', component='book_stream', venue=self.id)
+                logger.warning("Order book stream error for %s %s (%s), resyncing in %.0fs", self.id, symbol, e, backoff)
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, STREAM_BACKOFF_MAX)
+                continue
+            
+            nonce = update.get('nonce')
+            if nonce is not None and book.sequence is not None and nonce < book.sequence:
+                # The feed went back in time: don't trust it until a fresh snapshot
+                book.synced = False
+                continue
+            book.apply_snapshot(update['bids'], update['asks'], nonce, update.get('timestamp'))
+            if on_update:
+                on_update(symbol, book)
+
     async def close(self):
         """ Overrides close method. Uses self.is_dex. """
-        print(f"Attempting to close connection for {self.id}...")
+        logger.debug("Attempting to close connection for %s", self.id)
         if self.is_dex:
             # --- CUSTOM DEX CLOSE LOGIC ---
-            print(f"Executing custom DEX close logic for {self.id} (if any)...")
-            await asyncio.sleep(0.01) # Simulate
-            print(f"DEX {self.id} cleanup complete.")
+            logger.debug("Executing custom DEX close logic for %s (if any)", self.id)
+            if self.solana_client:
+                # Releases this client's share of the pooled RPC connection
+                await self.solana_client.close()
+            logger.info("DEX %s cleanup complete", self.id)
             # --- END CUSTOM DEX CLOSE LOGIC ---
         else:
             # --- Standard CCXT Logic ---
@@ -220,9 +436,9 @@ class DexchangeClient:
                  return
             try:
                 await self._client.close()
-                print(f"Closed ccxt client for {self.id}.")
+                logger.info("Closed ccxt client for %s", self.id)
             except Exception as e:
-                 print(f"Error closing ccxt client for {self.id}: {e}") # Use stored ID
+                 logger.warning("Error closing ccxt client for %s: %s", self.id, e) # Use stored ID
 
 
 class DexManager:
@@ -234,69 +450,358 @@ class DexManager:
             self.config = toml.load(f)
 
         self.clients: Dict[str, DexchangeClient] = {}
-        self.latest_prices: Dict[str, Dict[str, float]] = {}
+        # (venue, symbol) -> last/bid/ask/timestamp, updated in place
+        self.prices = PriceMatrix()
+        self._previous_last: np.ndarray | None = None # for price_move()
+        self.last_updated: Dict[str, float] = {}
+        self.stale: Dict[str, bool] = {}
+        # Candles and ticks persisted under data_dir (relative to the config file); persist_market_data = false disables it
+        self.store = None
+        if self.config.get('persist_market_data', True):
+            self.store = MarketStore(
+                Path(config_path).parent / self.config.get('data_dir', 'data'),
+                max_open_files=self.config.get('max_open_files', DEFAULT_MAX_OPEN_FILES),
+            )
+        # Buffered ticks are written off the event loop this often
+        self.store_flush_interval = self.config.get('store_flush_interval', 1.0)
+        self._flush_task: asyncio.Task | None = None
+        self.candles = CandleStore(self.config.get('max_candles', 500), store=self.store)
+        
+        # Per-exchange deadline for a price tick and a cap on in-flight polls
+        self.poll_timeout = self.config.get('poll_timeout', 1.5)
+        self._poll_semaphore = asyncio.Semaphore(self.config.get('max_concurrent_polls', 8))
+        self._poll_tasks: Dict[str, asyncio.Task] = {}
+        self._stream_tasks: Dict[str, asyncio.Task] = {}
+        self._streamed: set[str] = set()
+        self._price_listeners: List[Callable[[str, Dict[str, float]], None]] = []
+        # Connection pools shared by every ccxt client and every SolanaClient on the same RPC
+        self.sessions = SessionRegistry.from_config(self.config)
+        # Per-venue REST budgets, so polls, OHLCV and orders share one view of what we can afford
+        self.limiters: Dict[str, VenueLimiter] = {}
         
         for exchange_name in self.config['active_exchanges']:
             if exchange_name in self.config['exchanges']:
                 client_config = self.config['exchanges'][exchange_name]
                 raw_client = None # Placeholder for the raw client
+                limiter = None
 
                 # Only create raw ccxt client if NOT a DEX
                 if not client_config.get('is_dex', False):
                     try:
                         exchange_class = getattr(ccxt, client_config['id'])
+                        # Streaming venues use the ccxt.pro class, which adds watch_* on top of REST
+                        pro = client_config.get('stream', False) and hasattr(ccxtpro, client_config['id'])
+                        if pro:
+                            exchange_class = getattr(ccxtpro, client_config['id'])
                         use_sandbox = client_config.get('sandbox', False)
+                        adaptive = client_config.get('adaptive_rate_limit', self.config.get('adaptive_rate_limit', True))
                         ccxt_config = {
                             'apiKey': client_config.get('api_key'),
                             'secret': client_config.get('secret'),
-                            'enableRateLimit': True,
+                            # Our VenueLimiter budgets REST when adaptive; ccxt throttling too would count every call twice
+                            'enableRateLimit': not adaptive,
                             'timeout': 30000,
                         }
                         if use_sandbox:
                             ccxt_config['sandbox'] = True
                         raw_client = exchange_class(ccxt_config)
+                        self.sessions.attach_exchange(raw_client)
+                        if adaptive:
+                            limiter = VenueLimiter.from_exchange(raw_client, client_config)
+                            self.limiters[exchange_name] = limiter
                     except Exception as e:
-                         print(f"Failed to initialize ccxt client for {exchange_name}: {e}")
+                         metrics.increment('failures', component='client_init', venue=exchange_name)
+                         logger.error("Failed to initialize ccxt client for %s: %s", exchange_name, e)
                          # Decide if you want to skip this client or continue without a raw client
                          # raw_client = None # Ensure it's None if init fails
 
                 # Create the wrapper, passing the raw client (which might be None for DEX)
                 # and the FULL config section
-                self.clients[exchange_name] = DexchangeClient(raw_client, client_config.get('symbols', []), client_config)
+                self.clients[exchange_name] = DexchangeClient(raw_client, client_config.get('symbols', []), client_config, self.sessions, limiter)
 
-                self.latest_prices[exchange_name] = {}
+                self.prices.track(exchange_name, self.clients[exchange_name].symbols)
                 # self.ohlcv_data[exchange_name] = {} # If using OHLCV manager
             else:
-                print(f"Warning: Config for '{exchange_name}' not found.")
+                logger.warning("Config for '%s' not found", exchange_name)
+
+        self.arbitrage = ArbitrageScanner(
+            fees={name: self._taker_fee(client) for name, client in self.clients.items()},
+            min_spread=self.config.get('min_arbitrage_spread', 0.0),
+        )
+        self.add_price_listener(self.arbitrage.update)
+        if self.store is not None:
+            self.add_price_listener(self._record_ticks)
+
+        # Multi-hop routes across every venue, e.g. USDC -> SOL -> RAY -> USDC
+        self.routes = TokenGraph(
+            fees=self.arbitrage.fees,
+            max_hops=self.config.get('max_route_hops', DEFAULT_MAX_HOPS),
+        )
+        self.add_price_listener(self.routes.update_prices)
+
+        # Orders go through one queue with a concurrency cap per venue
+        self.orders = OrderEngine(
+            self.clients,
+            venue_concurrency={
+                name: client.config['order_concurrency']
+                for name, client in self.clients.items() if 'order_concurrency' in client.config
+            },
+            default_concurrency=self.config.get('order_concurrency', DEFAULT_VENUE_CONCURRENCY),
+        )
+        metrics.add_collector(self._collect_metrics)
+
+    @staticmethod
+    def _taker_fee(client: DexchangeClient) -> float:
+        """Taker fee from config, else ccxt's market-wide default, else DEFAULT_TAKER_FEE."""
+        if 'taker_fee' in client.config:
+            return client.config['taker_fee']
+        if client._client is not None:
+            fee = (getattr(client._client, 'fees', {}) or {}).get('trading', {}).get('taker')
+            if fee is not None:
+                return fee
+        return DEFAULT_TAKER_FEE
+
+    def add_price_listener(self, listener: Callable[[str, Dict[str, float]], None]):
+        """Calls `listener(dexchange, prices)` with every batch of new prices as it lands."""
+        self._price_listeners.append(listener)
+
+    def _publish_prices(self, name: str, prices: Dict[str, float]):
+        for listener in self._price_listeners:
+            try:
+                listener(name, prices)
+            except Exception as e:
+                metrics.increment('failures', component='price_listener', venue=name)
+                logger.warning("Price listener failed for %s: %s", name, e)
+
+    def _record_ticks(self, name: str, prices: Dict[str, float]):
+        self.store.append_ticks(name, int(time.time() * 1000), prices)
+        if self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_store())
+
+    async def _flush_store(self):
+        while True:
+            await asyncio.sleep(self.store_flush_interval)
+            flush = asyncio.ensure_future(asyncio.to_thread(self.store.flush))
+            try:
+                await asyncio.shield(flush)
+            except asyncio.CancelledError:
+                # Cancelling can't stop the worker thread; let its write land before anyone closes the store
+                with contextlib.suppress(Exception):
+                    await flush
+                raise
+            except Exception as e:
+                metrics.increment('failures', component='tick_store')
+                logger.warning("Could not persist ticks: %s", e)
+
+    async def _poll_client(self, name: str, client: DexchangeClient):
+        """Fetches one client's prices and stores them as soon as they arrive."""
+        try:
+            async with self._poll_semaphore:
+                with metrics.timer('stage_seconds', stage='fetch', venue=name):
+                    prices = await client.fetch_latest_prices()
+        except Exception as e:
+            metrics.increment('failures', component='price_poll', venue=name)
+            logger.warning("Error polling prices for %s: %s", name, e)
+            self.stale[name] = True
+            return
+        
+        if prices is not None:
+            self.prices.update_many(name, prices, client.tickers)
+            self.last_updated[name] = time.monotonic()
+            self.stale[name] = False
+            self._publish_prices(name, prices)
 
     async def update_all_prices(self):
         """
-        Polls all clients for their latest prices and updates
-        the internal state.
+        Polls all clients concurrently and updates the internal state.
+        Clients that miss the poll_timeout deadline are marked stale and
+        keep running in the background; their prices land whenever they
+        arrive instead of holding up the rest of the tick.
         """
         for name, client in self.clients.items():
-            self.latest_prices[name] = await client.fetch_latest_prices()
+            stream_task = self._stream_tasks.get(name)
+            if stream_task and not stream_task.done() and name in self._streamed:
+                continue # Live streams push their own updates; poll only until the first one lands
+            
+            task = self._poll_tasks.get(name)
+            # Don't stack a second request on a venue that is still answering the last one
+            if task is None or task.done():
+                self._poll_tasks[name] = asyncio.create_task(self._poll_client(name, client))
+        
+        in_flight = [task for task in self._poll_tasks.values() if not task.done()]
+        if in_flight:
+            await asyncio.wait(in_flight, timeout=self.poll_timeout)
+        
+        for name, task in self._poll_tasks.items():
+            if not task.done():
+                self.stale[name] = True
+                # Don't trade against prices we can't vouch for
+                self.arbitrage.remove_venue(name)
+                self.routes.remove_venue(name)
   
+    def _on_stream_price(self, name: str, symbol: str, price: float):
+        """Writes a streamed price straight into the price matrix."""
+        ticker = self.clients[name].tickers.get(symbol) or {}
+        self.prices.update(name, symbol, price, ticker.get('bid'), ticker.get('ask'), ticker.get('timestamp'))
+        self.last_updated[name] = time.monotonic()
+        self.stale[name] = False
+        self._streamed.add(name)
+        self._publish_prices(name, {symbol: price})
+
+    def start_streams(self):
+        """
+        Starts a background stream for every client configured with
+        `stream = true` (DEX pool subscriptions or CEX websocket tickers).
+        Must be called from a running event loop.
+        """
+        for name, client in self.clients.items():
+            if client.stream and name not in self._stream_tasks:
+                on_update = lambda symbol, price, name=name: self._on_stream_price(name, symbol, price)
+                self._stream_tasks[name] = asyncio.create_task(client.stream_prices(on_update))
+                logger.info("Streaming prices for %s", name)
+            if client.config.get('order_books') and f"{name}:books" not in self._stream_tasks:
+                self._stream_tasks[f"{name}:books"] = asyncio.create_task(client.stream_order_books())
+                logger.info("Streaming order books for %s", name)
+
     async def update_strategy_prices(self):
         pass;
+
+    async def fetch_candles(self, dexchange: str, symbol: str, timeframe: str, limit: int) -> List[list]:
+        """
+        Returns the last `limit` OHLCV bars for a symbol, fetching only the
+        bars newer than what is already cached.
+        """
+        return await self.candles.update(self.clients[dexchange], dexchange, symbol, timeframe, limit)
         
+    @property
+    def latest_prices(self) -> Dict[str, Dict[str, float]]:
+        """dexchange -> symbol -> last price, built from the price matrix on each call"""
+        return self.prices.as_dict()
+
     def get_price(self, dexchange: str, symbol: str) -> float | None:
         """Lightweight getter for the TUI to use."""
-        return self.latest_prices.get(dexchange, {}).get(symbol)
+        return self.prices.get(dexchange, symbol)
 
     def get_all_prices(self) -> Dict[str, Dict[str, float]]:
         """Gets the entire aggregated price data structure."""
-        return self.latest_prices
+        return self.prices.as_dict()
+
+    def price_move(self) -> float | None:
+        """
+        Mean absolute log change of every quoted price since the previous
+        call, computed over the whole price matrix at once. None on the
+        first call or when nothing is quoted on both sides.
+        """
+        rows, cols = len(self.prices.venues), len(self.prices.symbols)
+        current = self.prices.last[:rows, :cols]
+        previous, self._previous_last = self._previous_last, current.copy()
+        if previous is None:
+            return None
+        rows, cols = previous.shape # ids are stable, so older cells sit top-left
+        with np.errstate(divide='ignore', invalid='ignore'):
+            moves = np.abs(np.log(current[:rows, :cols] / previous))
+        moves = moves[np.isfinite(moves)]
+        return float(moves.mean()) if len(moves) else None
+
+    def min_poll_interval(self) -> float:
+        """
+        Shortest price-poll interval every polled venue can sustain: one
+        fetch_tickers at the limiter's current (learned) rate, keeping
+        `poll_budget` of the budget for the rest (OHLCV, books, orders), or
+        ccxt's rateLimit for venues without a limiter.
+        """
+        share = self.config.get('poll_budget', 0.5)
+        floor = self.config.get('min_poll_interval', 0.0)
+        for name, client in self.clients.items():
+            floor = max(floor, client.config.get('min_poll_interval', 0.0))
+            if name in self._streamed or client._client is None:
+                continue # Not on the poll cadence; its REST calls still wait on its own limiter
+            if client.limiter is not None:
+                floor = max(floor, client.limiter.interval(client.limiter.cost('fetch_tickers')) / share)
+            else:
+                floor = max(floor, (getattr(client._client, 'rateLimit', 0) or 0) / 1000)
+        return floor
+
+    def request_budget(self) -> Dict[str, Dict[str, float]]:
+        """Every venue's limiter state: current and advertised rate, tokens, queue and 429 count"""
+        return {name: limiter.stats() for name, limiter in self.limiters.items()}
 
-    async def place_order(self, dexchange: str, symbol: str, side: str, amount: float):
-        """Delegates placing an order to the correct client."""
+    def _collect_metrics(self) -> Iterable[Tuple[str, Dict[str, str], float]]:
+        """Queue depths and per-cell price age, read when metrics are scraped"""
+        yield 'order_queue_depth', {}, self.orders.queue_depth
+        for name, limiter in self.limiters.items():
+            yield 'request_queue_depth', {'venue': name}, limiter.queue_depth
+            yield 'request_rate', {'venue': name}, limiter.rate
+        yield 'polls_in_flight', {}, sum(not task.done() for task in self._poll_tasks.values())
+        for name in self.clients:
+            yield 'venue_stale', {'venue': name}, float(self.stale.get(name, False))
+
+        rows, cols = len(self.prices.venues), len(self.prices.symbols)
+        age = time.time() - self.prices.timestamp[:rows, :cols] / 1000
+        for vid, sid in zip(*np.nonzero(self.prices.tracked[:rows, :cols] & ~np.isnan(age))):
+            yield 'price_age_seconds', {'venue': self.prices.venues[vid], 'symbol': self.prices.symbols[sid]}, float(age[vid, sid])
+
+    def is_stale(self, dexchange: str) -> bool:
+        """True if the dexchange missed its last polling deadline."""
+        return self.stale.get(dexchange, False)
+
+    async def place_order(self, dexchange: str, symbol: str, side: str, amount: float,
+                          price: float | None = None, client_order_id: str | None = None):
+        """Places an order through the order engine; returns the venue's order or None."""
         if dexchange not in self.clients:
-            print(f"Error: No client for dexchange '{dexchange}'.")
+            logger.error("No client for dexchange '%s'", dexchange)
             return None
         
-        return await self.clients[dexchange].place_order(symbol, side, amount)
+        order = await self.orders.place(dexchange, symbol, side, amount, price, client_order_id)
+        if not order.ok:
+            metrics.increment('failures', component='order', venue=dexchange)
+            logger.error("Order failed on %s: %s", dexchange, order.error)
+        return order.result
+
+    def get_order_book(self, dexchange: str, symbol: str) -> OrderBook | None:
+        client = self.clients.get(dexchange)
+        book = client.order_books.get(symbol) if client else None
+        return book if book is not None and book.synced else None
+
+    def size_arbitrage(self, symbol: str, buy_venue: str, sell_venue: str,
+                       max_amount: float | None = None) -> tuple[float, float, float | None, float | None]:
+        """
+        Executable (size, profit, buy vwap, sell vwap) for buying on one venue and
+        selling on the other, walking both local order books net of taker fees.
+        (0, 0, None, None) when either book is missing or out of sync.
+        """
+        buy_book = self.get_order_book(buy_venue, symbol)
+        sell_book = self.get_order_book(sell_venue, symbol)
+        if buy_book is None or sell_book is None:
+            return 0.0, 0.0, None, None
+        return executable_arbitrage(
+            buy_book, sell_book,
+            self.arbitrage.fee(buy_venue), self.arbitrage.fee(sell_venue),
+            max_amount,
+        )
+
+    async def place_arbitrage(self, symbol: str, buy_venue: str, sell_venue: str, amount: float) -> OrderBatch:
+        """Buys on one venue and sells on the other, both legs sent at once."""
+        return await self.orders.place_legs([
+            OrderRequest(buy_venue, symbol, 'buy', amount),
+            OrderRequest(sell_venue, symbol, 'sell', amount),
+        ])
 
     async def close_all(self):
         """Closes all client connections."""
+        for task in [*self._poll_tasks.values(), *self._stream_tasks.values()]:
+            task.cancel()
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._flush_task
+            self._flush_task = None
+        await self.orders.close()
+        
         for client in self.clients.values():
-            await client.close()
\ No newline at end of file
+            await client.close()
+        
+        await self.sessions.close()
+        if self.store is not None:
+            await asyncio.to_thread(self.store.close) # writes whatever ticks are still buffered
+        metrics.remove_collector(self._collect_metrics)
\ No newline at end of file
@@ -0,0 +1,269 @@
+# src/client/metrics.py
+
+import json
+import logging
+import time
+from typing import Callable, Dict, Iterable, List, Tuple
+
+from aiohttp import web
+
+SUB_BUCKET_BITS = 5          # 32 linear sub-buckets per power of two: <= ~3% relative error
+MAX_VALUE_BITS = 40          # values are microseconds, so up to ~12 days
+DEFAULT_METRICS_HOST = "127.0.0.1"
+DEFAULT_METRICS_PORT = 9464
+METRIC_PREFIX = "trader_"
+QUANTILES = (0.5, 0.9, 0.99, 0.999)
+
+_SUB = 1 << SUB_BUCKET_BITS
+_HALF = _SUB >> 1
+_MAX_VALUE = (1 << MAX_VALUE_BITS) - 1
+_BUCKETS = _SUB + (MAX_VALUE_BITS - SUB_BUCKET_BITS) * _HALF
+
+Labels = Tuple[Tuple[str, str], ...]
+Sample = Tuple[str, Dict[str, str], float]  # (name, labels, value)
+
+logger = logging.getLogger("trader.client.metrics")
+
+
+def _bucket(value: int) -> int:
+    if value < _SUB:
+        return value
+    shift = value.bit_length() - SUB_BUCKET_BITS
+    return _SUB + (shift - 1) * _HALF + ((value >> shift) - _HALF)
+
+
+def _bucket_bounds(index: int) -> Tuple[int, int]:
+    """[lower, upper) of a bucket, in microseconds"""
+    if index < _SUB:
+        return index, index + 1
+    shift = (index - _SUB) // _HALF + 1
+    lower = ((index - _SUB) % _HALF + _HALF) << shift
+    return lower, lower + (1 << shift)
+
+
+class Histogram:
+    """
+    HDR-style log-linear histogram of durations. Recording is a bit_length,
+    a shift and one list increment; buckets are exact below 32us and within
+    ~3% above, for any value up to MAX_VALUE_BITS. Quantiles are read from
+    the buckets, so nothing is stored per sample.
+    """
+    __slots__ = ("counts", "count", "total", "min", "max")
+
+    def __init__(self):
+        self.counts = [0] * _BUCKETS
+        self.reset()
+
+    def reset(self):
+        for i in range(len(self.counts)):
+            self.counts[i] = 0
+        self.count = 0
+        self.total = 0
+        self.min = _MAX_VALUE
+        self.max = 0
+
+    def record(self, micros: int):
+        if micros < 0:
+            micros = 0
+        elif micros > _MAX_VALUE:
+            micros = _MAX_VALUE
+        self.counts[_bucket(micros)] += 1
+        self.count += 1
+        self.total += micros
+        if micros > self.max:
+            self.max = micros
+        if micros < self.min:
+            self.min = micros
+
+    def record_seconds(self, seconds: float):
+        self.record(int(seconds * 1_000_000))
+
+    def percentile(self, q: float) -> float:
+        """Value at quantile `q` (0..1) in seconds, the midpoint of its bucket; 0.0 when empty"""
+        if not self.count:
+            return 0.0
+        rank = max(1, int(q * self.count + 0.5))
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                lower, upper = _bucket_bounds(index)
+                return min(max((lower + upper - 1) / 2, self.min), self.max) / 1_000_000
+        return self.max / 1_000_000
+
+    @property
+    def sum_seconds(self) -> float:
+        return self.total / 1_000_000
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count / 1_000_000 if self.count else 0.0
+
+    def summary(self) -> Dict[str, float]:
+        return {
+            'count': self.count,
+            'sum': self.sum_seconds,
+            'min': self.min / 1_000_000 if self.count else 0.0,
+            'max': self.max / 1_000_000,
+            'p50': self.percentile(0.5),
+            'p90': self.percentile(0.9),
+            'p99': self.percentile(0.99),
+            'p999': self.percentile(0.999),
+        }
+
+
+class _Timer:
+    __slots__ = ("histogram", "start")
+
+    def __init__(self, histogram: Histogram):
+        self.histogram = histogram
+
+    def __enter__(self) -> '_Timer':
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        self.histogram.record((time.perf_counter_ns() - self.start) // 1000)
+        return False
+
+
+def _labels(labels: Dict[str, object]) -> Labels:
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+class Metrics:
+    """
+    Process-wide registry of latency histograms, counters and gauges, keyed
+    by name and labels. Gauges that are cheaper to read on demand (queue
+    depths, price staleness) come from collectors called at scrape time.
+    """
+    def __init__(self):
+        self.histograms: Dict[Tuple[str, Labels], Histogram] = {}
+        self.counters: Dict[Tuple[str, Labels], float] = {}
+        self.gauges: Dict[Tuple[str, Labels], float] = {}
+        self._collectors: List[Callable[[], Iterable[Sample]]] = []
+
+    def histogram(self, name: str, **labels) -> Histogram:
+        """The histogram for `name` and `labels`; hot paths can hold on to it"""
+        key = (name, _labels(labels))
+        histogram = self.histograms.get(key)
+        if histogram is None:
+            histogram = self.histograms[key] = Histogram()
+        return histogram
+
+    def observe(self, name: str, seconds: float, **labels):
+        self.histogram(name, **labels).record_seconds(seconds)
+
+    def timer(self, name: str, **labels) -> _Timer:
+        """`with metrics.timer('stage_seconds', stage='decode'):` records the block's duration"""
+        return _Timer(self.histogram(name, **labels))
+
+    def increment(self, name: str, value: float = 1, **labels):
+        key = (name, _labels(labels))
+        self.counters[key] = self.counters.get(key, 0) + value
+
+    def set_gauge(self, name: str, value: float, **labels):
+        self.gauges[(name, _labels(labels))] = value
+
+    def add_collector(self, collector: Callable[[], Iterable[Sample]]):
+        self._collectors.append(collector)
+
+    def remove_collector(self, collector: Callable[[], Iterable[Sample]]):
+        if collector in self._collectors:
+            self._collectors.remove(collector)
+
+    def collect(self) -> List[Sample]:
+        """Every gauge, static and collected"""
+        samples = [(name, dict(labels), value) for (name, labels), value in self.gauges.items()]
+        for collector in self._collectors:
+            try:
+                samples.extend(collector())
+            except Exception as e:
+                self.increment('failures', component='metrics_collector')
+                logger.warning("Metrics collector failed: %s", e)
+        return samples
+
+    def as_json(self) -> Dict:
+        return {
+            'histograms': [
+                {'name': name, 'labels': dict(labels), **histogram.summary()}
+                for (name, labels), histogram in self.histograms.items()
+            ],
+            'counters': [{'name': name, 'labels': dict(labels), 'value': value} for (name, labels), value in self.counters.items()],
+            'gauges': [{'name': name, 'labels': labels, 'value': value} for name, labels, value in self.collect()],
+        }
+
+    def prometheus(self) -> str:
+        """Prometheus text exposition: histograms as summaries, then counters and gauges"""
+        lines: List[str] = []
+        typed = set()
+
+        def declare(name: str, kind: str):
+            if name not in typed:
+                typed.add(name)
+                lines.append(f"# TYPE {name} {kind}")
+
+        for (name, labels), histogram in sorted(self.histograms.items()):
+            metric = METRIC_PREFIX + name
+            declare(metric, "summary")
+            for q in QUANTILES:
+                lines.append(f"{metric}{_format_labels(dict(labels), quantile=q)} {histogram.percentile(q):.9g}")
+            lines.append(f"{metric}_sum{_format_labels(dict(labels))} {histogram.sum_seconds:.9g}")
+            lines.append(f"{metric}_count{_format_labels(dict(labels))} {histogram.count}")
+        for (name, labels), value in sorted(self.counters.items()):
+            metric = METRIC_PREFIX + name + "_total"
+            declare(metric, "counter")
+            lines.append(f"{metric}{_format_labels(dict(labels))} {value:.9g}")
+        for name, labels, value in sorted(self.collect(), key=lambda sample: sample[0]):
+            metric = METRIC_PREFIX + name
+            declare(metric, "gauge")
+            lines.append(f"{metric}{_format_labels(labels)} {value:.9g}")
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def _format_labels(labels: Dict[str, str], **extra) -> str:
+    labels = {**labels, **{key: str(value) for key, value in extra.items()}}
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(str(value))}"' for key, value in labels.items()) + "}"
+
+
+# Shared by every module on the data path
+metrics = Metrics()
+
+
+class MetricsServer:
+    """
+    Local HTTP endpoint for scrapers: /metrics in Prometheus text format,
+    /metrics.json as JSON. Binds to localhost unless told otherwise.
+    """
+    def __init__(self, registry: Metrics = metrics, host: str = DEFAULT_METRICS_HOST,
+                 port: int = DEFAULT_METRICS_PORT):
+        self.registry = registry
+        self.host = host
+        self.port = port
+        self._runner: web.AppRunner | None = None
+
+    async def start(self):
+        app = web.Application()
+        app.router.add_get("/metrics", self._prometheus)
+        app.router.add_get("/metrics.json", self._json)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, self.host, self.port).start()
+        logger.info("Metrics on http://%s:%s/metrics", self.host, self.port)
+
+    async def _prometheus(self, request: web.Request) -> web.Response:
+        return web.Response(text=self.registry.prometheus(), content_type="text/plain", charset="utf-8")
+
+    async def _json(self, request: web.Request) -> web.Response:
+        return web.Response(text=json.dumps(self.registry.as_json()), content_type="application/json")
+
+    async def close(self):
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
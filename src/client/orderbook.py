@@ -0,0 +1,230 @@
+# src/client/orderbook.py
+
+from typing import Sequence, Tuple
+
+import numpy as np
+
+Levels = Sequence[Sequence[float]]  # [[price, amount], ...] as ccxt returns them
+
+
+class BookSide:
+    """
+    One side of an L2 book as parallel sorted arrays, best level first.
+    Bids are stored under negated keys so both sides sort ascending.
+    Cumulative amount and notional are built lazily after a change, so
+    fill queries are a binary search over prefix sums.
+    """
+    def __init__(self, descending: bool):
+        self.sign = -1.0 if descending else 1.0
+        self.keys = np.empty(0)
+        self.amounts = np.empty(0)
+        self._cum_amount: np.ndarray | None = None
+        self._cum_notional: np.ndarray | None = None
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    @property
+    def prices(self) -> np.ndarray:
+        return self.keys * self.sign
+
+    def replace(self, levels: Levels):
+        """Loads a full snapshot; levels may arrive in any order."""
+        try:
+            data = np.asarray(levels, dtype=float)
+        except ValueError:
+            # Ragged rows, e.g. an order count on some levels only
+            data = np.asarray([level[:2] for level in levels], dtype=float)
+        # Some venues add a third column (order count); only price and amount matter
+        data = data[:, :2] if data.ndim == 2 else np.empty((0, 2))
+        data = data[data[:, 1] > 0]
+        keys = data[:, 0] * self.sign
+        order = np.argsort(keys, kind="stable")
+        self.keys = keys[order]
+        self.amounts = data[order, 1]
+        self._cum_amount = None
+
+    def update(self, price: float, amount: float):
+        """Sets one level's amount; zero removes it."""
+        key = price * self.sign
+        i = int(np.searchsorted(self.keys, key))
+        exists = i < len(self.keys) and self.keys[i] == key
+        if amount <= 0:
+            if exists:
+                self.keys = np.delete(self.keys, i)
+                self.amounts = np.delete(self.amounts, i)
+        elif exists:
+            self.amounts[i] = amount
+        else:
+            self.keys = np.insert(self.keys, i, key)
+            self.amounts = np.insert(self.amounts, i, amount)
+        self._cum_amount = None
+
+    def best(self) -> Tuple[float, float] | None:
+        if not len(self.keys):
+            return None
+        return float(self.keys[0] * self.sign), float(self.amounts[0])
+
+    def _prefix(self) -> Tuple[np.ndarray, np.ndarray]:
+        if self._cum_amount is None:
+            self._cum_amount = np.cumsum(self.amounts)
+            self._cum_notional = np.cumsum(self.amounts * self.keys * self.sign)
+        return self._cum_amount, self._cum_notional
+
+    @property
+    def total(self) -> float:
+        return float(self._prefix()[0][-1]) if len(self.keys) else 0.0
+
+    def price_for_size(self, size: float) -> float | None:
+        """Worst price touched when filling `size`; None if the book is too thin."""
+        cum_amount, _ = self._prefix()
+        i = int(np.searchsorted(cum_amount, size - 1e-12))
+        if i >= len(cum_amount):
+            return None
+        return float(self.keys[i] * self.sign)
+
+    def cost(self, size: float) -> float | None:
+        """Total notional to fill `size` against this side"""
+        cum_amount, cum_notional = self._prefix()
+        i = int(np.searchsorted(cum_amount, size - 1e-12))
+        if size <= 0:
+            return 0.0
+        if i >= len(cum_amount):
+            return None
+        before_amount = cum_amount[i - 1] if i else 0.0
+        before_notional = cum_notional[i - 1] if i else 0.0
+        return float(before_notional + (size - before_amount) * self.keys[i] * self.sign)
+
+    def vwap(self, size: float) -> float | None:
+        """Average fill price for `size`; None if the book is too thin."""
+        if size <= 0:
+            best = self.best()
+            return best[0] if best else None
+        cost = self.cost(size)
+        return cost / size if cost is not None else None
+
+    def depth(self, price: float) -> float:
+        """Amount available at `price` or better"""
+        cum_amount, _ = self._prefix()
+        i = int(np.searchsorted(self.keys, price * self.sign, side="right"))
+        return float(cum_amount[i - 1]) if i else 0.0
+
+
+class OrderBook:
+    """
+    Local L2 book for one symbol, fed by snapshots and (where a venue
+    provides them) sequenced deltas. A delta that skips a sequence number
+    marks the book unsynced; it then ignores deltas until the next snapshot.
+    """
+    def __init__(self, symbol: str):
+        self.symbol = symbol
+        self.bids = BookSide(descending=True)
+        self.asks = BookSide(descending=False)
+        self.sequence: int | None = None
+        self.timestamp: int | None = None
+        self.synced = False
+        self.resyncs = 0
+
+    def apply_snapshot(self, bids: Levels, asks: Levels, sequence: int | None = None, timestamp: int | None = None):
+        self.bids.replace(bids)
+        self.asks.replace(asks)
+        self.sequence = sequence
+        self.timestamp = timestamp
+        self.synced = True
+
+    def apply_delta(self, bids: Levels, asks: Levels, sequence: int,
+                    prev_sequence: int | None = None, timestamp: int | None = None) -> bool:
+        """
+        Applies level changes (amount 0 removes a level). `prev_sequence` is
+        the sequence the venue says this delta follows; without it the delta
+        must be exactly the next number. Returns False when the delta could
+        not be applied and the book needs a fresh snapshot.
+        """
+        if not self.synced:
+            return False
+        if self.sequence is not None:
+            if sequence <= self.sequence:
+                return True # already covered by the snapshot
+            expected = prev_sequence if prev_sequence is not None else sequence - 1
+            if expected != self.sequence:
+                self.synced = False
+                self.resyncs += 1
+                return False
+        for price, amount, *_ in bids:
+            self.bids.update(price, amount)
+        for price, amount, *_ in asks:
+            self.asks.update(price, amount)
+        self.sequence = sequence
+        self.timestamp = timestamp
+        return True
+
+    def best_bid(self) -> Tuple[float, float] | None:
+        return self.bids.best()
+
+    def best_ask(self) -> Tuple[float, float] | None:
+        return self.asks.best()
+
+    def mid(self) -> float | None:
+        bid, ask = self.bids.best(), self.asks.best()
+        if bid is None or ask is None:
+            return None
+        return (bid[0] + ask[0]) / 2
+
+    def spread(self) -> float | None:
+        bid, ask = self.bids.best(), self.asks.best()
+        if bid is None or ask is None:
+            return None
+        return ask[0] - bid[0]
+
+    def side(self, side: str) -> BookSide:
+        """The side a taker order consumes: buys lift asks, sells hit bids"""
+        return self.asks if side == 'buy' else self.bids
+
+    def vwap(self, side: str, size: float) -> float | None:
+        return self.side(side).vwap(size)
+
+    def price_for_size(self, side: str, size: float) -> float | None:
+        return self.side(side).price_for_size(size)
+
+    def __repr__(self) -> str:
+        return f"OrderBook({self.symbol}, bid {self.best_bid()}, ask {self.best_ask()}, seq {self.sequence})"
+
+
+def executable_arbitrage(buy_book: OrderBook, sell_book: OrderBook, buy_fee: float, sell_fee: float,
+                         max_size: float | None = None) -> Tuple[float, float, float | None, float | None]:
+    """
+    Largest size worth buying on `buy_book` and selling on `sell_book`:
+    binary search for where the marginal ask (after fees) stops being below
+    the marginal bid. Returns (size, profit in quote, buy vwap, sell vwap).
+    """
+    asks, bids = buy_book.asks, sell_book.bids
+    high = min(asks.total, bids.total)
+    if max_size is not None:
+        high = min(high, max_size)
+    if high <= 0:
+        return 0.0, 0.0, None, None
+
+    def profitable(size: float) -> bool:
+        ask, bid = asks.price_for_size(size), bids.price_for_size(size)
+        return ask is not None and bid is not None and ask * (1 + buy_fee) < bid * (1 - sell_fee)
+
+    if not profitable(1e-12):
+        return 0.0, 0.0, None, None
+    low = 0.0
+    if profitable(high):
+        low = high
+    else:
+        # Marginal edge only shrinks as size grows, so the boundary is unique
+        for _ in range(60):
+            middle = (low + high) / 2
+            if profitable(middle):
+                low = middle
+            else:
+                high = middle
+
+    size = low
+    if size <= 0:
+        return 0.0, 0.0, None, None
+    cost = asks.cost(size) * (1 + buy_fee)
+    proceeds = bids.cost(size) * (1 - sell_fee)
+    return size, proceeds - cost, asks.vwap(size), bids.vwap(size)
@@ -0,0 +1,263 @@
+# src/client/orders.py
+
+import asyncio
+import itertools
+import logging
+import time
+import uuid
+from typing import Dict, List, Optional
+
+import ccxt.async_support as ccxt
+
+from .metrics import metrics
+
+DEFAULT_VENUE_CONCURRENCY = 4  # in-flight orders per venue
+DEFAULT_DISPATCHERS = 8        # batches dispatched at once
+DEFAULT_ORDER_RETRIES = 2      # resends on network errors, same client order id
+RETRY_BACKOFF_MIN = 0.2        # seconds before the first resend, doubling after that
+RETRY_BACKOFF_MAX = 2.0        # resend delay ceiling
+DEFAULT_KNOWN_TTL = 600.0      # seconds a finished batch still answers repeated submits
+DEFAULT_MAX_KNOWN = 10_000     # client order ids remembered at most
+CLIENT_ORDER_ID_PREFIX = "trd"
+
+_batch_ids = itertools.count(1)
+
+logger = logging.getLogger("trader.client.orders")
+
+
+def new_client_order_id(prefix: str = CLIENT_ORDER_ID_PREFIX) -> str:
+    """Unique id short enough for every venue's clientOrderId limit (<= 36 chars)."""
+    return f"{prefix}{uuid.uuid4().hex}"
+
+
+class OrderRequest:
+    """
+    One order and its lifecycle. `timestamps` holds perf_counter_ns() for
+    every stage reached: created, queued, dispatched (venue slot acquired),
+    sent (handed to the venue) and acked (venue answered).
+    """
+    def __init__(self, venue: str, symbol: str, side: str, amount: float,
+                 price: float | None = None, client_order_id: str | None = None):
+        self.venue = venue
+        self.symbol = symbol
+        self.side = side
+        self.amount = amount
+        self.price = price
+        self.client_order_id = client_order_id or new_client_order_id()
+        self.result: Dict | None = None
+        self.error: str | None = None
+        self.attempts = 0
+        self.timestamps: Dict[str, int] = {"created": time.perf_counter_ns()}
+
+    def mark(self, stage: str):
+        self.timestamps[stage] = time.perf_counter_ns()
+
+    @property
+    def ok(self) -> bool:
+        return self.result is not None and self.error is None
+
+    def latency(self, start: str = "created", end: str = "acked") -> float | None:
+        """Milliseconds between two stages, if both were reached"""
+        if start not in self.timestamps or end not in self.timestamps:
+            return None
+        return (self.timestamps[end] - self.timestamps[start]) / 1e6
+
+    def __repr__(self) -> str:
+        state = "ok" if self.ok else (self.error or "pending")
+        return f"OrderRequest({self.client_order_id} {self.side} {self.amount} {self.symbol} @ {self.venue}, {state})"
+
+
+class OrderBatch:
+    """Orders that are dispatched together, e.g. the legs of an arbitrage."""
+    def __init__(self, legs: List[OrderRequest]):
+        self.id = next(_batch_ids)
+        self.legs = legs
+        self.future: asyncio.Future = asyncio.get_running_loop().create_future()
+        self.created_at = time.monotonic()
+        self.finished_at: float | None = None # monotonic time the last leg was answered
+
+    @property
+    def filled(self) -> bool:
+        return all(leg.ok for leg in self.legs)
+
+    @property
+    def skew_ms(self) -> float | None:
+        """Spread between the first and last leg reaching the venues"""
+        sent = [leg.timestamps["sent"] for leg in self.legs if "sent" in leg.timestamps]
+        if len(sent) < 2:
+            return None
+        return (max(sent) - min(sent)) / 1e6
+
+
+class OrderEngine:
+    """
+    Queues orders and dispatches them with bounded concurrency per venue.
+
+    Each queue item is a batch. A batch acquires a slot on every venue it
+    touches before any of its legs is sent (in a fixed venue order, so
+    batches can't deadlock each other), then sends all legs in one gather
+    so they leave within the same loop iteration. Client order ids are
+    generated up front and reused on retries, so a resend after a timeout
+    can't double-fill.
+    """
+    def __init__(self, clients: Dict, venue_concurrency: Dict[str, int] | None = None,
+                 default_concurrency: int = DEFAULT_VENUE_CONCURRENCY,
+                 dispatchers: int = DEFAULT_DISPATCHERS,
+                 retries: int = DEFAULT_ORDER_RETRIES,
+                 known_ttl: float = DEFAULT_KNOWN_TTL,
+                 max_known: int = DEFAULT_MAX_KNOWN):
+        self.clients = clients
+        self.retries = retries
+        self.known_ttl = known_ttl
+        self.max_known = max_known
+        self.dispatchers = dispatchers
+        self._limits = {
+            venue: asyncio.Semaphore((venue_concurrency or {}).get(venue, default_concurrency))
+            for venue in clients
+        }
+        self._queue: asyncio.Queue[OrderBatch] | None = None
+        self._workers: List[asyncio.Task] = []
+        # client order id -> batch, so a repeated submit returns the original; oldest first
+        self._known: Dict[str, OrderBatch] = {}
+        self._unsettled: set[OrderBatch] = set() # queued or in flight
+
+    def start(self):
+        """Starts the dispatchers; must be called from a running event loop."""
+        if self._queue is None:
+            self._queue = asyncio.Queue()
+        if not self._workers:
+            self._workers = [asyncio.create_task(self._dispatch_loop()) for _ in range(self.dispatchers)]
+
+    @property
+    def queue_depth(self) -> int:
+        return self._queue.qsize() if self._queue is not None else 0
+
+    async def warm_up(self, venues: Optional[List[str]] = None):
+        """Loads markets ahead of time so no leg pays for it at send time."""
+        for venue in venues or list(self.clients):
+            client = self.clients[venue]
+            if not client.is_dex and client._client is not None:
+                try:
+                    await client._client.load_markets()
+                except Exception as e:
+                    metrics.increment('failures', component='load_markets', venue=venue)
+                    logger.warning("Could not load markets for %s: %s", venue, e)
+
+    def submit_batch(self, legs: List[OrderRequest]) -> OrderBatch:
+        """
+        Queues orders to be sent together. Re-submitting an order whose
+        client id is already known returns the original batch instead.
+        """
+        self._prune_known()
+        for leg in legs:
+            if leg.client_order_id in self._known:
+                return self._known[leg.client_order_id]
+            if leg.venue not in self.clients:
+                raise ValueError(f"No client for venue '{leg.venue}'")
+
+        self.start()
+        batch = OrderBatch(legs)
+        for leg in legs:
+            self._known[leg.client_order_id] = batch
+            leg.mark("queued")
+        self._unsettled.add(batch)
+        self._queue.put_nowait(batch)
+        return batch
+
+    def _prune_known(self):
+        """
+        Forgets batches older than known_ttl (since they finished, or since
+        they were submitted if still in flight) and the oldest ones beyond
+        max_known, so a batch that never settles can't stop pruning.
+        """
+        now = time.monotonic()
+        while self._known:
+            client_order_id, batch = next(iter(self._known.items()))
+            since = batch.finished_at if batch.finished_at is not None else batch.created_at
+            if now - since < self.known_ttl and len(self._known) <= self.max_known:
+                return
+            del self._known[client_order_id]
+
+    async def place(self, venue: str, symbol: str, side: str, amount: float,
+                    price: float | None = None, client_order_id: str | None = None) -> OrderRequest:
+        """Queues a single order and waits for the venue's answer."""
+        batch = self.submit_batch([OrderRequest(venue, symbol, side, amount, price, client_order_id)])
+        await asyncio.shield(batch.future)
+        return batch.legs[0]
+
+    async def place_legs(self, legs: List[OrderRequest]) -> OrderBatch:
+        """Queues legs that must fill together and waits for all of them."""
+        batch = self.submit_batch(legs)
+        await asyncio.shield(batch.future)
+        if not batch.filled:
+            failed = [leg for leg in batch.legs if not leg.ok]
+            metrics.increment('failures', component='partial_fill')
+            logger.error("Batch %s partially filled: %s", batch.id, failed)
+        return batch
+
+    async def _dispatch_loop(self):
+        while True:
+            batch = await self._queue.get()
+            try:
+                await self._dispatch(batch)
+            except Exception as e:
+                for leg in batch.legs:
+                    if leg.result is None and leg.error is None:
+                        leg.error = str(e)
+            finally:
+                self._unsettled.discard(batch)
+                batch.finished_at = time.monotonic()
+                if not batch.future.done():
+                    batch.future.set_result(batch)
+                self._queue.task_done()
+
+    async def _dispatch(self, batch: OrderBatch):
+        venues = sorted({leg.venue for leg in batch.legs})
+        acquired = []
+        try:
+            for venue in venues:
+                await self._limits[venue].acquire()
+                acquired.append(venue)
+            for leg in batch.legs:
+                leg.mark("dispatched")
+            await asyncio.gather(*(self._send(leg) for leg in batch.legs))
+        finally:
+            for venue in acquired:
+                self._limits[venue].release()
+
+    async def _send(self, leg: OrderRequest):
+        client = self.clients[leg.venue]
+        leg.mark("sent")
+        for attempt in range(self.retries + 1):
+            leg.attempts = attempt + 1
+            try:
+                leg.result = await client.create_order(
+                    leg.symbol, leg.side, leg.amount, leg.price,
+                    params={"clientOrderId": leg.client_order_id},
+                    raise_errors=True,
+                )
+                leg.error = None if leg.result is not None else "no order returned"
+                break
+            except ccxt.NetworkError as e:
+                # Same client order id, so the venue rejects a duplicate if the first one landed
+                leg.error = f"{type(e).__name__}: {e}"
+                if attempt < self.retries:
+                    await asyncio.sleep(min(RETRY_BACKOFF_MIN * 2 ** attempt, RETRY_BACKOFF_MAX))
+            except Exception as e:
+                leg.error = f"{type(e).__name__}: {e}"
+                break
+        leg.mark("acked")
+        metrics.observe('order_seconds', leg.latency() / 1000, venue=leg.venue)
+
+    async def close(self):
+        """Stops the dispatchers and cancels every unsettled batch, so no caller waits forever."""
+        for batch in self._unsettled:
+            for leg in batch.legs:
+                if leg.result is None and leg.error is None:
+                    leg.error = "order engine closed"
+            batch.finished_at = time.monotonic()
+            batch.future.cancel()
+        self._unsettled.clear()
+        for worker in self._workers:
+            worker.cancel()
+        self._workers = []
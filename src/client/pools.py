@@ -0,0 +1,184 @@
+# src/client/pools.py
+
+import struct
+from typing import Dict, List, Optional, Tuple
+
+from solders.pubkey import Pubkey
+
+RAYDIUM_AMM_V4_PROGRAM_ID = "675kPX9MHTjS2zt1qfr1NYHuzeLXfQM9H24wFSUt1Mp8"
+ORCA_WHIRLPOOL_PROGRAM_ID = "whirLbMiicVdio4qvUfM5KAg6Ct8VwpYzGff3uctyCc"
+
+# SPL token layouts shared by every decoder
+TOKEN_ACCOUNT_AMOUNT_OFFSET = 64  # u64 after mint (32) + owner (32)
+MINT_DECIMALS_OFFSET = 44         # u8 after mint_authority (36) + supply (8)
+
+_U8 = struct.Struct("<B")
+_U16 = struct.Struct("<H")
+_U64 = struct.Struct("<Q")
+_U128 = struct.Struct("<QQ")
+
+
+def read_u128(data: memoryview, offset: int) -> int:
+    lo, hi = _U128.unpack_from(data, offset)
+    return lo | (hi << 64)
+
+
+def read_pubkey(data: memoryview, offset: int) -> str:
+    return str(Pubkey.from_bytes(bytes(data[offset:offset + 32])))
+
+
+def token_account_amount(data: memoryview) -> int:
+    return _U64.unpack_from(data, TOKEN_ACCOUNT_AMOUNT_OFFSET)[0]
+
+
+def mint_decimals(data: memoryview) -> int:
+    return _U8.unpack_from(data, MINT_DECIMALS_OFFSET)[0]
+
+
+class PoolDecoder:
+    """
+    Reads a pool account layout straight from its bytes.
+    Reserves are returned in raw token units alongside the decimals needed
+    to scale them, so callers never build intermediate objects per update.
+    """
+    name = "base"
+    program_id = ""
+    account_size = 0
+    # True when dependencies never change (e.g. mints), so their data can be cached
+    static_dependencies = False
+
+    def mints(self, data: memoryview) -> Tuple[str, str]:
+        """(mint_a, mint_b) addresses of the pool's two sides"""
+        raise NotImplementedError
+
+    def dependencies(self, data: memoryview) -> List[str]:
+        """Other accounts whose data `reserves` needs (vaults, mints)"""
+        return []
+
+    def reserves(self, data: memoryview, dependencies: List[memoryview]) -> Tuple[int, int, int, int]:
+        """
+        (reserve_a, reserve_b, decimals_a, decimals_b), given the data of each
+        account returned by `dependencies`, in the same order
+        """
+        raise NotImplementedError
+
+    def fee(self, data: memoryview) -> float:
+        """Swap fee as a fraction of the input amount"""
+        return 0.0
+
+    def price(self, data: memoryview, dependencies: List[memoryview]) -> float:
+        """Price of token a quoted in token b"""
+        reserve_a, reserve_b, decimals_a, decimals_b = self.reserves(data, dependencies)
+        if reserve_a == 0:
+            return 0.0
+        return (reserve_b / reserve_a) * 10 ** (decimals_a - decimals_b)
+
+
+class RaydiumAmmV4Decoder(PoolDecoder):
+    """
+    Raydium AMM v4 (LIQUIDITY_STATE_LAYOUT_V4). Reserves live in the pool's
+    vault token accounts, less the PnL the pool still owes the protocol.
+    """
+    name = "raydium_amm_v4"
+    program_id = RAYDIUM_AMM_V4_PROGRAM_ID
+    account_size = 752
+
+    BASE_DECIMAL = 32
+    QUOTE_DECIMAL = 40
+    SWAP_FEE_NUMERATOR = 176
+    SWAP_FEE_DENOMINATOR = 184
+    BASE_NEED_TAKE_PNL = 192
+    QUOTE_NEED_TAKE_PNL = 200
+    BASE_VAULT = 336
+    QUOTE_VAULT = 368
+    BASE_MINT = 400
+    QUOTE_MINT = 432
+
+    def mints(self, data: memoryview) -> Tuple[str, str]:
+        return read_pubkey(data, self.BASE_MINT), read_pubkey(data, self.QUOTE_MINT)
+
+    def dependencies(self, data: memoryview) -> List[str]:
+        return [read_pubkey(data, self.BASE_VAULT), read_pubkey(data, self.QUOTE_VAULT)]
+
+    def reserves(self, data: memoryview, dependencies: List[memoryview]) -> Tuple[int, int, int, int]:
+        base_vault, quote_vault = dependencies
+        reserve_a = token_account_amount(base_vault) - _U64.unpack_from(data, self.BASE_NEED_TAKE_PNL)[0]
+        reserve_b = token_account_amount(quote_vault) - _U64.unpack_from(data, self.QUOTE_NEED_TAKE_PNL)[0]
+        return (
+            max(reserve_a, 0),
+            max(reserve_b, 0),
+            _U64.unpack_from(data, self.BASE_DECIMAL)[0],
+            _U64.unpack_from(data, self.QUOTE_DECIMAL)[0],
+        )
+
+    def fee(self, data: memoryview) -> float:
+        denominator = _U64.unpack_from(data, self.SWAP_FEE_DENOMINATOR)[0]
+        if denominator == 0:
+            return 0.0
+        return _U64.unpack_from(data, self.SWAP_FEE_NUMERATOR)[0] / denominator
+
+
+class OrcaWhirlpoolDecoder(PoolDecoder):
+    """
+    Orca Whirlpool (concentrated liquidity). Price comes from sqrt_price (Q64.64);
+    reserves are the virtual constant-product reserves of the active tick range.
+    Decimals are read from the two mint accounts, which never change.
+    """
+    name = "orca_whirlpool"
+    program_id = ORCA_WHIRLPOOL_PROGRAM_ID
+    account_size = 653
+    static_dependencies = True
+
+    FEE_RATE = 45       # u16, hundredths of a basis point
+    LIQUIDITY = 49      # u128
+    SQRT_PRICE = 65     # u128, Q64.64
+    TOKEN_MINT_A = 101
+    TOKEN_MINT_B = 181
+
+    def mints(self, data: memoryview) -> Tuple[str, str]:
+        return read_pubkey(data, self.TOKEN_MINT_A), read_pubkey(data, self.TOKEN_MINT_B)
+
+    def dependencies(self, data: memoryview) -> List[str]:
+        return list(self.mints(data))
+
+    def reserves(self, data: memoryview, dependencies: List[memoryview]) -> Tuple[int, int, int, int]:
+        liquidity = read_u128(data, self.LIQUIDITY)
+        sqrt_price = read_u128(data, self.SQRT_PRICE)
+        decimals_a, decimals_b = mint_decimals(dependencies[0]), mint_decimals(dependencies[1])
+        if sqrt_price == 0:
+            return 0, 0, decimals_a, decimals_b
+        # x = L / sqrt(P), y = L * sqrt(P) with sqrt(P) = sqrt_price / 2^64
+        return (liquidity << 64) // sqrt_price, (liquidity * sqrt_price) >> 64, decimals_a, decimals_b
+
+    def fee(self, data: memoryview) -> float:
+        return _U16.unpack_from(data, self.FEE_RATE)[0] / 1_000_000
+
+    def price(self, data: memoryview, dependencies: List[memoryview]) -> float:
+        # Exact even when the active range holds no liquidity
+        decimals_a, decimals_b = mint_decimals(dependencies[0]), mint_decimals(dependencies[1])
+        sqrt_price = read_u128(data, self.SQRT_PRICE) / 2 ** 64
+        return sqrt_price * sqrt_price * 10 ** (decimals_a - decimals_b)
+
+
+POOL_DECODERS: Dict[str, PoolDecoder] = {}
+
+
+def register_decoder(decoder: PoolDecoder) -> PoolDecoder:
+    """Register a decoder for every pool owned by its program id"""
+    POOL_DECODERS[decoder.program_id] = decoder
+    return decoder
+
+
+def get_decoder(owner: Optional[str] = None, size: Optional[int] = None) -> Optional[PoolDecoder]:
+    """Look a decoder up by owning program, falling back to the account size"""
+    if owner and owner in POOL_DECODERS:
+        return POOL_DECODERS[owner]
+    if size is not None:
+        for decoder in POOL_DECODERS.values():
+            if decoder.account_size == size:
+                return decoder
+    return None
+
+
+register_decoder(RaydiumAmmV4Decoder())
+register_decoder(OrcaWhirlpoolDecoder())
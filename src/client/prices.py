@@ -0,0 +1,194 @@
+# src/client/prices.py
+
+import time
+from typing import Dict, Iterable, List, Tuple
+
+import numpy as np
+
+NAN = float('nan')
+INITIAL_CAPACITY = 16  # venues and symbols allocated up front; doubled when exceeded
+SNAPSHOT_RETRIES = 1000  # torn copies retried before snapshot() gives up
+
+
+class PriceSnapshot:
+    """
+    A consistent copy of the matrix at one `version`. Arrays are
+    (venues, symbols); pass a snapshot back into PriceMatrix.snapshot()
+    to refresh it in place instead of allocating a new one.
+    """
+    def __init__(self, venues: List[str], symbols: List[str], last: np.ndarray, bid: np.ndarray,
+                 ask: np.ndarray, timestamp: np.ndarray, seq: np.ndarray, version: int):
+        self.venues = venues
+        self.symbols = symbols
+        self.last = last
+        self.bid = bid
+        self.ask = ask
+        self.timestamp = timestamp
+        self.seq = seq
+        self.version = version
+
+
+class PriceMatrix:
+    """
+    Latest price state for every (venue, symbol) as NumPy arrays indexed
+    by interned ids: last, bid, ask, timestamp (ms) and seq, the global
+    version at which each cell last changed. Updates write cells in place.
+    Readers compare whole columns at once, find changed cells with
+    `seq > version`, or take a snapshot. Snapshots are guarded by a write
+    counter (odd while a write is in progress), so readers on other threads
+    retry a bounded number of times instead of seeing half an update.
+    """
+    def __init__(self, capacity: int = INITIAL_CAPACITY):
+        self.venue_ids: Dict[str, int] = {}
+        self.symbol_ids: Dict[str, int] = {}
+        self.venues: List[str] = []
+        self.symbols: List[str] = []
+        self.version = 0
+        self._writes = 0
+        self._allocate(capacity, capacity)
+
+    def _allocate(self, venues: int, symbols: int):
+        old = getattr(self, 'last', None)
+        shape = (venues, symbols)
+        arrays = {
+            'last': np.full(shape, NAN), 'bid': np.full(shape, NAN), 'ask': np.full(shape, NAN),
+            'timestamp': np.full(shape, NAN), 'seq': np.zeros(shape, dtype=np.int64),
+            'tracked': np.zeros(shape, dtype=bool),
+        }
+        if old is not None:
+            rows, cols = old.shape
+            for name, array in arrays.items():
+                array[:rows, :cols] = getattr(self, name)
+        for name, array in arrays.items():
+            setattr(self, name, array)
+
+    def venue_id(self, venue: str) -> int:
+        """The interned id for `venue`, assigned on first use"""
+        vid = self.venue_ids.get(venue)
+        if vid is None:
+            self._writes += 1
+            try:
+                if len(self.venues) >= self.last.shape[0]:
+                    self._allocate(2 * self.last.shape[0], self.last.shape[1])
+                vid = self.venue_ids[venue] = len(self.venues)
+                self.venues.append(venue)
+            finally:
+                self._writes += 1
+        return vid
+
+    def symbol_id(self, symbol: str) -> int:
+        """The interned id for `symbol`, assigned on first use"""
+        sid = self.symbol_ids.get(symbol)
+        if sid is None:
+            self._writes += 1
+            try:
+                if len(self.symbols) >= self.last.shape[1]:
+                    self._allocate(self.last.shape[0], 2 * self.last.shape[1])
+                sid = self.symbol_ids[symbol] = len(self.symbols)
+                self.symbols.append(symbol)
+            finally:
+                self._writes += 1
+        return sid
+
+    def track(self, venue: str, symbols: Iterable[str]):
+        """Declares the symbols a venue quotes, so they're listed before the first price lands."""
+        vid = self.venue_id(venue)
+        for symbol in symbols:
+            sid = self.symbol_id(symbol) # may grow the arrays, so look them up after
+            self.tracked[vid, sid] = True
+
+    def update(self, venue: str, symbol: str, last: float | None,
+               bid: float | None = None, ask: float | None = None, timestamp: float | None = None) -> bool:
+        """Writes one cell; returns False (and leaves seq alone) if nothing changed."""
+        vid, sid = self.venue_id(venue), self.symbol_id(symbol)
+        last = NAN if last is None else last
+        bid = NAN if bid is None else bid
+        ask = NAN if ask is None else ask
+        old_last, old_bid, old_ask = self.last[vid, sid], self.bid[vid, sid], self.ask[vid, sid]
+        # NaN != NaN, so compare missing values explicitly
+        if ((old_last == last or (old_last != old_last and last != last))
+                and (old_bid == bid or (old_bid != old_bid and bid != bid))
+                and (old_ask == ask or (old_ask != old_ask and ask != ask))
+                and self.tracked[vid, sid]):
+            return False
+
+        self._writes += 1
+        try:
+            self.version += 1
+            self.last[vid, sid] = last
+            self.bid[vid, sid] = bid
+            self.ask[vid, sid] = ask
+            self.timestamp[vid, sid] = timestamp if timestamp is not None else time.time() * 1000
+            self.seq[vid, sid] = self.version
+            self.tracked[vid, sid] = True
+        finally:
+            self._writes += 1
+        return True
+
+    def update_many(self, venue: str, prices: Dict[str, float | None],
+                    tickers: Dict[str, Dict] | None = None) -> int:
+        """
+        Writes a venue's batch of last prices, with bid, ask and timestamp
+        from ccxt-style `tickers` where available. Returns the cells changed.
+        """
+        changed = 0
+        for symbol, price in prices.items():
+            ticker = tickers.get(symbol) if tickers else None
+            if ticker:
+                changed += self.update(venue, symbol, price, ticker.get('bid'), ticker.get('ask'), ticker.get('timestamp'))
+            else:
+                changed += self.update(venue, symbol, price)
+        return changed
+
+    def get(self, venue: str, symbol: str) -> float | None:
+        vid, sid = self.venue_ids.get(venue), self.symbol_ids.get(symbol)
+        if vid is None or sid is None:
+            return None
+        price = self.last[vid, sid]
+        return None if price != price else float(price)
+
+    def row(self, venue: str) -> Dict[str, float | None]:
+        """A venue's tracked symbols and last prices as a dict (allocates; for display and callers wanting dicts)"""
+        vid = self.venue_ids.get(venue)
+        if vid is None:
+            return {}
+        sids = np.flatnonzero(self.tracked[vid, :len(self.symbols)])
+        return {self.symbols[sid]: (None if self.last[vid, sid] != self.last[vid, sid] else float(self.last[vid, sid]))
+                for sid in sids}
+
+    def as_dict(self) -> Dict[str, Dict[str, float | None]]:
+        """venue -> symbol -> last price, the shape latest_prices used to have"""
+        return {venue: self.row(venue) for venue in self.venues}
+
+    def changed_since(self, version: int) -> Tuple[np.ndarray, np.ndarray]:
+        """(venue ids, symbol ids) of every tracked cell written after `version`; -1 gives all of them"""
+        rows, cols = len(self.venues), len(self.symbols)
+        return np.nonzero((self.seq[:rows, :cols] > version) & self.tracked[:rows, :cols])
+
+    def snapshot(self, into: PriceSnapshot | None = None) -> PriceSnapshot:
+        """
+        A consistent copy of every array. Reuses `into`'s buffers when the
+        shape still fits, so a reader polling every frame doesn't allocate.
+        Raises RuntimeError if writers keep it torn for SNAPSHOT_RETRIES tries.
+        """
+        for _ in range(SNAPSHOT_RETRIES):
+            writes = self._writes
+            if writes % 2:
+                time.sleep(0) # Let the writer's thread finish
+                continue
+            shape = (len(self.venues), len(self.symbols))
+            if into is None or into.last.shape != shape:
+                into = PriceSnapshot(
+                    list(self.venues), list(self.symbols),
+                    *(np.empty(shape) for _ in range(4)), np.empty(shape, dtype=np.int64), 0,
+                )
+            rows, cols = shape
+            try:
+                for name in ('last', 'bid', 'ask', 'timestamp', 'seq'):
+                    np.copyto(getattr(into, name), getattr(self, name)[:rows, :cols])
+            except ValueError:
+                continue # Grown under us by another thread; retry with the new shape
+            into.version = self.version
+            if self._writes == writes:
+                return into
+        raise RuntimeError(f"No consistent price snapshot after {SNAPSHOT_RETRIES} tries")
@@ -0,0 +1,134 @@
+# src/client/quotes.py
+
+from typing import Tuple
+
+import numpy as np
+
+ArrayLike = float | np.ndarray
+
+
+class PoolQuote:
+    """
+    Constant-product state of one pool in human units, oriented so that
+    `base` is the token the caller prices (token_a) and `quote` the other.
+    For concentrated-liquidity pools these are the virtual reserves of the
+    active tick range, so quotes hold while a trade stays inside it.
+    """
+    __slots__ = ("reserve_base", "reserve_quote", "fee")
+
+    def __init__(self, reserve_base: float, reserve_quote: float, fee: float):
+        self.reserve_base = reserve_base
+        self.reserve_quote = reserve_quote
+        self.fee = fee
+
+    @property
+    def price(self) -> float:
+        """Mid price of base in quote"""
+        return self.reserve_quote / self.reserve_base if self.reserve_base else 0.0
+
+    def sell_base(self, amount: ArrayLike) -> ArrayLike:
+        """Quote received for selling `amount` base"""
+        return amount_out(amount, self.reserve_base, self.reserve_quote, self.fee)
+
+    def buy_base(self, amount: ArrayLike) -> ArrayLike:
+        """Base received for spending `amount` quote"""
+        return amount_out(amount, self.reserve_quote, self.reserve_base, self.fee)
+
+    def __repr__(self) -> str:
+        return f"PoolQuote(base {self.reserve_base}, quote {self.reserve_quote}, fee {self.fee})"
+
+
+def amount_out(amount_in: ArrayLike, reserve_in: ArrayLike, reserve_out: ArrayLike, fee: ArrayLike) -> ArrayLike:
+    """
+    Exact constant-product output, fee taken from the input:
+    out = R_out * a(1 - f) / (R_in + a(1 - f)). Broadcasts over arrays.
+    """
+    effective = np.multiply(amount_in, np.subtract(1, fee))
+    return np.divide(np.multiply(reserve_out, effective), np.add(reserve_in, effective))
+
+
+def compose(reserve_in_1: ArrayLike, reserve_out_1: ArrayLike, fee_1: ArrayLike,
+            reserve_in_2: ArrayLike, reserve_out_2: ArrayLike, fee_2: ArrayLike) -> Tuple[ArrayLike, ArrayLike, ArrayLike]:
+    """
+    Two swaps in a row behave like one constant-product pool. Returns its
+    (reserve_in, reserve_out, gamma), gamma being the first leg's 1 - fee,
+    so that amount_out(a, reserve_in, reserve_out, 1 - gamma) equals the
+    output of leg 2 fed with the output of leg 1.
+    """
+    gamma_2 = np.subtract(1, fee_2)
+    denominator = np.add(reserve_in_2, np.multiply(gamma_2, reserve_out_1))
+    reserve_in = np.divide(np.multiply(reserve_in_1, reserve_in_2), denominator)
+    reserve_out = np.divide(np.multiply(np.multiply(reserve_out_2, gamma_2), reserve_out_1), denominator)
+    return reserve_in, reserve_out, np.subtract(1, fee_1)
+
+
+def optimal_input(reserve_in: ArrayLike, reserve_out: ArrayLike, gamma: ArrayLike) -> ArrayLike:
+    """
+    Input maximising out(a) - a for a pool whose output is measured in the
+    input token (a composed round trip): a* = (sqrt(R_in * R_out * gamma) - R_in) / gamma,
+    or 0 when even the first unit loses money.
+    """
+    size = (np.sqrt(np.multiply(np.multiply(reserve_in, reserve_out), gamma)) - reserve_in) / gamma
+    return np.maximum(size, 0.0)
+
+
+def round_trip(sell: PoolQuote, buy: PoolQuote) -> Tuple[float, float, float]:
+    """
+    Sell base on `sell`, buy it back on `buy`. Returns the composed
+    (reserve_in, reserve_out, gamma) of the round trip in base units.
+    """
+    return compose(sell.reserve_base, sell.reserve_quote, sell.fee,
+                   buy.reserve_quote, buy.reserve_base, buy.fee)
+
+
+def round_trip_profit(sell: PoolQuote, buy: PoolQuote, sizes: ArrayLike) -> ArrayLike:
+    """Base gained (negative if lost) for each candidate size of the round trip"""
+    reserve_in, reserve_out, gamma = round_trip(sell, buy)
+    return amount_out(sizes, reserve_in, reserve_out, 1 - gamma) - np.asarray(sizes)
+
+
+def optimal_arbitrage(sell: PoolQuote, buy: PoolQuote, max_size: float | None = None) -> Tuple[float, float]:
+    """
+    (size, profit) of the best round trip selling base on `sell` and buying
+    it back on `buy`, optionally capped at `max_size`. Profit is in base
+    units after both pools' fees and price impact; (0, 0) if unprofitable.
+    """
+    reserve_in, reserve_out, gamma = round_trip(sell, buy)
+    size = float(optimal_input(reserve_in, reserve_out, gamma))
+    if max_size is not None:
+        # Profit is concave in size, so the cap is the best affordable size
+        size = min(size, float(max_size))
+    if size <= 0:
+        return 0.0, 0.0
+    profit = float(amount_out(size, reserve_in, reserve_out, 1 - gamma)) - size
+    return size, profit
+
+
+def best_arbitrage(reserve_base: np.ndarray, reserve_quote: np.ndarray, fees: np.ndarray,
+                   max_size: float | None = None) -> Tuple[int, int, float, float]:
+    """
+    Best round trip across N pools of the same pair, evaluating all N x N
+    ordered (sell, buy) combinations in one broadcast. Returns
+    (sell index, buy index, size, profit in base), or (-1, -1, 0, 0) when
+    no pair of pools is profitable.
+    """
+    reserve_base = np.asarray(reserve_base, dtype=float)
+    reserve_quote = np.asarray(reserve_quote, dtype=float)
+    fees = np.asarray(fees, dtype=float)
+
+    # Rows sell on pool i, columns buy back on pool j
+    reserve_in, reserve_out, gamma = compose(
+        reserve_base[:, None], reserve_quote[:, None], fees[:, None],
+        reserve_quote[None, :], reserve_base[None, :], fees[None, :],
+    )
+    sizes = optimal_input(reserve_in, reserve_out, gamma)
+    if max_size is not None:
+        sizes = np.minimum(sizes, max_size)
+    profits = amount_out(sizes, reserve_in, reserve_out, 1 - gamma) - sizes
+    np.fill_diagonal(profits, 0.0)
+    profits = np.nan_to_num(profits, nan=0.0)
+
+    sell, buy = np.unravel_index(np.argmax(profits), profits.shape)
+    if profits[sell, buy] <= 0:
+        return -1, -1, 0.0, 0.0
+    return int(sell), int(buy), float(sizes[sell, buy]), float(profits[sell, buy])
@@ -0,0 +1,178 @@
+# src/client/ratelimit.py
+
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from typing import Any, Dict, List, Tuple
+
+PRIORITY_ORDER = 0        # order placement and cancellation
+PRIORITY_MARKET_DATA = 1  # tickers, OHLCV, order book snapshots
+
+DEFAULT_ORDER_RESERVE = 1.0  # tokens market data may never take, so an order can always go next
+DEFAULT_BACKOFF = 0.5        # rate multiplier after a 429 / DDoSProtection
+DEFAULT_RECOVERY = 0.02      # share of the ceiling won back per successful request
+DEFAULT_MIN_RATE = 0.1       # requests per second the limiter never drops below
+
+logger = logging.getLogger("trader.client.ratelimit")
+
+
+class VenueLimiter:
+    """
+    Token bucket for one venue's REST budget, seeded from ccxt's `rateLimit`
+    (ms between unit-cost requests) and refilled continuously.
+
+    Waiters are served strictly by priority, then arrival, so a queued
+    order goes ahead of any market data; market data also leaves
+    `order_reserve` tokens in the bucket. The rate adapts AIMD-style: a
+    429 or DDoSProtection halves it, empties the bucket and pauses for any
+    Retry-After, and lowers the ceiling to just under the rate that was
+    refused. Each success adds back a slice of the ceiling, and the
+    ceiling itself creeps back toward the advertised rate.
+    """
+    def __init__(self, rate: float, burst: float | None = None,
+                 order_reserve: float = DEFAULT_ORDER_RESERVE,
+                 costs: Dict[str, float] | None = None,
+                 backoff: float = DEFAULT_BACKOFF,
+                 recovery: float = DEFAULT_RECOVERY,
+                 min_rate: float = DEFAULT_MIN_RATE,
+                 name: str = "venue"):
+        self.name = name
+        self.max_rate = rate
+        self.rate = rate
+        self.ceiling = rate
+        self.capacity = burst if burst is not None else max(1.0, rate)
+        self.order_reserve = order_reserve
+        self.costs = costs or {}
+        self.backoff = backoff
+        self.recovery = recovery
+        self.min_rate = min_rate
+
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self.requests = 0
+        self.throttled = 0
+        self.waited = 0.0 # total seconds requests spent queued
+        self._waiters: List[Tuple[int, int, float, asyncio.Future]] = []
+        self._sequence = itertools.count()
+        self._timer: asyncio.TimerHandle | None = None
+
+    @classmethod
+    def from_exchange(cls, exchange: Any, config: Dict) -> 'VenueLimiter':
+        """Reads the venue's advertised rateLimit; config can override rate, burst and per-method costs."""
+        rate_limit_ms = getattr(exchange, 'rateLimit', None) or 1000
+        return cls(
+            rate=config.get('rate_limit_rps', 1000 / rate_limit_ms),
+            burst=config.get('rate_limit_burst'),
+            order_reserve=config.get('order_reserve', DEFAULT_ORDER_RESERVE),
+            costs=config.get('request_costs'),
+            name=getattr(exchange, 'id', None) or "venue",
+        )
+
+    def cost(self, method: str) -> float:
+        return self.costs.get(method, 1.0)
+
+    def interval(self, cost: float = 1.0) -> float:
+        """Seconds between requests of `cost` that the current rate sustains"""
+        return cost / self.rate
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self._waiters)
+
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def _needed(self, cost: float, priority: int) -> float:
+        reserve = self.order_reserve if priority > PRIORITY_ORDER else 0.0
+        return min(cost + reserve, self.capacity)
+
+    def _try_take(self, cost: float, priority: int, now: float) -> bool:
+        if now < self.paused_until:
+            return False
+        self._refill(now)
+        if self.tokens >= self._needed(cost, priority):
+            self.tokens -= cost
+            return True
+        return False
+
+    async def acquire(self, cost: float = 1.0, priority: int = PRIORITY_MARKET_DATA):
+        """Waits for `cost` tokens; higher-priority (lower number) waiters are served first."""
+        self.requests += 1
+        if not self._waiters and self._try_take(cost, priority, time.monotonic()):
+            return
+        start = time.monotonic()
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._sequence), cost, future))
+        self._drain()
+        try:
+            await future
+        except asyncio.CancelledError:
+            self._waiters = [waiter for waiter in self._waiters if waiter[3] is not future]
+            heapq.heapify(self._waiters)
+            self._drain()
+            raise
+        finally:
+            self.waited += time.monotonic() - start
+
+    def _drain(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        now = time.monotonic()
+        while self._waiters:
+            priority, _, cost, future = self._waiters[0]
+            if future.done():
+                heapq.heappop(self._waiters)
+                continue
+            if not self._try_take(cost, priority, now):
+                # Head of line waits; nothing behind it may overtake
+                delay = max(self.paused_until - now, (self._needed(cost, priority) - self.tokens) / self.rate, 0.001)
+                self._timer = asyncio.get_running_loop().call_later(delay, self._drain)
+                return
+            heapq.heappop(self._waiters)
+            future.set_result(None)
+
+    def penalize(self, retry_after: float | None = None):
+        """The venue refused a request for rate reasons: back off hard."""
+        now = time.monotonic()
+        self.throttled += 1
+        self.ceiling = max(self.min_rate, min(self.ceiling, self.rate * 0.9))
+        self.rate = max(self.min_rate, self.rate * self.backoff)
+        self.tokens = 0.0
+        self.updated = now
+        self.paused_until = max(self.paused_until, now + (retry_after if retry_after else 1.0 / self.rate))
+        logger.warning("%s rate limited, backing off to %.2f req/s for %.1fs", self.name, self.rate, self.paused_until - now)
+
+    def reward(self):
+        """A request went through: win back some rate, and slowly some ceiling."""
+        if self.rate < self.ceiling:
+            self.rate = min(self.ceiling, self.rate + self.recovery * self.ceiling)
+        elif self.ceiling < self.max_rate:
+            self.ceiling = min(self.max_rate, self.ceiling + self.recovery * self.recovery * self.max_rate)
+            self.rate = self.ceiling
+
+    def stats(self) -> Dict[str, float]:
+        self._refill(time.monotonic())
+        return {
+            'rate': self.rate,
+            'max_rate': self.max_rate,
+            'tokens': self.tokens,
+            'queued': self.queue_depth,
+            'requests': self.requests,
+            'throttled': self.throttled,
+            'waited': self.waited,
+        }
+
+
+def retry_after(exchange: Any) -> float | None:
+    """Seconds from the last response's Retry-After header, if the venue sent one"""
+    headers = getattr(exchange, 'last_response_headers', None) or {}
+    value = headers.get('Retry-After') or headers.get('retry-after')
+    try:
+        return float(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
@@ -0,0 +1,331 @@
+# src/client/routes.py
+
+import math
+import time
+from typing import Dict, List, Optional, Set, Tuple
+
+import numpy as np
+
+from .arbitrage import DEFAULT_TAKER_FEE
+
+DEFAULT_MAX_HOPS = 3  # triangular
+
+Edge = Tuple[str, str]  # (from token, to token)
+
+
+class Route:
+    """A sequence of conversions tokens[0] -> tokens[1] -> ..., one venue per hop."""
+    __slots__ = ("tokens", "venues", "rate")
+
+    def __init__(self, tokens: List[str], venues: List[str], rate: float):
+        self.tokens = tokens
+        self.venues = venues
+        self.rate = rate # units of the last token per unit of the first, after fees
+
+    @property
+    def profit(self) -> float:
+        """For cycles: fraction gained going once around"""
+        return self.rate - 1
+
+    def edges(self) -> List[Edge]:
+        return list(zip(self.tokens, self.tokens[1:]))
+
+    def __repr__(self) -> str:
+        hops = " -> ".join(f"{token} [{venue}]" for token, venue in zip(self.tokens, self.venues))
+        return f"Route({hops} -> {self.tokens[-1]}, rate {self.rate:.6f})"
+
+
+class TokenGraph:
+    """
+    Directed token graph built from live prices. A BASE/QUOTE price p on a
+    venue with taker fee f adds the edges BASE -> QUOTE at p * (1 - f) and
+    QUOTE -> BASE at (1 / p) * (1 - f), weighted -log(rate) so a profitable
+    cycle is a negative cycle. Only the best venue per directed pair takes
+    part in the search.
+
+    Price updates are incremental: only cycles through the edges that changed
+    are re-searched (up to max_hops), and cycles that used a changed edge are
+    re-validated. find_negative_cycles() runs a full Bellman-Ford pass for
+    cycles of any length.
+    """
+    def __init__(self, fees: Optional[Dict[str, float]] = None, max_hops: int = DEFAULT_MAX_HOPS):
+        self.fees = fees or {}
+        self.max_hops = max_hops
+        # (src, dst) -> venue -> rate
+        self._rates: Dict[Edge, Dict[str, float]] = {}
+        # src -> dst -> (weight, venue, rate) and the reverse index, best venue only
+        self._out: Dict[str, Dict[str, Tuple[float, str, float]]] = {}
+        self._in: Dict[str, Dict[str, Tuple[float, str, float]]] = {}
+        # Profitable cycles keyed by canonical rotation, and which edges each one uses
+        self.cycles: Dict[Tuple[str, ...], Route] = {}
+        self._cycles_by_edge: Dict[Edge, Set[Tuple[str, ...]]] = {}
+        self.last_eval_ns = 0 # cost of the most recent update_prices() call
+
+    @property
+    def tokens(self) -> List[str]:
+        return list(self._out.keys() | self._in.keys())
+
+    def fee(self, venue: str) -> float:
+        return self.fees.get(venue, DEFAULT_TAKER_FEE)
+
+    def _set_rate(self, src: str, dst: str, venue: str, rate: float | None) -> bool:
+        """Updates one venue's rate for src -> dst; True if the best edge changed."""
+        venues = self._rates.setdefault((src, dst), {})
+        if rate is None or rate <= 0:
+            if venues.pop(venue, None) is None:
+                return False
+        elif venues.get(venue) == rate:
+            return False
+        else:
+            venues[venue] = rate
+
+        previous = self._out.get(src, {}).get(dst)
+        if not venues:
+            del self._out[src][dst]
+            del self._in[dst][src]
+            return True
+
+        best_venue = max(venues, key=venues.get)
+        best = (-math.log(venues[best_venue]), best_venue, venues[best_venue])
+        self._out.setdefault(src, {})[dst] = best
+        self._in.setdefault(dst, {})[src] = best
+        return best != previous
+
+    def _apply(self, venue: str, symbol: str, price: float | None, dirty: Dict[Edge, None]):
+        if ':' in symbol or '/' not in symbol:
+            return # derivatives and malformed symbols aren't token conversions
+        base, quote = symbol.split('/')
+        keep = 1 - self.fee(venue)
+        valid = price is not None and price > 0
+        if self._set_rate(base, quote, venue, price * keep if valid else None):
+            dirty[(base, quote)] = None
+        if self._set_rate(quote, base, venue, keep / price if valid else None):
+            dirty[(quote, base)] = None
+
+    def update_prices(self, venue: str, prices: Dict[str, float | None]) -> List[Route]:
+        """
+        Applies a venue's batch of BASE/QUOTE prices (the price-listener
+        signature) and returns the profitable cycles through changed edges.
+        Each changed edge is searched once per batch, however many symbols touched it.
+        """
+        start = time.perf_counter_ns()
+        dirty: Dict[Edge, None] = {}
+        for symbol, price in prices.items():
+            self._apply(venue, symbol, price, dirty)
+        found = self._refresh(dirty)
+        self.last_eval_ns = time.perf_counter_ns() - start
+        return found
+
+    def update_pair(self, venue: str, symbol: str, price: float | None) -> List[Route]:
+        """Single-edge form of update_prices."""
+        return self.update_prices(venue, {symbol: price})
+
+    def remove_venue(self, venue: str):
+        """Drops a venue's edges, e.g. when it goes stale."""
+        dirty: Dict[Edge, None] = {}
+        for (src, dst), venues in list(self._rates.items()):
+            if venue in venues and self._set_rate(src, dst, venue, None):
+                dirty[(src, dst)] = None
+        self._refresh(dirty)
+
+    def _refresh(self, dirty: Dict[Edge, None]) -> List[Route]:
+        # Cycles over a changed edge are re-priced (or dropped) first...
+        stale = set()
+        for edge in dirty:
+            stale.update(self._cycles_by_edge.get(edge, ()))
+        for key in stale:
+            route = self._drop_cycle(key)
+            repriced = self._price_cycle(route.tokens)
+            if repriced is not None and repriced.rate > 1:
+                self._add_cycle(repriced)
+
+        # ...then each changed edge is searched for the best cycle through it
+        found = []
+        for src, dst in dirty:
+            route = self.best_cycle_through(src, dst)
+            if route is not None:
+                self._add_cycle(route)
+                found.append(route)
+        return found
+
+    @staticmethod
+    def _canonical(tokens: List[str]) -> Tuple[str, ...]:
+        cycle = tokens[:-1]
+        start = cycle.index(min(cycle))
+        return tuple(cycle[start:] + cycle[:start])
+
+    def _add_cycle(self, route: Route):
+        key = self._canonical(route.tokens)
+        if key in self.cycles:
+            self._drop_cycle(key)
+        self.cycles[key] = route
+        for edge in route.edges():
+            self._cycles_by_edge.setdefault(edge, set()).add(key)
+
+    def _drop_cycle(self, key: Tuple[str, ...]) -> Route:
+        route = self.cycles.pop(key)
+        for edge in route.edges():
+            keys = self._cycles_by_edge.get(edge)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._cycles_by_edge[edge]
+        return route
+
+    def _price_cycle(self, tokens: List[str]) -> Route | None:
+        """Prices a token path on the current best edges; None if a hop is gone."""
+        venues, rate = [], 1.0
+        for src, dst in zip(tokens, tokens[1:]):
+            edge = self._out.get(src, {}).get(dst)
+            if edge is None:
+                return None
+            venues.append(edge[1])
+            rate *= edge[2]
+        return Route(tokens, venues, rate)
+
+    def best_cycle_through(self, src: str, dst: str, max_hops: int | None = None) -> Route | None:
+        """
+        Most profitable cycle using the edge src -> dst with at most max_hops
+        edges, or None if none is profitable. Expands hop-bounded layers out
+        of dst and closes each one back into src through the reverse index,
+        so the triangular case costs O(degree of dst).
+        """
+        edge = self._out.get(src, {}).get(dst)
+        if edge is None:
+            return None
+        max_hops = max_hops or self.max_hops
+        closing = self._in.get(src, {})
+
+        best_weight, best_path = -edge[0], None # cycle must beat a zero total weight
+        layer = {dst: (0.0, None)}
+        layers = [layer]
+        for k in range(max_hops - 1):
+            for node, (dist, _) in layer.items():
+                back = closing.get(node)
+                if back is not None and dist + back[0] < best_weight:
+                    best_weight, best_path = dist + back[0], (k, node)
+            if k == max_hops - 2:
+                break
+            following: Dict[str, Tuple[float, str]] = {}
+            for node, (dist, _) in layer.items():
+                for nxt, (weight, _, _) in self._out.get(node, {}).items():
+                    if nxt == src or nxt == dst:
+                        continue # keeps cycles simple
+                    candidate = dist + weight
+                    if nxt not in following or candidate < following[nxt][0]:
+                        following[nxt] = (candidate, node)
+            layer = following
+            layers.append(layer)
+
+        if best_path is None:
+            return None
+        k, node = best_path
+        path = [node]
+        for depth in range(k, 0, -1):
+            node = layers[depth][node][1]
+            path.append(node)
+        path.reverse()
+        tokens = [src] + path + [src]
+        if len(set(tokens)) != len(tokens) - 1:
+            return None # the cheapest layer path revisited a token
+        return self._price_cycle(tokens)
+
+    def best_route(self, src: str, dst: str, max_hops: int | None = None) -> Route | None:
+        """Best conversion path from src to dst within max_hops, after fees."""
+        max_hops = max_hops or self.max_hops
+        layers = [{src: (0.0, None)}]
+        best = None
+        for _ in range(max_hops):
+            following: Dict[str, Tuple[float, str]] = {}
+            for node, (dist, _) in layers[-1].items():
+                for nxt, (weight, _, _) in self._out.get(node, {}).items():
+                    candidate = dist + weight
+                    if nxt not in following or candidate < following[nxt][0]:
+                        following[nxt] = (candidate, node)
+            if not following:
+                break
+            layers.append(following)
+            if dst in following and (best is None or following[dst][0] < best[0]):
+                best = (following[dst][0], len(layers) - 1)
+
+        if best is None:
+            return None
+        node, tokens = dst, [dst]
+        for depth in range(best[1], 0, -1):
+            node = layers[depth][node][1]
+            tokens.append(node)
+        tokens.reverse()
+        return self._price_cycle(tokens)
+
+    def find_negative_cycles(self) -> List[Route]:
+        """
+        Full Bellman-Ford scan for profitable cycles of any length, from a
+        virtual source joined to every token. Relaxation runs vectorised over
+        the edge arrays, so a pass over thousands of edges is one NumPy call.
+        Found cycles are added to `cycles`.
+        """
+        tokens = self.tokens
+        if not tokens:
+            return []
+        index = {token: i for i, token in enumerate(tokens)}
+        src, dst, weight = [], [], []
+        for a, edges in self._out.items():
+            for b, (w, _, _) in edges.items():
+                src.append(index[a])
+                dst.append(index[b])
+                weight.append(w)
+        if not src:
+            return []
+        src, dst, weight = np.array(src), np.array(dst), np.array(weight)
+
+        n = len(tokens)
+        dist = np.zeros(n)
+        pred = np.full(n, -1)
+        relaxed = np.zeros(0, dtype=int)
+        for _ in range(n):
+            candidate = dist[src] + weight
+            improving = candidate < dist[dst] - 1e-12
+            if not improving.any():
+                return [] # converged: no negative cycle anywhere
+            # Lowest candidate per destination wins this pass
+            edges = np.flatnonzero(improving)
+            edges = edges[np.lexsort((candidate[edges], dst[edges]))]
+            first = np.ones(len(edges), dtype=bool)
+            first[1:] = dst[edges][1:] != dst[edges][:-1]
+            edges = edges[first]
+            dist[dst[edges]] = candidate[edges]
+            pred[dst[edges]] = src[edges]
+            relaxed = dst[edges]
+
+        # Still relaxing after n passes: walking back n steps lands on a cycle
+        found: Dict[Tuple[str, ...], Route] = {}
+        seen: Set[int] = set()
+        for node in relaxed:
+            node = int(node)
+            for _ in range(n):
+                node = int(pred[node])
+                if node < 0:
+                    break
+            if node < 0 or node in seen:
+                continue
+            cycle = [node]
+            current = int(pred[node])
+            while current >= 0 and current != node and current not in cycle:
+                cycle.append(current)
+                current = int(pred[current])
+            seen.update(cycle)
+            if current != node:
+                continue
+            names = [tokens[i] for i in reversed(cycle)]
+            route = self._price_cycle(names + [names[0]])
+            if route is not None and route.rate > 1:
+                found[self._canonical(route.tokens)] = route
+
+        for route in found.values():
+            self._add_cycle(route)
+        return list(found.values())
+
+    def profitable_cycles(self, limit: int | None = None) -> List[Route]:
+        """Known profitable cycles, most profitable first."""
+        ranked = sorted(self.cycles.values(), key=lambda route: route.rate, reverse=True)
+        return ranked[:limit] if limit is not None else ranked
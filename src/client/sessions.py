@@ -0,0 +1,170 @@
+# src/client/sessions.py
+
+import asyncio
+import importlib.util
+import ssl
+from typing import Dict
+from urllib.parse import urlparse
+
+import aiohttp
+import certifi
+import httpx
+from solana.rpc.async_api import AsyncClient
+from solana.rpc.commitment import Commitment
+from solana.rpc.providers.async_http import AsyncHTTPProvider
+
+# httpx only speaks HTTP/2 when the optional h2 package is installed
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+DEFAULT_MAX_CONNECTIONS = 100       # across every host in one pool
+DEFAULT_MAX_PER_HOST = 20           # in-flight requests per host; the rest queue
+DEFAULT_KEEPALIVE = 30.0            # seconds an idle connection is kept open
+DEFAULT_TIMEOUT = 10.0
+
+
+class PooledHTTPProvider(AsyncHTTPProvider):
+    """
+    solana-py's async HTTP provider, posting through a shared httpx client
+    instead of opening its own. `limit` caps in-flight requests to its host.
+    """
+    def __init__(self, endpoint: str, session: httpx.AsyncClient, limit: asyncio.Semaphore,
+                 timeout: float = DEFAULT_TIMEOUT):
+        # Skip AsyncHTTPProvider.__init__, which would open a client of its own
+        super(AsyncHTTPProvider, self).__init__(endpoint, None, timeout)
+        self.session = session
+        self.limit = limit
+
+    async def make_request_unparsed(self, body) -> str:
+        async with self.limit:
+            return await super().make_request_unparsed(body)
+
+    async def make_batch_request_unparsed(self, reqs) -> str:
+        async with self.limit:
+            return await super().make_batch_request_unparsed(reqs)
+
+    async def close(self):
+        """The session belongs to the SessionRegistry, which closes it."""
+
+
+class PooledAsyncClient(AsyncClient):
+    """AsyncClient over a PooledHTTPProvider"""
+    def __init__(self, provider: PooledHTTPProvider, commitment: Commitment | None = None):
+        # Skip AsyncClient.__init__, which would build its own provider
+        super(AsyncClient, self).__init__(commitment)
+        self._provider = provider
+
+
+class SessionRegistry:
+    """
+    Connection pools shared by every client in the process:
+
+    - one Solana AsyncClient per RPC URL, reference counted so DEX entries
+      pointing at the same node share it, all posting through one pooled
+      keep-alive httpx client (HTTP/2 when available) with a cap on
+      in-flight requests per host
+    - one aiohttp session for every ccxt exchange, whose connector
+      bounds concurrency overall and per host
+
+    Both are created lazily and closed together by close().
+    """
+    def __init__(self, max_connections: int = DEFAULT_MAX_CONNECTIONS,
+                 max_per_host: int = DEFAULT_MAX_PER_HOST,
+                 keepalive: float = DEFAULT_KEEPALIVE,
+                 timeout: float = DEFAULT_TIMEOUT):
+        self.max_connections = max_connections
+        self.max_per_host = max_per_host
+        self.keepalive = keepalive
+        self.timeout = timeout
+        self._rpc_clients: Dict[str, AsyncClient] = {}
+        self._rpc_refs: Dict[str, int] = {}
+        self._rpc_session: httpx.AsyncClient | None = None
+        self._host_limits: Dict[str, asyncio.Semaphore] = {}
+        self._http_session: aiohttp.ClientSession | None = None
+
+    @classmethod
+    def from_config(cls, config: Dict) -> 'SessionRegistry':
+        return cls(
+            max_connections=config.get('max_connections', DEFAULT_MAX_CONNECTIONS),
+            max_per_host=config.get('max_connections_per_host', DEFAULT_MAX_PER_HOST),
+            keepalive=config.get('keepalive', DEFAULT_KEEPALIVE),
+            timeout=config.get('http_timeout', DEFAULT_TIMEOUT),
+        )
+
+    def _httpx_client(self) -> httpx.AsyncClient:
+        """The httpx client every RPC URL posts through"""
+        if self._rpc_session is None or self._rpc_session.is_closed:
+            self._rpc_session = httpx.AsyncClient(
+                http2=HTTP2_AVAILABLE,
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections,
+                    keepalive_expiry=self.keepalive,
+                ),
+                # Queue for a free connection instead of failing when the pool is busy
+                timeout=httpx.Timeout(self.timeout, pool=None),
+            )
+        return self._rpc_session
+
+    def acquire_rpc(self, rpc_url: str, commitment: Commitment | None = None) -> AsyncClient:
+        """The shared AsyncClient for `rpc_url`; pair every call with release_rpc."""
+        client = self._rpc_clients.get(rpc_url)
+        if client is None:
+            host = urlparse(rpc_url).netloc
+            limit = self._host_limits.setdefault(host, asyncio.Semaphore(self.max_per_host))
+            provider = PooledHTTPProvider(rpc_url, self._httpx_client(), limit, self.timeout)
+            client = self._rpc_clients[rpc_url] = PooledAsyncClient(provider, commitment)
+        self._rpc_refs[rpc_url] = self._rpc_refs.get(rpc_url, 0) + 1
+        return client
+
+    async def release_rpc(self, rpc_url: str):
+        """Drops one reference; the pool closes when its last user lets go."""
+        refs = self._rpc_refs.get(rpc_url, 0) - 1
+        if refs > 0:
+            self._rpc_refs[rpc_url] = refs
+            return
+        self._rpc_refs.pop(rpc_url, None)
+        client = self._rpc_clients.pop(rpc_url, None)
+        if client is not None:
+            await client.close()
+
+    def http_session(self) -> aiohttp.ClientSession:
+        """The aiohttp session shared by ccxt clients; needs a running event loop."""
+        if self._http_session is None or self._http_session.closed:
+            connector = aiohttp.TCPConnector(
+                ssl=ssl.create_default_context(cafile=certifi.where()),
+                limit=self.max_connections,
+                limit_per_host=self.max_per_host,
+                keepalive_timeout=self.keepalive,
+                ttl_dns_cache=300,
+                enable_cleanup_closed=True,
+            )
+            self._http_session = aiohttp.ClientSession(connector=connector)
+        return self._http_session
+
+    def attach_exchange(self, exchange) -> bool:
+        """
+        Points a ccxt async exchange at the shared session. ccxt leaves
+        sessions it did not create open on close(), so the pool outlives
+        any one exchange. Returns False (ccxt keeps its own session) when
+        called outside an event loop.
+        """
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return False
+        exchange.session = self.http_session()
+        exchange.own_session = False
+        return True
+
+    async def close(self):
+        for client in self._rpc_clients.values():
+            await client.close()
+        self._rpc_clients.clear()
+        self._rpc_refs.clear()
+        self._host_limits.clear()
+        if self._rpc_session is not None:
+            await self._rpc_session.aclose()
+            self._rpc_session = None
+        if self._http_session is not None:
+            await self._http_session.close()
+            self._http_session = None
@@ -1,44 +1,130 @@
 # src/client/solana_client.py
 import asyncio
 import base64
+import logging
 import base58
 import os
 from pathlib import Path
 import json
-from typing import Dict, List, Optional, Any
+import websockets
+from typing import Callable, Dict, List, Optional, Any, Sequence
 from solana.rpc.async_api import AsyncClient
 from solana.rpc.commitment import Confirmed
+from solders.instruction import Instruction
 from solders.transaction import Transaction
 from solders.keypair import Keypair
 from solders.pubkey import Pubkey
 from anchorpy import Program, Provider, Wallet, Context, Idl
 
+from .pools import get_decoder
+from .quotes import PoolQuote, optimal_arbitrage
+from .endpoints import EndpointPool, DEFAULT_HEDGE, DEFAULT_MAX_SLOT_LAG
+from .metrics import metrics
+from .sessions import SessionRegistry
+from .transactions import BlockhashCache, TransactionPipeline, TransactionResult
+
+MAX_MULTIPLE_ACCOUNTS = 100  # getMultipleAccounts RPC limit per request
+
+STREAM_BACKOFF_MIN = 1.0   # seconds before the first reconnect attempt
+STREAM_BACKOFF_MAX = 30.0  # reconnect delay ceiling
+
+# (sell pool, buy pool, token_a size, minimum token_a back) -> both swap legs' instructions
+SwapBuilder = Callable[[str, str, float, float], Sequence[Instruction]]
+
+logger = logging.getLogger("trader.client.solana")
+
 
 class SolanaClient:
     """
     Client for interacting with Solana AMMs (Raydium, Orca, etc.)
     """
     
-    def __init__(self, rpc_url: str, wallet_private_key: str, program_id: str):
+    def __init__(
+        self,
+        rpc_url: str,
+        wallet_private_key: str,
+        program_id: str,
+        ws_url: str | None = None,
+        compute_unit_limit: int | None = None,
+        compute_unit_price: int | None = None,
+        sessions: SessionRegistry | None = None,
+        rpc_urls: List[str] | None = None,
+        rpc_hedge: int = DEFAULT_HEDGE,
+        rpc_max_slot_lag: int = DEFAULT_MAX_SLOT_LAG,
+    ):
         self.rpc_url = rpc_url
+        # Every endpoint for this DEX, rpc_url first; reads race the healthiest ones
+        self.rpc_urls = list(dict.fromkeys([rpc_url, *(rpc_urls or [])]))
+        self.rpc_hedge = rpc_hedge
+        self.rpc_max_slot_lag = rpc_max_slot_lag
+        self.endpoints: EndpointPool | None = None
+        self.ws_url = ws_url or self._derive_ws_url(rpc_url)
         self.wallet = self._load_wallet(wallet_private_key)
         self.program_id = Pubkey.from_string(program_id)
         self.client = None
         self.program = None
         self.provider = None
+        self.compute_unit_limit = compute_unit_limit
+        self.compute_unit_price = compute_unit_price # priority fee, micro-lamports per CU
+        self.transactions: TransactionPipeline | None = None
+        # Shared connection pools; without one the client owns its own AsyncClient
+        self.sessions = sessions
+        # amm_address -> (decoder, dependency addresses, (mint_a, mint_b))
+        self._pool_layouts: Dict[str, tuple] = {}
+        # Account data that never changes once fetched (e.g. mint decimals)
+        self._static_accounts: Dict[str, bytes] = {}
         
     async def initialize(self):
         """Initialize the Solana client connection"""
-        self.client = AsyncClient(self.rpc_url)
+        self.endpoints = EndpointPool(
+            self.rpc_urls,
+            self.sessions,
+            hedge=self.rpc_hedge,
+            max_slot_lag=self.rpc_max_slot_lag,
+        )
+        self.endpoints.start()
+        self.client = self.endpoints.primary
         self.provider = Provider(self.client, Wallet(self.wallet))
         
         idl = await self._load_idl()
         
         if idl:
             self.program = Program(idl, self.program_id, self.provider)
-            print(f"✅ Solana client initialized with program: {self.program_id}")
+            logger.info("Solana client initialized with program: %s", self.program_id)
         else:
-            print("❌ Failed to load IDL")
+            logger.error("Failed to load IDL")
+    
+    def _pipeline(self) -> TransactionPipeline:
+        """
+        The transaction pipeline, started on first use: its blockhash refresh,
+        signature stream and status sweep cost RPC credits that clients only
+        reading prices shouldn't spend.
+        """
+        if self.transactions is None:
+            self.transactions = TransactionPipeline(
+                self.client,
+                self.wallet,
+                self.ws_url,
+                BlockhashCache(self.client),
+                compute_unit_limit=self.compute_unit_limit,
+                compute_unit_price=self.compute_unit_price,
+            )
+            self.transactions.start()
+        return self.transactions
+
+    async def send_transaction(self, instructions: Sequence[Instruction],
+                               signers: Sequence[Keypair] = ()) -> TransactionResult:
+        """Builds, signs (wallet plus `signers`), sends and confirms one transaction."""
+        if not instructions:
+            raise ValueError("No instructions to send")
+        return await self._pipeline().send(instructions, signers)
+    
+    @staticmethod
+    def _derive_ws_url(rpc_url: str) -> str:
+        """Map an HTTP RPC endpoint to its websocket (pubsub) endpoint"""
+        ws_url = rpc_url.replace("https://", "wss://", 1).replace("http://", "ws://", 1)
+        # solana-test-validator serves pubsub on the RPC port + 1
+        return ws_url.replace(":8899", ":8900")
     
     def _load_wallet(self, private_key_str: str) -> Keypair:
         """Load wallet from private key string directly from config"""
@@ -46,9 +132,8 @@ class SolanaClient:
             if not private_key_str or private_key_str == "3SbpjTnpowgFhvgZwpTeqKK86DdbJRdvQTYk5LBtZxjY":
                 # Generate a new wallet for testing
                 new_wallet = Keypair()
-                private_key_base58 = base58.b58encode(bytes(new_wallet)).decode('utf-8')
-                print(f"📝 Generated new wallet: {new_wallet.pubkey()}")
-                print(f"🔑 Private key (save this in config): {private_key_base58}")
+                # The secret key stays out of the logs; configure a real wallet to keep one
+                logger.warning("Generated new throwaway wallet: %s", new_wallet.pubkey())
                 return new_wallet
             
             # Handle base58 encoded private key (most common)
@@ -60,14 +145,14 @@ class SolanaClient:
                     raise ValueError(f"Invalid key length: {len(key_bytes)}")
                     
             except Exception as e:
-                print(f"❌ Failed to decode base58 private key: {e}")
+                logger.error("Failed to decode base58 private key: %s", e)
                 raise
                 
         except Exception as e:
-            print(f"❌ Failed to load wallet: {e}")
+            logger.error("Failed to load wallet: %s", e)
             # Generate a new wallet for testing
             new_wallet = Keypair()
-            print(f"📝 Generated new wallet: {new_wallet.pubkey()}")
+            logger.warning("Generated new throwaway wallet: %s", new_wallet.pubkey())
             return new_wallet
     
     async def _load_idl(self) -> Optional[Idl]:
@@ -76,19 +161,19 @@ class SolanaClient:
             idl_dir = Path(__file__).parent.parent.parent / "anchor" / "target" / "idl"
             
             if not idl_dir.exists():
-                print(f"❌ IDL directory not found: {idl_dir}")
+                logger.error("IDL directory not found: %s", idl_dir)
                 return None
             
             # List all JSON files in the IDL directory
             idl_files = list(idl_dir.glob("*.json"))
             
             if not idl_files:
-                print(f"❌ No IDL files found in: {idl_dir}")
+                logger.error("No IDL files found in: %s", idl_dir)
                 return None
             
             # Use the first IDL file found (there should only be one)
             idl_path = idl_files[0]
-            print(f"📁 Found IDL file: {idl_path.name}")
+            logger.info("Found IDL file: %s", idl_path.name)
             
             with open(idl_path, 'r') as f:
                 idl_json = json.load(f)
@@ -96,7 +181,7 @@ class SolanaClient:
             return Idl.from_json(idl_json)
             
         except Exception as e:
-            print(f"❌ Error loading IDL: {e}")
+            logger.error("Error loading IDL: %s", e)
             return None
     
     async def get_balance(self) -> float:
@@ -105,7 +190,7 @@ class SolanaClient:
             balance = await self.client.get_balance(self.wallet.pubkey())
             return balance.value / 1_000_000_000  # Convert lamports to SOL
         except Exception as e:
-            print(f"Error getting balance: {e}")
+            logger.warning("Error getting balance: %s", e)
             return 0.0
    
     async def airdrop_sol(self, amount: float = 1.0):
@@ -116,14 +201,14 @@ class SolanaClient:
             
             # Confirm transaction
             await self.client.confirm_transaction(signature.value)
-            print(f"✅ Airdrop successful: {amount} SOL")
+            logger.info("Airdrop successful: %s SOL", amount)
         except Exception as e:
-            print(f"❌ Airdrop failed: {e}")
+            logger.error("Airdrop failed: %s", e)
     
     async def initialize_arbitrage_account(self):
         """Initialize the arbitrage account on-chain"""
         if not self.program:
-            print("❌ Program not initialized")
+            logger.error("Program not initialized")
             return None
             
         try:
@@ -142,19 +227,19 @@ class SolanaClient:
                 }
             )
             
-            print(f"✅ Arbitrage account initialized: {arbitrage_account.pubkey()}")
-            print(f"📝 Transaction: {tx}")
+            logger.info("Arbitrage account initialized: %s", arbitrage_account.pubkey())
+            logger.info("Transaction: %s", tx)
             
             return arbitrage_account.pubkey()
             
         except Exception as e:
-            print(f"❌ Failed to initialize arbitrage account: {e}")
+            logger.error("Failed to initialize arbitrage account: %s", e)
             return None
     
     async def ping_contract(self, arbitrage_account_pubkey: Pubkey):
         """Send a ping to the contract to test connectivity"""
         if not self.program:
-            print("❌ Program not initialized")
+            logger.error("Program not initialized")
             return False
             
         try:
@@ -168,17 +253,17 @@ class SolanaClient:
                 }
             )
             
-            print(f"✅ Ping successful: {tx}")
+            logger.info("Ping successful: %s", tx)
             return True
             
         except Exception as e:
-            print(f"❌ Ping failed: {e}")
+            logger.error("Ping failed: %s", e)
             return False
 
     async def check_arbitrage_opportunity(self):
         """Check for arbitrage opportunities (mock implementation)"""
         if not self.program:
-            print("❌ Program not initialized")
+            logger.error("Program not initialized")
             return None
             
         try:
@@ -197,100 +282,348 @@ class SolanaClient:
             return result
             
         except Exception as e:
-            print(f"❌ Arbitrage check failed: {e}")
+            logger.error("Arbitrage check failed: %s", e)
             return None
         
     async def get_amm_price(self, amm_address: str, token_a: str, token_b: str) -> float:
         """
         Get current price from an AMM pool
         """
-        try:
-            # This would query the AMM pool account to get reserves and calculate price
-            # For Raydium, you'd fetch the pool state account
-            pool_pubkey = Pubkey.from_string(amm_address)
-            
-            # Fetch pool data
-            pool_data = await self.client.get_account_info(pool_pubkey)
-            if not pool_data.value:
-                raise Exception(f"Pool not found: {amm_address}")
-            
-            # Parse pool data to extract reserves and calculate price
-            # This is simplified - actual implementation depends on the AMM
-            price = await self._calculate_pool_price(pool_data.value.data, token_a, token_b)
-            return price
+        prices = await self.get_amm_prices({amm_address: (amm_address, token_a, token_b)})
+        return prices[amm_address]
+    
+    async def _fetch_accounts(self, addresses: List[str]) -> Dict[str, Any]:
+        """
+        Fetch any number of accounts with getMultipleAccounts, chunked at the RPC
+        limit and sent concurrently. Missing accounts are left out of the result.
+        """
+        addresses = list(dict.fromkeys(addresses))
+        chunks = [
+            addresses[i:i + MAX_MULTIPLE_ACCOUNTS]
+            for i in range(0, len(addresses), MAX_MULTIPLE_ACCOUNTS)
+        ]
+        
+        async def fetch_chunk(chunk: List[str]):
+            keys = [Pubkey.from_string(a) for a in chunk]
+            response = await self.endpoints.read(lambda client: client.get_multiple_accounts(keys))
+            return zip(chunk, response.value)
+        
+        accounts = {}
+        results = await asyncio.gather(*(fetch_chunk(chunk) for chunk in chunks), return_exceptions=True)
+        for result in results:
+            if isinstance(result, Exception):
+                metrics.increment('failures', component='rpc_accounts')
+                logger.warning("Error fetching accounts: %s", result)
+                continue
+            for address, account in result:
+                if account is not None:
+                    accounts[address] = account
+        return accounts
+    
+    def _resolve_layout(self, amm_address: str, owner: str, pool_data: bytes) -> Optional[tuple]:
+        """Pick the decoder for a pool and cache (decoder, dependency addresses, mints)"""
+        layout = self._pool_layouts.get(amm_address)
+        if layout is not None:
+            return layout
+        
+        decoder = get_decoder(owner, len(pool_data))
+        if decoder is None:
+            logger.warning("No pool decoder for %s (owner %s)", amm_address, owner)
+            return None
+        
+        view = memoryview(pool_data)
+        layout = (decoder, decoder.dependencies(view), decoder.mints(view))
+        self._pool_layouts[amm_address] = layout
+        return layout
+    
+    async def _fetch_dependencies(self, layouts) -> Dict[str, bytes]:
+        """Fetch the vault/mint accounts the given layouts need; static ones are cached"""
+        needed = [
+            address
+            for _, dependencies, _ in layouts
+            for address in dependencies
+            if address not in self._static_accounts
+        ]
+        fetched = {address: account.data for address, account in (await self._fetch_accounts(needed)).items()}
+        
+        for decoder, dependencies, _ in layouts:
+            if decoder.static_dependencies:
+                for address in dependencies:
+                    if address in fetched:
+                        self._static_accounts[address] = fetched[address]
+        
+        return {**self._static_accounts, **fetched}
+    
+    async def _load_pools(self, pools: Dict[str, tuple[str, str, str]]) -> Dict[str, tuple]:
+        """
+        Fetch pool accounts, then the vaults/mints their decoders need, with
+        getMultipleAccounts chunked at the RPC limit. Returns
+        symbol -> (pool data, layout, dependency data) for every pool that loaded.
+        """
+        pool_accounts = await self._fetch_accounts([amm_address for amm_address, _, _ in pools.values()])
+        
+        layouts = {}
+        for symbol, (amm_address, _, _) in pools.items():
+            account = pool_accounts.get(amm_address)
+            if account is None:
+                logger.warning("Pool not found: %s", amm_address)
+                continue
+            layout = self._resolve_layout(amm_address, str(account.owner), account.data)
+            if layout is not None:
+                layouts[symbol] = layout
+        
+        accounts = await self._fetch_dependencies(list(layouts.values()))
+        
+        loaded = {}
+        for symbol, layout in layouts.items():
+            dependency_data = [accounts.get(address) for address in layout[1]]
+            if None in dependency_data:
+                logger.warning("Missing pool accounts for %s", symbol)
+                continue
+            loaded[symbol] = (pool_accounts[pools[symbol][0]].data, layout, dependency_data)
+        return loaded
+    
+    async def get_amm_prices(self, pools: Dict[str, tuple[str, str, str]]) -> Dict[str, float]:
+        """
+        Get current prices for many AMM pools at once.
+        `pools` maps a symbol to (amm_address, token_a, token_b). Latency scales with
+        the number of getMultipleAccounts chunks rather than the number of symbols.
+        """
+        prices: Dict[str, float] = {symbol: 0.0 for symbol in pools}
+        for symbol, (pool_data, layout, dependency_data) in (await self._load_pools(pools)).items():
+            prices[symbol] = self._calculate_pool_price(pool_data, layout, dependency_data, pools[symbol][1])
+        return prices
+    
+    async def get_pool_quotes(self, pools: Dict[str, tuple[str, str, str]]) -> Dict[str, PoolQuote]:
+        """
+        Reserves and fee tier of many AMM pools at once, oriented with token_a as
+        base, for sizing trades. `pools` is keyed like get_amm_prices.
+        """
+        quotes = {}
+        for symbol, (pool_data, layout, dependency_data) in (await self._load_pools(pools)).items():
+            quote = self._calculate_pool_quote(pool_data, layout, dependency_data, pools[symbol][1])
+            if quote is not None:
+                quotes[symbol] = quote
+        return quotes
+    
+    async def stream_pool_prices(
+        self,
+        pools: Dict[str, tuple[str, str, str]],
+        on_price: Callable[[str, float], None],
+    ):
+        """
+        Stream prices for AMM pools with accountSubscribe.
+        `pools` maps a symbol to (amm_address, token_a, token_b); `on_price` is called
+        with (symbol, price) every time a pool or one of its vaults changes. Runs until
+        cancelled, reconnecting with exponential backoff whenever the socket drops.
+        """
+        backoff = STREAM_BACKOFF_MIN
+        
+        while True:
+            try:
+                async with websockets.connect(self.ws_url) as ws:
+                    requests: Dict[int, str] = {}
+                    subscriptions: Dict[int, str] = {}
+                    accounts: Dict[str, bytes] = {}
+                    # account address -> symbols whose price depends on it
+                    watchers: Dict[str, List[str]] = {}
+                    tracked: set[str] = set()
+                    
+                    async def subscribe(address: str):
+                        if address in requests.values():
+                            return
+                        request_id = len(requests)
+                        requests[request_id] = address
+                        await ws.send(json.dumps({
+                            "jsonrpc": "2.0",
+                            "id": request_id,
+                            "method": "accountSubscribe",
+                            "params": [address, {"encoding": "base64", "commitment": "confirmed"}],
+                        }))
+                    
+                    async def track_dependencies(symbol: str, owner: str) -> Optional[tuple]:
+                        # First update of a pool on this connection: learn its layout and
+                        # load (and, if they change, subscribe to) its vault/mint accounts
+                        amm_address = pools[symbol][0]
+                        layout = self._resolve_layout(amm_address, owner, accounts[amm_address])
+                        if layout is None:
+                            return None
+                        
+                        decoder, dependencies, _ = layout
+                        accounts.update(await self._fetch_dependencies([layout]))
+                        for address in dependencies:
+                            watchers.setdefault(address, [])
+                            if symbol not in watchers[address]:
+                                watchers[address].append(symbol)
+                            if not decoder.static_dependencies:
+                                await subscribe(address)
+                        
+                        tracked.add(symbol)
+                        return layout
+                    
+                    for symbol, (amm_address, _, _) in pools.items():
+                        watchers.setdefault(amm_address, []).append(symbol)
+                        await subscribe(amm_address)
+                    
+                    async for raw in ws:
+                        message = json.loads(raw)
+                        
+                        if message.get("method") == "accountNotification":
+                            params = message["params"]
+                            address = subscriptions.get(params["subscription"])
+                            if address is None:
+                                continue
+                            
+                            value = params["result"]["value"]
+                            accounts[address] = base64.b64decode(value["data"][0])
+                            
+                            for symbol in watchers.get(address, ()):
+                                amm_address, token_a, _ = pools[symbol]
+                                if symbol in tracked:
+                                    layout = self._pool_layouts[amm_address]
+                                elif address == amm_address:
+                                    layout = await track_dependencies(symbol, value["owner"])
+                                else:
+                                    layout = None
+                                if layout is None:
+                                    continue
+                                
+                                dependency_data = [accounts.get(dependency) for dependency in layout[1]]
+                                if None not in dependency_data:
+                                    price = self._calculate_pool_price(accounts[amm_address], layout, dependency_data, token_a)
+                                    on_price(symbol, price)
+                        elif "result" in message and message.get("id") in requests:
+                            subscriptions[message["result"]] = requests[message["id"]]
+                            # Only reset the backoff once the node has accepted a subscription
+                            backoff = STREAM_BACKOFF_MIN
+                        elif "error" in message:
+                            metrics.increment('failures', component='account_subscribe')
+                            logger.warning("accountSubscribe error: %s", message['error'])
+                            
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                metrics.increment('failures', component='pool_stream')
+                logger.warning("Pool stream disconnected (%s), reconnecting in %.0fs", e, backoff)
             
-        except Exception as e:
-            print(f"Error getting AMM price: {e}")
-            return 0.0
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, STREAM_BACKOFF_MAX)
     
-    async def _calculate_pool_price(self, pool_data: bytes, token_a: str, token_b: str) -> float:
+    def _calculate_pool_price(self, pool_data: bytes, layout: tuple, dependency_data: List[bytes], token_a: str) -> float:
         """
-        Calculate price from pool data
-        This is AMM-specific and would need to be implemented for each DEX
+        Calculate the price of token_a from pool data with the pool's registered
+        layout decoder. Reserves are read in place from the account bytes.
         """
-        # Simplified implementation - you'd need to parse the actual pool structure
-        # For a constant product pool: price = reserve_b / reserve_a
         try:
-            # Mock implementation - replace with actual AMM data parsing
-            reserve_a = 1000000  # Would extract from pool_data
-            reserve_b = 50000    # Would extract from pool_data
+            decoder, _, (_, mint_b) = layout
+            with metrics.timer('stage_seconds', stage='decode'):
+                price = decoder.price(memoryview(pool_data), [memoryview(data) for data in dependency_data])
             
-            if reserve_a == 0:
-                return 0.0
-                
-            return reserve_b / reserve_a
+            # Pool lists token_a second, so quote the reciprocal
+            if mint_b == token_a:
+                return 1 / price if price else 0.0
+            return price
         except Exception as e:
-            print(f"Error calculating pool price: {e}")
+            metrics.increment('failures', component='pool_decode')
+            logger.warning("Error calculating pool price: %s", e)
             return 0.0
     
+    def _calculate_pool_quote(self, pool_data: bytes, layout: tuple, dependency_data: List[bytes], token_a: str) -> Optional[PoolQuote]:
+        """Decode a pool's reserves and fee into a PoolQuote with token_a as base"""
+        try:
+            decoder, _, (_, mint_b) = layout
+            view = memoryview(pool_data)
+            reserve_a, reserve_b, decimals_a, decimals_b = decoder.reserves(view, [memoryview(data) for data in dependency_data])
+            base, quote = reserve_a / 10 ** decimals_a, reserve_b / 10 ** decimals_b
+            if mint_b == token_a:
+                base, quote = quote, base
+            return PoolQuote(base, quote, decoder.fee(view))
+        except Exception as e:
+            metrics.increment('failures', component='pool_decode')
+            logger.warning("Error calculating pool quote: %s", e)
+            return None
+    
     async def execute_arbitrage(
         self, 
         amm_a: str, 
         amm_b: str, 
         token_a: str, 
         token_b: str, 
-        amount: float
+        amount: float,
+        build_swaps: SwapBuilder,
+        min_profit: float = 0.0
     ) -> bool:
         """
-        Execute arbitrage trade between two AMMs
+        Execute arbitrage trade between two AMMs.
+        `amount` is the most token_a to put through the round trip: sell token_a on
+        the pool that pays more for it, buy it back on the other. The trade is sized
+        against both pools' reserves and only sent if it still clears `min_profit`
+        token_a after fees and price impact. `build_swaps` turns the sized trade
+        into the swap instructions for both pools (Anchor program or direct CPI).
         """
         try:
-            # 1. Check if arbitrage is still profitable
-            price_a = await self.get_amm_price(amm_a, token_a, token_b)
-            price_b = await self.get_amm_price(amm_b, token_a, token_b)
-            
-            if not self._is_arbitrage_profitable(price_a, price_b, amount):
-                print("Arbitrage no longer profitable")
+            # 1. Check if arbitrage is still profitable, from live reserves
+            quotes = await self.get_pool_quotes({
+                amm_a: (amm_a, token_a, token_b),
+                amm_b: (amm_b, token_a, token_b),
+            })
+            if amm_a not in quotes or amm_b not in quotes:
+                logger.info("Arbitrage pools unavailable")
                 return False
             
-            # 2. Prepare transaction
-            transaction = Transaction()
-            
-            # 3. Add swap instructions for both AMMs
-            # This would use the Anchor program or direct CPI calls
+            plan = self._plan_arbitrage(quotes[amm_a], quotes[amm_b], amount)
+            if plan is None or plan[3] <= min_profit:
+                logger.info("Arbitrage no longer profitable")
+                return False
+            sell_first, size, expected_out, profit = plan
+            sell_amm, buy_amm = (amm_a, amm_b) if sell_first else (amm_b, amm_a)
+            logger.info("Arbitrage: sell %.6f on %s, buy back on %s, expect +%.6f", size, sell_amm, buy_amm, profit)
             
-            # 4. Send transaction
-            signature = await self.provider.send(transaction)
+            # 2. Swap instructions for both legs, expected_out as the second leg's minimum output
+            instructions = build_swaps(sell_amm, buy_amm, size, expected_out)
             
-            # 5. Confirm transaction
-            await self.client.confirm_transaction(signature)
+            # 3. Signed against the cached blockhash; confirmation arrives over signatureSubscribe
+            result = await self.send_transaction(instructions)
+            if not result.ok:
+                metrics.increment('failures', component='arbitrage')
+                logger.error("Arbitrage transaction failed: %s", result.error)
+                return False
+            signature = result.signature
             
-            print(f"Arbitrage executed successfully: {signature}")
+            logger.info("Arbitrage executed successfully: %s (landed in %.0fms)", signature, result.latency * 1000)
             return True
             
         except Exception as e:
-            print(f"Arbitrage execution failed: {e}")
+            metrics.increment('failures', component='arbitrage')
+            logger.error("Arbitrage execution failed: %s", e)
             return False
     
-    def _is_arbitrage_profitable(self, price_a: float, price_b: float, amount: float) -> bool:
+    def _plan_arbitrage(self, quote_a: PoolQuote, quote_b: PoolQuote, amount: float) -> Optional[tuple]:
+        """
+        Best round trip of at most `amount` token_a between two pools, as
+        (sell on pool a first, size, token_a back, profit), or None if neither
+        direction makes money after fees and price impact.
+        """
+        size_ab, profit_ab = optimal_arbitrage(quote_a, quote_b, max_size=amount)
+        size_ba, profit_ba = optimal_arbitrage(quote_b, quote_a, max_size=amount)
+        if max(profit_ab, profit_ba) <= 0:
+            return None
+        if profit_ab >= profit_ba:
+            return True, size_ab, size_ab + profit_ab, profit_ab
+        return False, size_ba, size_ba + profit_ba, profit_ba
+    
+    def _is_arbitrage_profitable(self, quote_a: PoolQuote, quote_b: PoolQuote, amount: float) -> bool:
         """
-        Determine if arbitrage is profitable after fees
+        Determine if arbitrage is profitable after fees and slippage
         """
-        price_diff = abs(price_a - price_b)
-        min_price_diff = 0.01  # 1% minimum difference after fees
-        return price_diff / min(price_a, price_b) > min_price_diff
+        return self._plan_arbitrage(quote_a, quote_b, amount) is not None
     
     async def close(self):
         """Close the Solana client connection"""
-        if self.client:
-            await self.client.close()
\ No newline at end of file
+        if self.transactions:
+            await self.transactions.close()
+            self.transactions = None
+        if self.endpoints:
+            await self.endpoints.close()
+        self.endpoints = None
+        self.client = None
\ No newline at end of file
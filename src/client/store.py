@@ -0,0 +1,210 @@
+# src/client/store.py
+
+import os
+import re
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+# Fixed-width records; every file is a flat array of one of these
+OHLCV_DTYPE = np.dtype([
+    ('timestamp', '<i8'),
+    ('open', '<f8'),
+    ('high', '<f8'),
+    ('low', '<f8'),
+    ('close', '<f8'),
+    ('volume', '<f8'),
+])
+TICK_DTYPE = np.dtype([
+    ('timestamp', '<i8'),
+    ('price', '<f8'),
+])
+
+DEFAULT_MAX_OPEN_FILES = 256  # record files kept open; the least recently used are closed beyond this
+
+_UNSAFE = re.compile(r'[^A-Za-z0-9._-]')
+
+
+class RecordFile:
+    """
+    Append-only file of fixed-width records ordered by timestamp, read
+    through a memory map. With `replace_last`, a record carrying the last
+    stored timestamp overwrites it (the still-open candle); older
+    timestamps are dropped, so the file stays sorted for range reads.
+    """
+    def __init__(self, path: Path, dtype: np.dtype, replace_last: bool = False):
+        self.path = path
+        self.dtype = dtype
+        self.replace_last = replace_last
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(path, 'r+b' if path.exists() else 'w+b')
+
+        size = os.fstat(self._file.fileno()).st_size
+        self.count = size // dtype.itemsize
+        if size % dtype.itemsize:
+            # A torn write from a crash: drop the partial record
+            self._file.truncate(self.count * dtype.itemsize)
+        self.last_timestamp: int | None = None
+        if self.count:
+            self._file.seek((self.count - 1) * dtype.itemsize)
+            self.last_timestamp = int(np.frombuffer(self._file.read(dtype.itemsize), dtype=dtype)['timestamp'][0])
+        self._map: np.ndarray | None = None
+
+    def append(self, records: np.ndarray) -> int:
+        """Writes records newer than the last one stored; returns how many were added."""
+        if not len(records):
+            return 0
+        records = records[np.argsort(records['timestamp'], kind='stable')]
+        itemsize = self.dtype.itemsize
+
+        if self.last_timestamp is not None:
+            if self.replace_last:
+                same = records['timestamp'] == self.last_timestamp
+                if same.any():
+                    self._file.seek((self.count - 1) * itemsize)
+                    self._file.write(records[same][-1:].tobytes())
+                    self._file.flush()
+                records = records[records['timestamp'] > self.last_timestamp]
+            else:
+                records = records[records['timestamp'] >= self.last_timestamp]
+        if self.replace_last and len(records) > 1:
+            # Keep the last copy of any timestamp repeated within one batch
+            keep = np.append(records['timestamp'][1:] != records['timestamp'][:-1], True)
+            records = records[keep]
+        if not len(records):
+            return 0
+
+        self._file.seek(self.count * itemsize)
+        self._file.write(records.tobytes())
+        # Flushed with the batch so readers in other processes see it
+        self._file.flush()
+        self.count += len(records)
+        self.last_timestamp = int(records['timestamp'][-1])
+        return len(records)
+
+    def _view(self) -> np.ndarray:
+        if self._map is None or len(self._map) != self.count:
+            self._map = np.memmap(self.path, dtype=self.dtype, mode='r', shape=(self.count,)) if self.count else np.empty(0, self.dtype)
+        return self._map
+
+    def read(self, start: int | None = None, end: int | None = None, limit: int | None = None) -> np.ndarray:
+        """
+        Records with start <= timestamp < end, optionally only the last `limit`.
+        A read-only view into the mapped file; nothing is copied.
+        """
+        view = self._view()
+        timestamps = view['timestamp']
+        lo = int(np.searchsorted(timestamps, start, 'left')) if start is not None else 0
+        hi = int(np.searchsorted(timestamps, end, 'left')) if end is not None else len(view)
+        if limit is not None:
+            lo = max(lo, hi - limit)
+        return view[lo:hi]
+
+    def close(self):
+        self._file.flush()
+        self._file.close()
+        self._map = None
+
+
+class MarketStore:
+    """
+    On-disk history under `root`: one record file per (exchange, symbol,
+    timeframe) of OHLCV and one per (exchange, symbol) of ticks, e.g.
+    root/binance/BTC_USDT/1h.ohlcv and root/binance/BTC_USDT/ticks.bin.
+    Survives restarts, so candle caches warm-start from disk.
+
+    Ticks are buffered in memory and written in one batch per file by
+    flush(), which is safe to run on a worker thread. At most
+    `max_open_files` files are held open; the least recently used one is
+    closed and reopened on its next use. Views already handed out stay
+    valid, since each maps the file on its own.
+    """
+    def __init__(self, root: str | Path, max_open_files: int = DEFAULT_MAX_OPEN_FILES):
+        self.root = Path(root)
+        self.max_open_files = max_open_files
+        self._files: OrderedDict[Tuple[str, ...], RecordFile] = OrderedDict()
+        self._pending_ticks: Dict[Tuple[str, str], List[Tuple[int, float]]] = {}
+        # Appends only ever wait on the buffer lock, never on a flush's file writes
+        self._pending_lock = threading.Lock()
+        self._lock = threading.RLock()
+
+    def _file(self, key: Tuple[str, ...], name: str, dtype: np.dtype, replace_last: bool) -> RecordFile:
+        file = self._files.get(key)
+        if file is None:
+            exchange, symbol = key[0], key[1]
+            path = self.root / _UNSAFE.sub('_', exchange) / _UNSAFE.sub('_', symbol) / name
+            file = self._files[key] = RecordFile(path, dtype, replace_last)
+            while len(self._files) > self.max_open_files:
+                self._files.popitem(last=False)[1].close()
+        else:
+            self._files.move_to_end(key)
+        return file
+
+    def _ohlcv(self, exchange: str, symbol: str, timeframe: str) -> RecordFile:
+        return self._file((exchange, symbol, timeframe), f"{_UNSAFE.sub('_', timeframe)}.ohlcv", OHLCV_DTYPE, True)
+
+    def _ticks(self, exchange: str, symbol: str) -> RecordFile:
+        return self._file((exchange, symbol), "ticks.bin", TICK_DTYPE, False)
+
+    def append_candles(self, exchange: str, symbol: str, timeframe: str, candles: List[list]) -> int:
+        """Stores ccxt-style [timestamp, o, h, l, c, v] rows; the open candle is updated in place."""
+        if not candles:
+            return 0
+        records = np.empty(len(candles), dtype=OHLCV_DTYPE)
+        rows = np.asarray([candle[:6] for candle in candles], dtype=float)
+        records['timestamp'] = rows[:, 0]
+        for i, name in enumerate(OHLCV_DTYPE.names[1:], start=1):
+            records[name] = rows[:, i]
+        with self._lock:
+            return self._ohlcv(exchange, symbol, timeframe).append(records)
+
+    def candles(self, exchange: str, symbol: str, timeframe: str,
+                start: int | None = None, end: int | None = None, limit: int | None = None) -> np.ndarray:
+        """Stored candles in [start, end) as a zero-copy structured array"""
+        with self._lock:
+            return self._ohlcv(exchange, symbol, timeframe).read(start, end, limit)
+
+    def last_candle_timestamp(self, exchange: str, symbol: str, timeframe: str) -> int | None:
+        with self._lock:
+            return self._ohlcv(exchange, symbol, timeframe).last_timestamp
+
+    def append_ticks(self, exchange: str, timestamp: int, prices: Dict[str, float | None]) -> int:
+        """
+        Buffers one price per symbol at `timestamp` (ms) until the next
+        flush(); missing prices are skipped. Returns how many were buffered.
+        """
+        added = 0
+        with self._pending_lock:
+            for symbol, price in prices.items():
+                if price is None:
+                    continue
+                self._pending_ticks.setdefault((exchange, symbol), []).append((timestamp, price))
+                added += 1
+        return added
+
+    def flush(self) -> int:
+        """Writes every buffered tick, one append per file; returns how many were stored."""
+        with self._lock:
+            with self._pending_lock:
+                pending, self._pending_ticks = self._pending_ticks, {}
+            added = 0
+            for (exchange, symbol), ticks in pending.items():
+                added += self._ticks(exchange, symbol).append(np.array(ticks, dtype=TICK_DTYPE))
+            return added
+
+    def ticks(self, exchange: str, symbol: str,
+              start: int | None = None, end: int | None = None, limit: int | None = None) -> np.ndarray:
+        """Stored ticks in [start, end), buffered ones included, as a zero-copy structured array"""
+        with self._lock:
+            self.flush()
+            return self._ticks(exchange, symbol).read(start, end, limit)
+
+    def close(self):
+        with self._lock:
+            self.flush()
+            for file in self._files.values():
+                file.close()
+            self._files.clear()
@@ -0,0 +1,316 @@
+# src/client/transactions.py
+
+import asyncio
+import json
+import logging
+import time
+from typing import Dict, List, Sequence
+
+import websockets
+from solana.rpc.async_api import AsyncClient
+from solana.rpc.commitment import Confirmed
+from solana.rpc.types import TxOpts
+from solders.compute_budget import set_compute_unit_limit, set_compute_unit_price
+from solders.hash import Hash
+from solders.instruction import Instruction
+from solders.keypair import Keypair
+from solders.message import MessageV0
+from solders.signature import Signature
+from solders.transaction import VersionedTransaction
+
+from .metrics import metrics
+
+BLOCKHASH_REFRESH_INTERVAL = 2.0  # seconds; a blockhash stays valid for ~60-90s
+STATUS_SWEEP_INTERVAL = 2.0       # seconds between getSignatureStatuses fallbacks
+MAX_SIGNATURE_STATUSES = 256      # getSignatureStatuses RPC limit per request
+CONFIRM_BACKOFF_MIN = 1.0
+CONFIRM_BACKOFF_MAX = 30.0
+
+# Landed at this commitment or better counts as confirmed
+_LANDED = ("confirmed", "finalized")
+
+logger = logging.getLogger("trader.client.transactions")
+
+
+class BlockhashCache:
+    """
+    Keeps a recent blockhash warm in the background, so building a
+    transaction never waits on getLatestBlockhash.
+    """
+    def __init__(self, client: AsyncClient, refresh_interval: float = BLOCKHASH_REFRESH_INTERVAL):
+        self.client = client
+        self.refresh_interval = refresh_interval
+        self.blockhash: Hash | None = None
+        self.last_valid_block_height = 0
+        self.fetched_at = 0.0
+        self._ready = asyncio.Event()
+        self._task: asyncio.Task | None = None
+
+    async def refresh(self):
+        response = await self.client.get_latest_blockhash(commitment=Confirmed)
+        self.blockhash = response.value.blockhash
+        self.last_valid_block_height = response.value.last_valid_block_height
+        self.fetched_at = time.monotonic()
+        self._ready.set()
+
+    async def _run(self):
+        while True:
+            try:
+                await self.refresh()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                metrics.increment('failures', component='blockhash')
+                logger.warning("Blockhash refresh failed: %s", e)
+            await asyncio.sleep(self.refresh_interval)
+
+    def start(self):
+        """Starts the refresh loop; must be called from a running event loop."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def get(self) -> tuple[Hash, int]:
+        """(blockhash, last valid block height); waits only for the very first fetch"""
+        if not self._ready.is_set():
+            self.start()
+            await self._ready.wait()
+        return self.blockhash, self.last_valid_block_height
+
+    def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+
+
+class TransactionResult:
+    """Outcome of one submitted transaction, with its time to land."""
+    __slots__ = ("signature", "sent_at", "landed_at", "error", "last_valid_block_height")
+
+    def __init__(self, signature: Signature, sent_at: float, last_valid_block_height: int):
+        self.signature = signature
+        self.sent_at = sent_at
+        self.landed_at: float | None = None
+        self.error: str | None = None
+        self.last_valid_block_height = last_valid_block_height
+
+    @property
+    def ok(self) -> bool:
+        return self.landed_at is not None and self.error is None
+
+    @property
+    def latency(self) -> float | None:
+        """Seconds from send to confirmation"""
+        return self.landed_at - self.sent_at if self.landed_at is not None else None
+
+    def __repr__(self) -> str:
+        state = "ok" if self.ok else (self.error or "pending")
+        latency = f", {self.latency * 1000:.0f}ms" if self.latency is not None else ""
+        return f"TransactionResult({self.signature}, {state}{latency})"
+
+
+class TransactionPipeline:
+    """
+    Builds, pre-signs, submits and confirms transactions without blocking
+    on any single one of them:
+
+    - transactions are compiled against the BlockhashCache with the
+      configured compute-unit limit and priority fee prepended
+    - submit() sends raw bytes (no preflight) and returns a future at once
+    - one websocket carries a signatureSubscribe per in-flight signature;
+      a periodic getSignatureStatuses sweep covers reconnect gaps and
+      expires transactions whose blockhash ran out
+    """
+    def __init__(self, client: AsyncClient, payer: Keypair, ws_url: str,
+                 blockhashes: BlockhashCache | None = None,
+                 compute_unit_limit: int | None = None,
+                 compute_unit_price: int | None = None):
+        self.client = client
+        self.payer = payer
+        self.ws_url = ws_url
+        self.blockhashes = blockhashes or BlockhashCache(client)
+        self.compute_unit_limit = compute_unit_limit
+        self.compute_unit_price = compute_unit_price # micro-lamports per compute unit
+        self._pending: Dict[Signature, tuple[TransactionResult, asyncio.Future]] = {}
+        self._subscribe_queue: asyncio.Queue[Signature] = asyncio.Queue()
+        self._tasks: List[asyncio.Task] = []
+
+    def start(self):
+        """Starts the blockhash cache and confirmation tracking; needs a running event loop."""
+        self.blockhashes.start()
+        if not self._tasks:
+            self._tasks = [
+                asyncio.create_task(self._watch_signatures()),
+                asyncio.create_task(self._sweep_statuses()),
+            ]
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._pending)
+
+    def _budget_instructions(self) -> List[Instruction]:
+        instructions = []
+        if self.compute_unit_limit:
+            instructions.append(set_compute_unit_limit(self.compute_unit_limit))
+        if self.compute_unit_price:
+            instructions.append(set_compute_unit_price(self.compute_unit_price))
+        return instructions
+
+    async def build(self, instructions: Sequence[Instruction], signers: Sequence[Keypair] = ()) -> tuple[VersionedTransaction, int]:
+        """
+        Compile and sign a v0 transaction against the cached blockhash.
+        Returns it with the block height it must land by.
+        """
+        blockhash, last_valid_block_height = await self.blockhashes.get()
+        message = MessageV0.try_compile(
+            self.payer.pubkey(),
+            self._budget_instructions() + list(instructions),
+            [],
+            blockhash,
+        )
+        transaction = VersionedTransaction(message, [self.payer, *signers])
+        return transaction, last_valid_block_height
+
+    async def build_many(self, batches: Sequence[Sequence[Instruction]], signers: Sequence[Keypair] = ()) -> List[tuple[VersionedTransaction, int]]:
+        """Pre-sign several transactions against one blockhash, ready to fire together."""
+        await self.blockhashes.get()
+        return [await self.build(instructions, signers) for instructions in batches]
+
+    async def submit(self, transaction: VersionedTransaction, last_valid_block_height: int) -> asyncio.Future:
+        """
+        Send a signed transaction and return a future resolving to its
+        TransactionResult once it confirms, fails or expires.
+        """
+        signature = transaction.signatures[0]
+        if signature in self._pending:
+            # Resending the same signed bytes is a retry, not a new transaction
+            result, future = self._pending[signature]
+            await self._send(transaction, result.last_valid_block_height)
+            return future
+
+        result = TransactionResult(signature, time.monotonic(), last_valid_block_height)
+        future = asyncio.get_running_loop().create_future()
+        # Track before sending so a fast notification can't beat the bookkeeping
+        self._pending[signature] = (result, future)
+        self._subscribe_queue.put_nowait(signature)
+        await self._send(transaction, last_valid_block_height)
+        return future
+
+    async def _send(self, transaction: VersionedTransaction, last_valid_block_height: int):
+        try:
+            await self.client.send_raw_transaction(
+                bytes(transaction),
+                opts=TxOpts(skip_preflight=True, max_retries=0, last_valid_block_height=last_valid_block_height),
+            )
+        except Exception as e:
+            self._resolve(transaction.signatures[0], error=f"send failed: {e}")
+
+    async def submit_many(self, transactions: Sequence[tuple[VersionedTransaction, int]]) -> List[asyncio.Future]:
+        """Send pre-signed transactions concurrently; one future per transaction."""
+        return list(await asyncio.gather(*(self.submit(tx, height) for tx, height in transactions)))
+
+    async def send(self, instructions: Sequence[Instruction], signers: Sequence[Keypair] = ()) -> TransactionResult:
+        """Build, submit and wait for one transaction."""
+        transaction, height = await self.build(instructions, signers)
+        return await (await self.submit(transaction, height))
+
+    def _resolve(self, signature: Signature, error: str | None = None):
+        entry = self._pending.pop(signature, None)
+        if entry is None:
+            return
+        result, future = entry
+        if error is None:
+            result.landed_at = time.monotonic()
+        result.error = error
+        if not future.done():
+            future.set_result(result)
+
+    async def _watch_signatures(self):
+        """One websocket, one signatureSubscribe per pending signature."""
+        backoff = CONFIRM_BACKOFF_MIN
+        while True:
+            try:
+                async with websockets.connect(self.ws_url) as ws:
+                    requests: Dict[int, Signature] = {}
+                    subscriptions: Dict[int, Signature] = {}
+                    next_id = 0
+
+                    async def subscribe(signature: Signature):
+                        nonlocal next_id
+                        if signature not in self._pending:
+                            return
+                        requests[next_id] = signature
+                        await ws.send(json.dumps({
+                            "jsonrpc": "2.0",
+                            "id": next_id,
+                            "method": "signatureSubscribe",
+                            "params": [str(signature), {"commitment": "confirmed"}],
+                        }))
+                        next_id += 1
+
+                    async def pump():
+                        while True:
+                            await subscribe(await self._subscribe_queue.get())
+
+                    # Anything sent while disconnected still needs a subscription
+                    for signature in list(self._pending):
+                        await subscribe(signature)
+                    pump_task = asyncio.create_task(pump())
+                    try:
+                        async for raw in ws:
+                            message = json.loads(raw)
+                            if message.get("method") == "signatureNotification":
+                                params = message["params"]
+                                signature = subscriptions.pop(params["subscription"], None)
+                                if signature is not None:
+                                    err = params["result"]["value"].get("err")
+                                    self._resolve(signature, error=str(err) if err else None)
+                            elif "result" in message and message.get("id") in requests:
+                                subscriptions[message["result"]] = requests.pop(message["id"])
+                                backoff = CONFIRM_BACKOFF_MIN
+                            elif "error" in message:
+                                metrics.increment('failures', component='signature_subscribe')
+                                logger.warning("signatureSubscribe error: %s", message['error'])
+                    finally:
+                        pump_task.cancel()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                metrics.increment('failures', component='confirmation_stream')
+                logger.warning("Confirmation stream disconnected (%s), reconnecting in %.0fs", e, backoff)
+
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, CONFIRM_BACKOFF_MAX)
+
+    async def _sweep_statuses(self):
+        """Batch-polls pending signatures and expires those past their blockhash."""
+        while True:
+            await asyncio.sleep(STATUS_SWEEP_INTERVAL)
+            if not self._pending:
+                continue
+            try:
+                signatures = list(self._pending)
+                for i in range(0, len(signatures), MAX_SIGNATURE_STATUSES):
+                    chunk = signatures[i:i + MAX_SIGNATURE_STATUSES]
+                    response = await self.client.get_signature_statuses(chunk)
+                    for signature, status in zip(chunk, response.value):
+                        if status is None or status.confirmation_status is None:
+                            continue
+                        if str(status.confirmation_status).split('.')[-1].lower() in _LANDED:
+                            self._resolve(signature, error=str(status.err) if status.err else None)
+
+                height = (await self.client.get_block_height(Confirmed)).value
+                for signature, (result, _) in list(self._pending.items()):
+                    if result.last_valid_block_height and height > result.last_valid_block_height:
+                        self._resolve(signature, error="expired: blockhash no longer valid")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                metrics.increment('failures', component='signature_sweep')
+                logger.warning("Signature status sweep failed: %s", e)
+
+    async def close(self):
+        self.blockhashes.stop()
+        for task in self._tasks:
+            task.cancel()
+        self._tasks = []
+        for signature in list(self._pending):
+            self._resolve(signature, error="pipeline closed")
@@ -1,11 +1,28 @@
 # src/screens/home.py
 
-import pickle
+import math
 import time
+from rich.text import Text
 from textual.app import ComposeResult
 from textual.containers import Container
 from textual.screen import Screen
-from textual.widgets import Header, Footer, Static
+from textual.widgets import DataTable, Header, Footer, Static
+
+from ..client.metrics import metrics
+from ..workers.signals import position
+from ..workers.snapshot import StrategySnapshot
+
+REFRESH_INTERVAL = 0.1 # seconds between price table repaints; changes in between are coalesced
+FLASH_SECONDS = 0.6
+PRICE_COLUMNS = ("last", "bid", "ask")
+
+
+def _price_text(price: float, style: str = "") -> Text:
+    if math.isnan(price):
+        return Text("N/A", style=style or "red", justify="right")
+    text = f"${price:,.2f}" if price >= 1 else f"${price:.6g}"
+    return Text(text, style=style or "green", justify="right")
+
 
 class TickerWidget(Static):
     def on_mount(self) -> None:
@@ -13,6 +30,8 @@ class TickerWidget(Static):
         Sets the widget's initial content by reading the current state 
         of the App's reactive variable.
         """  
+        # (exchange, symbol) -> (5m series version, rendered line)
+        self._lines: dict[tuple[str, str], tuple[int, str]] = {}
         
         self.watch(self.app, "strategy_data", self.watch_strategy_data)
         
@@ -20,103 +39,143 @@ class TickerWidget(Static):
             self.update("[i]Application starting up...[/i]")
             return
         
-    def watch_strategy_data(self, data: bytes) -> None:
+    def watch_strategy_data(self, snapshot: StrategySnapshot | None) -> None:
         """
         Called when the TUI's primary strategy_data state changes.
+        Only series whose version moved since the last call are re-read.
         """
-        if not data:
+        if snapshot is None:
             self.update("[i]No data received[/i]")
             return
         
-        try:
-            unpickled_data = pickle.loads(data)
-            
-            if isinstance(unpickled_data, str):
-                self.log(f"Received error from worker: {unpickled_data}")
-                self.update(f"[red]API Error: {unpickled_data}[/red]")
-                return
-            
-            self.log(f"TickerWidget: received update with data keys: {list(unpickled_data.keys())}")
-            
-            if data == {}:
-                self.update("[i]Waiting for market data...[/i]")
-                return
-        
-        except Exception as e:
-            self.log(f"Error unpickling data: {e}")
-            self.update("[red]Error: Corrupt data[/red]")
+        if snapshot.error:
+            self.log(f"Received error from worker: {snapshot.error}")
+            self.update(f"[red]API Error: {snapshot.error}[/red]")
             return
-                    
-        df_5m = unpickled_data.get("5m")
-        df_1h = unpickled_data.get("1h")
-        df_1d = unpickled_data.get("1d")
-
-        if df_5m is None or df_1h is None or df_1d is None:
-            self.update("[i]Incomplete market data received...[/i]")
+        
+        if not snapshot.series:
+            self.update("[i]Waiting for market data...[/i]")
             return
-
-        try:
-            last_row = df_5m.iloc[-1]
+        
+        # One line per (exchange, symbol) the strategy pipeline produced
+        for exchange_id, symbol in snapshot.keys():
+            label = f"[bold white]{exchange_id.upper()} {symbol}[/bold white]"
+            series_5m = snapshot.get(exchange_id, symbol, "5m")
             
-            self.log(f"TickerWidget: last_row data: {last_row.to_dict()}")
+            if series_5m is None or snapshot.get(exchange_id, symbol, "1h") is None or snapshot.get(exchange_id, symbol, "1d") is None:
+                self._lines[(exchange_id, symbol)] = (-1, f"{label}: [i]Incomplete market data...[/i]")
+                continue
             
-            symbol = self.app.symbols[0] 
-            price = last_row.get("close", "N/A") # Get the 'close' price from the last row
+            seen_version, _ = self._lines.get((exchange_id, symbol), (None, ""))
+            if seen_version == series_5m.version:
+                continue # Unchanged since the last render
+
+            price = series_5m.last("close") # Get the 'close' price from the last row
 
             # Format the display string
-            if price != "N/A" and isinstance(price, (int, float)):
+            if price is not None:
                  price_str = f"[bold green]${price:.2f}[/bold green]"
             else:
-                price_str = f"[bold red]{price}[/bold red]"
-
-            self.update(
-                f"[bold white]{symbol}[/bold white]: {price_str}"
-            )
-        except Exception as e:
-            self.log(f"Error processing DataFrame: {e}")
-            self.update(f"[red]Error parsing data[/red]:", e)
+                price_str = "[bold red]N/A[/bold red]"
+
+            # Same signal the backtester replays, on the latest 5m bar
+            signal = "[bold green]LONG[/bold green]" if len(series_5m) and position(series_5m.column)[-1] else "[dim]FLAT[/dim]"
+
+            self._lines[(exchange_id, symbol)] = (series_5m.version, f"{label}: {price_str} {signal}")
+
+        self.update("\n".join(line for _, line in self._lines.values()))
    
-class LivePricesTable(Static):
+class LivePricesTable(DataTable):
     """
-    This widget pulls *all* live ticker data from the PriceManager
-    and displays it in a formatted table.
+    Every (exchange, symbol) in the DexManager's price matrix, one row each.
+    A refresh only touches cells whose sequence number moved since the last
+    one, so its cost follows the number of changes, not the size of the
+    universe, and DataTable only paints the rows in view. Refreshes are
+    driven by the app's "prices" and "stale" events, coalesced and
+    throttled to REFRESH_INTERVAL; changed prices flash green or red.
     """
     def on_mount(self) -> None:
-        self.update("[i]Live Prices (5s): Loading...[/i]")
-        # Set this widget's custom latency (faster)
-        self.set_interval(2.5, self.refresh_prices) 
+        self.cursor_type = "none"
+        self.add_column("Exchange", key="venue", width=18)
+        self.add_column("Symbol", key="symbol", width=12)
+        for column in PRICE_COLUMNS:
+            self.add_column(column.title(), key=column, width=14)
+
+        self._version = -1 # price matrix version already on screen
+        self._values: dict[str, tuple[float, float, float]] = {} # row key -> last, bid, ask shown
+        self._rows_by_venue: dict[str, list[str]] = {}
+        self._stale: dict[str, bool] = {}
+        self._flashing: dict[tuple[str, str], tuple[float, float]] = {} # (row, column) -> (expiry, value)
+        self._flash_timer = None
+        self._subscriptions = [
+            self.app.bus.subscribe(topic, self.refresh_prices, min_interval=REFRESH_INTERVAL)
+            for topic in ("prices", "stale")
+        ]
+        self.refresh_prices()
+
+    def on_unmount(self) -> None:
+        for subscription in self._subscriptions:
+            subscription.cancel()
 
-    def refresh_prices(self) -> None:
+    def _venue_label(self, venue: str, stale: bool) -> Text:
+        return Text.assemble((venue.upper(), "bold"), (" (stale)", "yellow") if stale else "")
+
+    def refresh_prices(self, _=None) -> None:
         dex_manager = self.app.dex_manager
-        
         if not dex_manager:
-            self.update("[red]Error: PriceManager not initialized![/red]")
             return
+        with metrics.timer('stage_seconds', stage='render'):
+            self._repaint(dex_manager)
 
-        # Pull the entire price dictionary
-        all_prices = dex_manager.get_all_prices()
-        
-        if not all_prices:
-            self.update("[i]Live Prices (5s): No data received yet...[/i]")
+    def _repaint(self, dex_manager) -> None:
+        prices = dex_manager.prices
+        now = time.monotonic()
+
+        if prices.version != self._version:
+            venue_ids, symbol_ids = prices.changed_since(self._version)
+            for vid, sid in zip(venue_ids.tolist(), symbol_ids.tolist()):
+                self._update_row(prices, vid, sid, now)
+            self._version = prices.version
+
+        for venue, keys in self._rows_by_venue.items():
+            stale = dex_manager.is_stale(venue)
+            if self._stale.get(venue) != stale:
+                self._stale[venue] = stale
+                for key in keys:
+                    self.update_cell(key, "venue", self._venue_label(venue, stale))
+
+        for (key, column), (expires, value) in list(self._flashing.items()):
+            if expires <= now:
+                del self._flashing[(key, column)]
+                self.update_cell(key, column, _price_text(value))
+        if self._flashing and self._flash_timer is None:
+            next_expiry = min(expires for expires, _ in self._flashing.values())
+            self._flash_timer = self.set_timer(max(next_expiry - now, 0.0), self._end_flashes)
+
+    def _end_flashes(self) -> None:
+        self._flash_timer = None
+        self.refresh_prices()
+
+    def _update_row(self, prices, vid: int, sid: int, now: float) -> None:
+        venue, symbol = prices.venues[vid], prices.symbols[sid]
+        key = f"{venue}|{symbol}"
+        values = (float(prices.last[vid, sid]), float(prices.bid[vid, sid]), float(prices.ask[vid, sid]))
+
+        previous = self._values.get(key)
+        self._values[key] = values
+        if previous is None:
+            stale = self._stale.get(venue, False)
+            self.add_row(self._venue_label(venue, stale), symbol, *(_price_text(value) for value in values), key=key)
+            self._rows_by_venue.setdefault(venue, []).append(key)
             return
 
-        # Build the rich display string
-        lines = ["[bold underline]Live Ticker Prices[/bold underline]\n"]
-        
-        for exchange_id, symbols_prices in all_prices.items():
-            lines.append(f"[bold]{exchange_id.upper()}[/bold]")
-            if not symbols_prices:
-                lines.append("  [dim]Waiting for data...[/dim]")
+        for column, old, new in zip(PRICE_COLUMNS, previous, values):
+            if old == new or (math.isnan(old) and math.isnan(new)):
                 continue
+            style = "black on green" if new > old else "black on red" if new < old else ""
+            self.update_cell(key, column, _price_text(new, style))
+            self._flashing[(key, column)] = (now + FLASH_SECONDS, new)
 
-            for symbol, price in symbols_prices.items():
-                price_str = f"[green]${price:,.2f}[/green]" if price is not None else "[red]N/A[/red]"
-                lines.append(f"  {symbol}: {price_str}")
-            lines.append("") # Add a blank line between exchanges
-            
-        self.update("\n".join(lines))
- 
-           
 class HomeScreen(Screen):
     """The main application view/page."""
     
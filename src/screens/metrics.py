@@ -0,0 +1,67 @@
+# src/screens/metrics.py
+
+from textual.app import ComposeResult
+from textual.screen import Screen
+from textual.widgets import Header, Footer, Static, Button, DataTable
+
+from ..client.metrics import metrics
+
+REFRESH_INTERVAL = 1.0 # seconds between repaints while the screen is showing
+STALEST_CELLS = 10     # price cells listed by age; the rest are only exported
+
+
+def _labels_text(labels: dict) -> str:
+    return ", ".join(f"{key}={value}" for key, value in sorted(labels.items()))
+
+
+def _ms(seconds: float) -> str:
+    return f"{seconds * 1000:,.2f}"
+
+
+class MetricsScreen(Screen):
+    """Latency histograms, queue depths and the stalest price cells, from the shared metrics registry."""
+
+    def compose(self) -> ComposeResult:
+        yield Header()
+        yield Footer()
+        yield Static("Latency and Throughput 📈", classes="title")
+        yield DataTable(id="latency_table")
+        yield Static("\n")
+        yield DataTable(id="gauge_table")
+        yield Button("home", id="to_home")
+
+    def on_mount(self) -> None:
+        latency = self.query_one("#latency_table", DataTable)
+        latency.cursor_type = "none"
+        latency.add_columns("Metric", "Labels", "Count", "p50 ms", "p90 ms", "p99 ms", "Max ms")
+        gauges = self.query_one("#gauge_table", DataTable)
+        gauges.cursor_type = "none"
+        gauges.add_columns("Gauge", "Labels", "Value")
+        self.refresh_metrics()
+        self.set_interval(REFRESH_INTERVAL, self.refresh_metrics)
+
+    def refresh_metrics(self) -> None:
+        if not self.is_current:
+            return
+        latency = self.query_one("#latency_table", DataTable)
+        latency.clear()
+        for (name, labels), histogram in sorted(metrics.histograms.items()):
+            summary = histogram.summary()
+            latency.add_row(
+                name, _labels_text(dict(labels)), f"{histogram.count:,}",
+                _ms(summary['p50']), _ms(summary['p90']), _ms(summary['p99']), _ms(summary['max']),
+            )
+
+        gauges = self.query_one("#gauge_table", DataTable)
+        gauges.clear()
+        samples = metrics.collect()
+        ages = sorted((sample for sample in samples if sample[0] == 'price_age_seconds'),
+                      key=lambda sample: sample[2], reverse=True)
+        for name, labels, value in [sample for sample in samples if sample[0] != 'price_age_seconds'] + ages[:STALEST_CELLS]:
+            gauges.add_row(name, _labels_text(labels), f"{value:,.3f}".rstrip('0').rstrip('.'))
+        for (name, labels), value in sorted(metrics.counters.items()):
+            gauges.add_row(f"{name}_total", _labels_text(dict(labels)), f"{value:,.0f}")
+
+    def on_button_pressed(self, event: Button.Pressed):
+        if event.button.id == "to_home":
+            self.app.push_screen("home")
@@ -0,0 +1,123 @@
+# src/workers/compute.py
+
+import asyncio
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing.shared_memory import SharedMemory
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from .indicators import IndicatorEngine, COLUMNS
+
+BACKENDS = ("inline", "thread", "process")
+
+BLOCK_WIDTH = 6 + len(COLUMNS)  # timestamp, OHLCV, indicators
+
+SeriesKey = Tuple[str, str, str]  # (exchange, symbol, timeframe)
+
+# Engines owned by a process-pool worker; each series is always routed to the same worker
+_worker_engines: Dict[SeriesKey, IndicatorEngine] = {}
+
+
+def _compute_shared(key: SeriesKey, shm_name: str, rows: int, max_bars: int) -> None:
+    """
+    Process-pool entry point. The parent has written timestamp + OHLCV into
+    the first six columns of the shared block; the indicator columns are
+    filled in place, so nothing but this call's arguments crosses the pipe.
+    """
+    shm = SharedMemory(name=shm_name, track=False)
+    try:
+        block = np.ndarray((rows, BLOCK_WIDTH), dtype=float, buffer=shm.buf)
+        engine = _worker_engines.get(key)
+        if engine is None:
+            engine = _worker_engines[key] = IndicatorEngine(max_bars=max_bars)
+        block[:, 6:] = engine.update(block[:, :6])
+        del block
+    finally:
+        shm.close()
+
+
+class IndicatorBackend:
+    """
+    Runs the indicator stage for a series on the configured backend:
+
+    - "inline": on the calling thread (only sensible for a handful of symbols)
+    - "thread": a thread pool; engines live in this process
+    - "process": single-worker process pools, one per shard, with each series
+      pinned to a shard so its engine state stays in one process. OHLCV goes
+      in and indicators come back through shared memory.
+    """
+    def __init__(self, kind: str = "thread", workers: int | None = None, max_bars: int = 500):
+        if kind not in BACKENDS:
+            raise ValueError(f"Unknown indicator backend '{kind}', expected one of {BACKENDS}")
+
+        self.kind = kind
+        self.max_bars = max_bars
+        self.workers = workers or os.cpu_count() or 1
+        self._engines: Dict[SeriesKey, IndicatorEngine] = {}
+        # A cancelled run can leave its computation running in the pool, so
+        # each engine is guarded against the next run touching it concurrently
+        self._engine_locks: Dict[SeriesKey, threading.Lock] = {}
+        self._thread_pool: ThreadPoolExecutor | None = None
+        self._shards: List[ProcessPoolExecutor] = []
+
+        if kind == "thread":
+            self._thread_pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="indicators")
+        elif kind == "process":
+            self._shards = [self._new_shard() for _ in range(self.workers)]
+
+    def _new_shard(self) -> ProcessPoolExecutor:
+        # spawn, not fork: the TUI process has live threads and sockets
+        return ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn"))
+
+    def _compute_local(self, key: SeriesKey, candles: List[list]) -> np.ndarray:
+        with self._engine_locks[key]:
+            return self._engines[key].block(candles)
+
+    async def block(self, key: SeriesKey, candles: List[list]) -> np.ndarray:
+        """Timestamp, OHLCV and indicator columns for `candles`, as IndicatorEngine.block returns them."""
+        if self.kind == "process":
+            return await self._block_in_process(key, candles)
+
+        if key not in self._engines:
+            self._engines[key] = IndicatorEngine(max_bars=self.max_bars)
+            self._engine_locks[key] = threading.Lock()
+
+        if self.kind == "inline":
+            return self._compute_local(key, candles)
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._thread_pool, self._compute_local, key, candles)
+
+    async def _block_in_process(self, key: SeriesKey, candles: List[list]) -> np.ndarray:
+        rows = len(candles)
+        shm = SharedMemory(create=True, size=max(rows * BLOCK_WIDTH * 8, 1))
+        try:
+            block = np.ndarray((rows, BLOCK_WIDTH), dtype=float, buffer=shm.buf)
+            block[:, :6] = np.asarray(candles, dtype=float).reshape(rows, 6)
+
+            index = hash(key) % len(self._shards)
+            loop = asyncio.get_running_loop()
+            try:
+                await loop.run_in_executor(self._shards[index], _compute_shared, key, shm.name, rows, self.max_bars)
+            except BrokenProcessPool:
+                # The worker died and took its engines with it; they rebuild from the window
+                self._shards[index] = self._new_shard()
+                raise
+
+            result = block.copy()
+            del block
+            return result
+        finally:
+            shm.close()
+            shm.unlink()
+
+    def close(self):
+        if self._thread_pool is not None:
+            self._thread_pool.shutdown(wait=False, cancel_futures=True)
+        for shard in self._shards:
+            shard.shutdown(wait=False, cancel_futures=True)
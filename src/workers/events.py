@@ -0,0 +1,238 @@
+# src/workers/events.py
+
+import asyncio
+import inspect
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, List
+
+from ..client.metrics import metrics
+
+DEFAULT_REFERENCE_MOVE = 0.0005  # mean |log return| per tick at which a cadence runs at its base interval
+DEFAULT_CADENCE_SMOOTHING = 0.3  # EWMA weight of the newest observation
+
+Merge = Callable[[Any, Any], Any]
+
+logger = logging.getLogger("trader.workers.events")
+
+
+def latest(_: Any, payload: Any) -> Any:
+    """Coalesces to the newest payload"""
+    return payload
+
+
+def collect(pending: set | None, payload: Any) -> set:
+    """Coalesces payloads into a set, e.g. the venues that updated since the last delivery"""
+    pending = pending if pending is not None else set()
+    pending.add(payload)
+    return pending
+
+
+class Subscription:
+    """
+    One subscriber to a topic. Events published while a delivery is pending
+    are merged into it rather than queued, so a slow or throttled subscriber
+    gets one callback with everything that happened instead of a backlog.
+    """
+    def __init__(self, bus: 'EventBus', topic: str, callback: Callable[[Any], Any],
+                 min_interval: float, merge: Merge):
+        self.bus = bus
+        self.topic = topic
+        self.callback = callback
+        self.min_interval = min_interval
+        self.merge = merge
+        self.payload: Any = None
+        self.pending = False
+        self.published_at = 0.0   # first event of the pending delivery
+        self.delivered_at = 0.0
+        self.deliveries = 0
+        self.coalesced = 0
+        self.latency = 0.0        # seconds from the first merged event to its delivery
+        self._handle: asyncio.Handle | None = None
+
+    def offer(self, payload: Any):
+        if self.pending:
+            self.payload = self.merge(self.payload, payload)
+            self.coalesced += 1
+            return
+        now = time.monotonic()
+        self.pending = True
+        self.payload = self.merge(None, payload)
+        self.published_at = now
+        delay = self.delivered_at + self.min_interval - now
+        loop = asyncio.get_running_loop()
+        if delay > 0:
+            self._handle = loop.call_later(delay, self._deliver)
+        else:
+            self._handle = loop.call_soon(self._deliver)
+
+    def _deliver(self):
+        payload, self.payload = self.payload, None
+        self.pending = False
+        self._handle = None
+        self.delivered_at = time.monotonic()
+        self.latency = self.delivered_at - self.published_at
+        self.deliveries += 1
+        metrics.observe('event_delay_seconds', self.latency, topic=self.topic)
+        try:
+            result = self.callback(payload)
+            if inspect.isawaitable(result):
+                asyncio.ensure_future(result)
+        except Exception as e:
+            metrics.increment('failures', component='subscriber', topic=self.topic)
+            logger.warning("Subscriber to '%s' failed: %s", self.topic, e)
+
+    def cancel(self):
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+        self.pending = False
+        self.bus.unsubscribe(self)
+
+
+class EventBus:
+    """
+    Topic-based fan-out from data producers to consumers in the event loop.
+    publish() never blocks: each subscriber is scheduled on the next loop
+    iteration, or once its `min_interval` has passed since its last
+    delivery, with everything published meanwhile coalesced by its `merge`.
+    """
+    def __init__(self):
+        self._subscriptions: Dict[str, List[Subscription]] = {}
+        self.published: Dict[str, int] = {}
+
+    def subscribe(self, topic: str, callback: Callable[[Any], Any],
+                  min_interval: float = 0.0, merge: Merge = latest) -> Subscription:
+        subscription = Subscription(self, topic, callback, min_interval, merge)
+        self._subscriptions.setdefault(topic, []).append(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        subscriptions = self._subscriptions.get(subscription.topic, [])
+        if subscription in subscriptions:
+            subscriptions.remove(subscription)
+
+    def publish(self, topic: str, payload: Any = None):
+        """Must be called from the event loop thread."""
+        self.published[topic] = self.published.get(topic, 0) + 1
+        for subscription in self._subscriptions.get(topic, ()):
+            subscription.offer(payload)
+
+    def subscriptions(self, topic: str | None = None) -> List[Subscription]:
+        if topic is not None:
+            return list(self._subscriptions.get(topic, ()))
+        return [subscription for subscriptions in self._subscriptions.values() for subscription in subscriptions]
+
+
+class AdaptiveCadence:
+    """
+    A polling interval that tightens when prices move and relaxes when
+    they don't: `base` at DEFAULT_REFERENCE_MOVE, scaled inversely with the
+    smoothed move per tick and clamped to [minimum, maximum]. `floor` is
+    the rate-limit headroom and always wins over volatility.
+    """
+    def __init__(self, base: float, minimum: float, maximum: float,
+                 reference: float = DEFAULT_REFERENCE_MOVE,
+                 smoothing: float = DEFAULT_CADENCE_SMOOTHING):
+        self.base = base
+        self.minimum = minimum
+        self.maximum = maximum
+        self.reference = reference
+        self.smoothing = smoothing
+        self.activity: float | None = None
+        self.floor = 0.0
+
+    def observe(self, move: float | None):
+        """Feeds the mean absolute log move seen by the last tick (None: nothing to compare)."""
+        if move is None or move != move:
+            return
+        if self.activity is None:
+            self.activity = move
+        else:
+            self.activity += self.smoothing * (move - self.activity)
+
+    @property
+    def interval(self) -> float:
+        if self.activity is None:
+            interval = self.base
+        elif self.activity <= 0:
+            interval = self.maximum
+        else:
+            interval = min(max(self.base * self.reference / self.activity, self.minimum), self.maximum)
+        return max(interval, self.floor)
+
+
+class Job:
+    """A recurring coroutine run by the Scheduler"""
+    def __init__(self, name: str, func: Callable[[], Awaitable[Any]], cadence: AdaptiveCadence | float,
+                 topic: str | None):
+        self.name = name
+        self.func = func
+        self.cadence = cadence
+        self.topic = topic
+        self.runs = 0
+        self.last_duration = 0.0
+        self.last_error: str | None = None
+        self._wake = asyncio.Event()
+        self._task: asyncio.Task | None = None
+
+    @property
+    def interval(self) -> float:
+        return self.cadence.interval if isinstance(self.cadence, AdaptiveCadence) else self.cadence
+
+
+class Scheduler:
+    """
+    Runs recurring fetch jobs on their own cadence. A job's next run is
+    timed from the start of the previous one and never overlaps it, so a
+    slow tick delays the next instead of being cancelled by it. trigger()
+    runs a job early. A job with a topic publishes its result on the bus
+    when it finishes.
+    """
+    def __init__(self, bus: EventBus | None = None):
+        self.bus = bus
+        self.jobs: Dict[str, Job] = {}
+
+    def every(self, name: str, func: Callable[[], Awaitable[Any]], cadence: AdaptiveCadence | float,
+              topic: str | None = None) -> Job:
+        """Starts running `func` every `cadence` seconds; must be called from a running event loop."""
+        if name in self.jobs:
+            raise ValueError(f"Job '{name}' is already scheduled")
+        job = self.jobs[name] = Job(name, func, cadence, topic)
+        job._task = asyncio.create_task(self._run(job))
+        return job
+
+    def trigger(self, name: str):
+        """Runs a job now (or right after its current run) instead of waiting out its interval."""
+        self.jobs[name]._wake.set()
+
+    async def _run(self, job: Job):
+        while True:
+            job._wake.clear()
+            start = time.monotonic()
+            try:
+                result = await job.func()
+                job.last_error = None
+                if job.topic and self.bus is not None:
+                    self.bus.publish(job.topic, result)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                job.last_error = str(e)
+                metrics.increment('failures', component='scheduled_job', job=job.name)
+                logger.warning("Scheduled job '%s' failed: %s", job.name, e)
+            job.runs += 1
+            job.last_duration = time.monotonic() - start
+
+            remaining = job.interval - job.last_duration
+            if remaining > 0:
+                try:
+                    await asyncio.wait_for(job._wake.wait(), timeout=remaining)
+                except asyncio.TimeoutError:
+                    pass
+
+    def close(self):
+        for job in self.jobs.values():
+            if job._task is not None:
+                job._task.cancel()
+        self.jobs.clear()
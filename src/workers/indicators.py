@@ -0,0 +1,448 @@
+# src/workers/indicators.py
+
+import copy
+import math
+import time
+from collections import deque
+from typing import Deque, Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+import talib
+
+SHORT_DURATION = 5 # weekly x crypto markets
+NORMAL_DURATION = 15 # current market trend
+LONG_DURATION = 45 # macro adoptance
+
+NAN = float('nan')
+
+# ta-lib's TA_IS_ZERO threshold
+_EPSILON = 0.00000001
+
+
+def _is_zero(value: float) -> bool:
+    return -_EPSILON < value < _EPSILON
+
+
+class EMA:
+    """Exponential moving average seeded with the SMA of the first `period` values, as ta-lib does."""
+    def __init__(self, period: int):
+        self.period = period
+        self.k = 2.0 / (period + 1)
+        self.count = 0
+        self.value = NAN
+
+    def update(self, x: float) -> float:
+        self.count += 1
+        if self.count < self.period:
+            self.value = x if self.count == 1 else self.value + x
+            return NAN
+        if self.count == self.period:
+            self.value = (self.value + x) / self.period if self.period > 1 else x
+        else:
+            self.value += (x - self.value) * self.k
+        return self.value
+
+
+class MACD:
+    """
+    MACD line, signal and histogram. ta-lib seeds the fast EMA so that its
+    first value lines up with the slow one, i.e. from bar slow - fast.
+    """
+    def __init__(self, fast: int = 12, slow: int = 26, signal: int = 9):
+        self.fast_offset = slow - fast
+        self.fast = EMA(fast)
+        self.slow = EMA(slow)
+        self.signal = EMA(signal)
+        self.count = 0
+
+    def update(self, close: float) -> Tuple[float, float, float]:
+        self.count += 1
+        if self.count > self.fast_offset:
+            fast = self.fast.update(close)
+        else:
+            fast = NAN
+        slow = self.slow.update(close)
+        if math.isnan(slow):
+            return NAN, NAN, NAN
+
+        line = fast - slow
+        signal = self.signal.update(line)
+        if math.isnan(signal):
+            return NAN, NAN, NAN
+        return line, signal, line - signal
+
+
+class RSI:
+    """Wilder's RSI."""
+    def __init__(self, period: int):
+        self.period = period
+        self.count = 0
+        self.prev_close = NAN
+        self.gain = 0.0
+        self.loss = 0.0
+
+    def update(self, close: float) -> float:
+        self.count += 1
+        prev_close, self.prev_close = self.prev_close, close
+        if self.count == 1:
+            return NAN
+
+        change = close - prev_close
+        gain = change if change > 0 else 0.0
+        loss = -change if change < 0 else 0.0
+
+        if self.count <= self.period + 1:
+            self.gain += gain
+            self.loss += loss
+            if self.count < self.period + 1:
+                return NAN
+            self.gain /= self.period
+            self.loss /= self.period
+        else:
+            self.gain = (self.gain * (self.period - 1) + gain) / self.period
+            self.loss = (self.loss * (self.period - 1) + loss) / self.period
+
+        total = self.gain + self.loss
+        return 100.0 * (self.gain / total) if not _is_zero(total) else 0.0
+
+
+def _true_range(high: float, low: float, prev_close: float) -> float:
+    return max(high - low, abs(high - prev_close), abs(low - prev_close))
+
+
+class ATR:
+    """Wilder's average true range."""
+    def __init__(self, period: int):
+        self.period = period
+        self.count = 0
+        self.prev_close = NAN
+        self.value = 0.0
+
+    def update(self, high: float, low: float, close: float) -> float:
+        self.count += 1
+        prev_close, self.prev_close = self.prev_close, close
+        if self.count == 1:
+            return NAN
+
+        tr = _true_range(high, low, prev_close)
+        if self.count <= self.period + 1:
+            self.value += tr
+            if self.count < self.period + 1:
+                return NAN
+            self.value /= self.period
+        else:
+            self.value = (self.value * (self.period - 1) + tr) / self.period
+        return self.value
+
+
+class ADX:
+    """Wilder's average directional index, following ta-lib's seeding."""
+    def __init__(self, period: int):
+        self.period = period
+        self.count = 0
+        self.prev_high = self.prev_low = self.prev_close = NAN
+        self.plus_dm = self.minus_dm = self.tr = 0.0
+        self.sum_dx = 0.0
+        self.value = NAN
+
+    def _dx(self) -> float | None:
+        if _is_zero(self.tr):
+            return None
+        minus_di = 100.0 * (self.minus_dm / self.tr)
+        plus_di = 100.0 * (self.plus_dm / self.tr)
+        total = minus_di + plus_di
+        if _is_zero(total):
+            return None
+        return 100.0 * (abs(minus_di - plus_di) / total)
+
+    def update(self, high: float, low: float, close: float) -> float:
+        self.count += 1
+        prev_high, prev_low, prev_close = self.prev_high, self.prev_low, self.prev_close
+        self.prev_high, self.prev_low, self.prev_close = high, low, close
+        if self.count == 1:
+            return NAN
+
+        period = self.period
+        diff_plus = high - prev_high
+        diff_minus = prev_low - low
+        plus_dm = diff_plus if diff_plus > 0 and diff_plus > diff_minus else 0.0
+        minus_dm = diff_minus if diff_minus > 0 and diff_plus < diff_minus else 0.0
+        tr = _true_range(high, low, prev_close)
+
+        # Bars 2..period only accumulate the first smoothed sums
+        if self.count <= period:
+            self.plus_dm += plus_dm
+            self.minus_dm += minus_dm
+            self.tr += tr
+            return NAN
+
+        self.plus_dm += plus_dm - self.plus_dm / period
+        self.minus_dm += minus_dm - self.minus_dm / period
+        self.tr += tr - self.tr / period
+        dx = self._dx()
+
+        if self.count <= 2 * period:
+            if dx is not None:
+                self.sum_dx += dx
+            if self.count < 2 * period:
+                return NAN
+            self.value = self.sum_dx / period
+        elif dx is not None:
+            self.value = (self.value * (period - 1) + dx) / period
+        return self.value
+
+
+COLUMNS = [
+    'log_return',
+    'macd', 'macdsignal', 's_macdhist',
+    's_adx', 'adx', 'l_adx',
+    's_atr', 'atr', 'l_atr',
+    's_rsi', 'rsi', 'l_rsi',
+]
+
+
+class IndicatorEngine:
+    """
+    Incremental indicator state for one OHLCV series (one exchange, symbol
+    and timeframe). Closed bars are folded into the state once, in O(1) each;
+    the still-open bar is evaluated on a throwaway copy so it can keep changing.
+    """
+    def __init__(self, max_bars: int = 500, short: int = SHORT_DURATION,
+                 normal: int = NORMAL_DURATION, long: int = LONG_DURATION):
+        self.max_bars = max_bars
+        self.periods = (short, normal, long)
+        self.reset()
+
+    def reset(self):
+        short, normal, long = self.periods
+        self.last_timestamp: int | None = None
+        self.prev_close = NAN
+        self.macd = MACD()
+        self.adx = [ADX(short), ADX(normal), ADX(long)]
+        self.atr = [ATR(short), ATR(normal), ATR(long)]
+        self.rsi = [RSI(short), RSI(normal), RSI(long)]
+        # Committed rows; twice max_bars so trimming is an occasional block copy
+        self._values = np.full((2 * self.max_bars, len(COLUMNS)), NAN)
+        self._end = 0
+
+    @property
+    def size(self) -> int:
+        """Number of committed rows still held"""
+        return min(self._end, self.max_bars)
+
+    def values(self) -> np.ndarray:
+        """Committed rows, oldest first (a view, valid until the next update)"""
+        return self._values[self._end - self.size:self._end]
+
+    def _append(self, row: tuple):
+        if self._end == len(self._values):
+            self._values[:self.max_bars] = self._values[self._end - self.max_bars:self._end]
+            self._end = self.max_bars
+        self._values[self._end] = row
+        self._end += 1
+
+    def _preview(self) -> 'IndicatorEngine':
+        """Copy of the indicator state (not the row history) for evaluating the open bar."""
+        preview = copy.copy(self)
+        preview.macd = copy.copy(self.macd)
+        preview.macd.fast = copy.copy(self.macd.fast)
+        preview.macd.slow = copy.copy(self.macd.slow)
+        preview.macd.signal = copy.copy(self.macd.signal)
+        preview.adx = [copy.copy(adx) for adx in self.adx]
+        preview.atr = [copy.copy(atr) for atr in self.atr]
+        preview.rsi = [copy.copy(rsi) for rsi in self.rsi]
+        return preview
+
+    def _step(self, high: float, low: float, close: float) -> tuple:
+        prev_close, self.prev_close = self.prev_close, close
+        log_return = math.log(close / prev_close) if prev_close > 0 and close > 0 else NAN
+        return (
+            log_return,
+            *self.macd.update(close),
+            *(adx.update(high, low, close) for adx in self.adx),
+            *(atr.update(high, low, close) for atr in self.atr),
+            *(rsi.update(close) for rsi in self.rsi),
+        )
+
+    def update(self, candles: List[list] | np.ndarray) -> np.ndarray:
+        """
+        Folds any newly closed bars from `candles` (a contiguous window,
+        oldest first, last one still open; lists or an (n, 6) array) into the
+        state and returns one row per candle, columns ordered as COLUMNS.
+        """
+        out = np.full((len(candles), len(COLUMNS)), NAN)
+        if not len(candles):
+            return out
+
+        closed, open_bar = candles[:-1], candles[-1]
+        if self.last_timestamp is not None and (
+            candles[0][0] > self.last_timestamp or open_bar[0] < self.last_timestamp
+        ):
+            self.reset() # Window no longer overlaps our state: rebuild from it
+
+        # Walk back to the first bar we haven't seen, so a tick costs O(new bars)
+        start = len(closed)
+        while start > 0 and (self.last_timestamp is None or closed[start - 1][0] > self.last_timestamp):
+            start -= 1
+        for ts, _, high, low, close, _ in closed[start:]:
+            self._append(self._step(float(high), float(low), float(close)))
+            self.last_timestamp = ts
+
+        if open_bar[0] == self.last_timestamp:
+            committed = len(candles)
+        else:
+            committed = len(closed)
+            _, _, high, low, close, _ = open_bar
+            out[-1] = self._preview()._step(float(high), float(low), float(close))
+
+        available = min(committed, self.size)
+        out[committed - available:committed] = self._values[self._end - available:self._end]
+        return out
+
+    def block(self, candles: List[list]) -> np.ndarray:
+        """
+        Candles plus indicator columns as one float array: timestamp, OHLCV,
+        then COLUMNS, one row per candle.
+        """
+        data = np.empty((len(candles), 6 + len(COLUMNS)))
+        data[:, :6] = np.asarray(candles, dtype=float).reshape(len(candles), 6)
+        data[:, 6:] = self.update(candles)
+        return data
+
+    def frame(self, candles: List[list]) -> pd.DataFrame:
+        """Candles plus indicator columns, indexed by New York time like fetch_ohlcv's frames."""
+        # One float block for every column, so pandas doesn't re-convert per column
+        return _ohlcv_frame(self.block(candles), ['open', 'high', 'low', 'close', 'volume', *COLUMNS])
+
+
+def _ohlcv_frame(data: np.ndarray, columns: List[str]) -> pd.DataFrame:
+    """Frame over data[:, 1:] indexed by data[:, 0] (ms timestamps) in New York time."""
+    index = (
+            pd.to_datetime(data[:, 0].astype('int64'), unit='ms', utc=True)
+            .tz_convert('America/New_York')
+            .rename('timestamp')
+        )
+    return pd.DataFrame(data[:, 1:], index=index, columns=columns)
+
+
+def log_returns(close: np.ndarray) -> np.ndarray:
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.concatenate(([NAN], np.log(close[1:] / close[:-1])))
+
+
+def indicator_series(kind: str, high: np.ndarray, low: np.ndarray, close: np.ndarray, period: int) -> np.ndarray:
+    """
+    One period-dependent indicator ('adx', 'atr' or 'rsi') over a whole
+    series, stepped through the same classes IndicatorEngine keeps live.
+    """
+    out = np.empty(len(close))
+    if kind == 'rsi':
+        rsi = RSI(period)
+        for i, c in enumerate(close.tolist()):
+            out[i] = rsi.update(c)
+        return out
+    if kind == 'adx':
+        indicator = ADX(period)
+    elif kind == 'atr':
+        indicator = ATR(period)
+    else:
+        raise ValueError(f"Unknown indicator '{kind}'")
+    for i, (h, l, c) in enumerate(zip(high.tolist(), low.tolist(), close.tolist())):
+        out[i] = indicator.update(h, l, c)
+    return out
+
+
+def macd_series(close: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """MACD line, signal and histogram over a whole series, as IndicatorEngine computes them."""
+    macd = MACD()
+    out = np.array([macd.update(c) for c in close.tolist()]).reshape(len(close), 3)
+    return out[:, 0], out[:, 1], out[:, 2]
+
+
+def talib_indicator(kind: str, high: np.ndarray, low: np.ndarray, close: np.ndarray, period: int) -> np.ndarray:
+    """One period-dependent indicator ('adx', 'atr' or 'rsi') over a whole series"""
+    if kind == 'adx':
+        return talib.ADX(high, low, close, timeperiod=period)
+    if kind == 'atr':
+        return talib.ATR(high, low, close, timeperiod=period)
+    if kind == 'rsi':
+        return talib.RSI(close, timeperiod=period)
+    raise ValueError(f"Unknown indicator '{kind}'")
+
+
+def talib_columns(data: np.ndarray, short: int = SHORT_DURATION, normal: int = NORMAL_DURATION,
+                  long: int = LONG_DURATION) -> Dict[str, np.ndarray]:
+    """Every COLUMNS entry for an (n, 6) OHLCV array, vectorized over the whole series with ta-lib."""
+    high, low, close = data[:, 2], data[:, 3], data[:, 4]
+    columns = {'log_return': log_returns(close)}
+    columns['macd'], columns['macdsignal'], columns['s_macdhist'] = talib.MACD(close)
+    for prefix, period in zip(('s_', '', 'l_'), (short, normal, long)):
+        for kind in ('adx', 'atr', 'rsi'):
+            columns[f'{prefix}{kind}'] = talib_indicator(kind, high, low, close, period)
+    return columns
+
+
+def talib_frame(candles: List[list]) -> pd.DataFrame:
+    """Full-recomputation reference: every indicator over the whole series with ta-lib."""
+    data = np.asarray(candles, dtype=float).reshape(len(candles), 6)
+    columns = talib_columns(data)
+    data = np.column_stack([data, *(columns[column] for column in COLUMNS)])
+    return _ohlcv_frame(data, ['open', 'high', 'low', 'close', 'volume', *COLUMNS])
+
+
+def benchmark(bars: int = 500, ticks: int = 200, seed: int = 7) -> Dict[str, float]:
+    """
+    Compares the incremental engine against a full ta-lib recomputation on a
+    synthetic random walk: one new bar per tick over a `bars`-long window.
+    Returns per-tick timings for the indicator math alone and for building the
+    DataFrame fetch_ohlcv publishes, plus the largest deviation from ta-lib.
+    """
+    rng = np.random.default_rng(seed)
+    total = bars + ticks
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, total)))
+    spread = np.abs(rng.normal(0, 0.005, total)) * close
+    candles = [
+        [i * 60_000, close[i - 1] if i else close[i], close[i] + spread[i], close[i] - spread[i], close[i], 1.0]
+        for i in range(total)
+    ]
+    windows = [candles[i - bars + 1:i + 1] for i in range(bars, total)]
+
+    def per_tick(run) -> float:
+        start = time.perf_counter()
+        for window in windows:
+            run(window)
+        return (time.perf_counter() - start) / ticks * 1000
+
+    def talib_indicators(window: List[list]):
+        data = np.asarray(window, dtype=float)
+        high, low, close = data[:, 2], data[:, 3], data[:, 4]
+        talib.MACD(close)
+        for period in (SHORT_DURATION, NORMAL_DURATION, LONG_DURATION):
+            talib.ADX(high, low, close, timeperiod=period)
+            talib.ATR(high, low, close, timeperiod=period)
+            talib.RSI(close, timeperiod=period)
+
+    engine = IndicatorEngine(max_bars=total)
+    engine.update(candles[:bars])
+    results = {
+        'engine_update_ms': per_tick(engine.update),
+        'talib_indicators_ms': per_tick(talib_indicators),
+    }
+    engine = IndicatorEngine(max_bars=total)
+    engine.update(candles[:bars])
+    results['engine_frame_ms'] = per_tick(engine.frame)
+    results['talib_frame_ms'] = per_tick(talib_frame)
+
+    actual = engine.values()[-(total - 1):]
+    reference = talib_frame(candles)[COLUMNS].to_numpy()[:-1]
+    if (np.isnan(actual) != np.isnan(reference)).any():
+        raise AssertionError("Engine warm-up periods differ from ta-lib")
+    both = ~np.isnan(actual)
+    results['max_abs_error'] = float(np.max(np.abs(actual[both] - reference[both])))
+    return results
+
+
+if __name__ == "__main__":
+    for name, value in benchmark().items():
+        print(f"{name}: {value:.6g}")
@@ -0,0 +1,101 @@
+# src/workers/pipeline.py
+
+import asyncio
+from typing import Dict, Iterator, Tuple
+
+import numpy as np
+
+from ..client.metrics import metrics
+from .compute import IndicatorBackend
+from .indicators import NORMAL_DURATION, LONG_DURATION
+from .snapshot import SeriesSnapshot, StrategySnapshot
+
+# timeframe -> bars of history the strategy needs
+TIMEFRAMES = {
+    "5m": NORMAL_DURATION * 12,
+    "1h": NORMAL_DURATION * 4,
+    "1d": LONG_DURATION * 1,
+}
+
+DEFAULT_OHLCV_CONCURRENCY = 2  # in-flight OHLCV requests per venue
+
+SeriesKey = Tuple[str, str, str]  # (exchange, symbol, timeframe)
+
+
+class StrategyPipeline:
+    """
+    Produces strategy frames for every configured symbol on every exchange.
+    OHLCV fetches for all (exchange, symbol, timeframe) series run concurrently,
+    capped per venue; indicators run on the configured IndicatorBackend (thread
+    or process pool) so the Textual event loop never blocks. Each run publishes a StrategySnapshot keyed by
+    (exchange, symbol), then timeframe; unchanged series keep their version.
+    """
+    def __init__(self, dex_manager, backend: IndicatorBackend | None = None):
+        self.dex_manager = dex_manager
+        self.timeframes = dict(TIMEFRAMES)
+        self.results: Dict[Tuple[str, str], Dict[str, SeriesSnapshot]] = {}
+        self.errors: Dict[SeriesKey, str] = {}
+
+        if backend is None:
+            config = dex_manager.config
+            backend = IndicatorBackend(
+                kind=config.get('indicator_backend', 'thread'),
+                workers=config.get('indicator_workers'),
+                max_bars=dex_manager.candles.max_bars,
+            )
+        self.backend = backend
+        self._venue_limits: Dict[str, asyncio.Semaphore] = {}
+
+    def series(self) -> Iterator[SeriesKey]:
+        """Every (exchange, symbol, timeframe) with OHLCV support."""
+        for name, client in self.dex_manager.clients.items():
+            if client.is_dex or client._client is None:
+                continue
+            for symbol in client.symbols:
+                for timeframe in self.timeframes:
+                    yield name, symbol, timeframe
+
+    def _venue_limit(self, exchange: str) -> asyncio.Semaphore:
+        if exchange not in self._venue_limits:
+            client = self.dex_manager.clients[exchange]
+            limit = client.config.get('ohlcv_concurrency', DEFAULT_OHLCV_CONCURRENCY)
+            self._venue_limits[exchange] = asyncio.Semaphore(limit)
+        return self._venue_limits[exchange]
+
+    async def _run_series(self, key: SeriesKey) -> np.ndarray | None:
+        exchange, symbol, timeframe = key
+        async with self._venue_limit(exchange):
+            with metrics.timer('stage_seconds', stage='candles', venue=exchange):
+                candles = await self.dex_manager.fetch_candles(exchange, symbol, timeframe, self.timeframes[timeframe])
+        if not candles:
+            return None
+
+        with metrics.timer('stage_seconds', stage='indicators', timeframe=timeframe):
+            return await self.backend.block(key, candles)
+
+    async def run(self) -> StrategySnapshot:
+        """Refreshes every series once and returns a snapshot of the latest data."""
+        keys = list(self.series())
+        blocks = await asyncio.gather(*(self._run_series(key) for key in keys), return_exceptions=True)
+
+        for key, block in zip(keys, blocks):
+            if isinstance(block, Exception):
+                self.errors[key] = str(block)
+                continue
+            self.errors.pop(key, None)
+            if block is None:
+                continue
+
+            exchange, symbol, timeframe = key
+            frames = self.results.setdefault((exchange, symbol), {})
+            previous = frames.get(timeframe)
+            if previous is None:
+                frames[timeframe] = SeriesSnapshot(exchange, symbol, timeframe, block)
+            else:
+                frames[timeframe] = previous.updated(block)
+
+        # Copy the outer dicts so readers never see a later run's changes
+        return StrategySnapshot({key: dict(frames) for key, frames in self.results.items()})
+
+    def close(self):
+        self.backend.close()
@@ -0,0 +1,29 @@
+# src/workers/signals.py
+
+from typing import Callable
+
+import numpy as np
+
+ADX_TREND = 20.0      # normal-duration ADX above this counts as trending
+RSI_OVERBOUGHT = 70.0 # short-duration RSI above this blocks new longs
+RSI_MACRO = 50.0      # long-duration RSI above this counts as a macro uptrend
+
+Column = Callable[[str], np.ndarray]  # COLUMNS name -> values, e.g. SeriesSnapshot.column
+
+
+def position(column: Column) -> np.ndarray:
+    """
+    Target position per bar, 1.0 long or 0.0 flat: positive MACD histogram
+    in a trending market (ADX) with macro momentum up (long RSI) and the
+    short RSI not overbought. Bars still warming up (NaN) stay flat.
+    The ticker shows it on the live 5m SeriesSnapshot; the backtester
+    replays it over whole stored series.
+    """
+    with np.errstate(invalid='ignore'):
+        long = (
+            (column('s_macdhist') > 0)
+            & (column('adx') > ADX_TREND)
+            & (column('l_rsi') > RSI_MACRO)
+            & (column('s_rsi') < RSI_OVERBOUGHT)
+        )
+    return long.astype(float)
@@ -0,0 +1,72 @@
+# src/workers/snapshot.py
+
+import itertools
+from typing import Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .indicators import COLUMNS, _ohlcv_frame
+
+# Column order of a series block: timestamp, OHLCV, then the indicator columns
+SERIES_COLUMNS = ['timestamp', 'open', 'high', 'low', 'close', 'volume', *COLUMNS]
+_COLUMN_INDEX = {name: i for i, name in enumerate(SERIES_COLUMNS)}
+
+_versions = itertools.count(1)
+
+
+class SeriesSnapshot:
+    """
+    Immutable strategy data for one (exchange, symbol, timeframe).
+    Every column is a read-only view into a single shared float block, so
+    readers get arrays without copying or deserializing anything.
+    """
+    def __init__(self, exchange: str, symbol: str, timeframe: str, data: np.ndarray):
+        data.setflags(write=False)
+        self.exchange = exchange
+        self.symbol = symbol
+        self.timeframe = timeframe
+        self.data = data
+        self.version = next(_versions)
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def column(self, name: str) -> np.ndarray:
+        """Zero-copy view of one column"""
+        return self.data[:, _COLUMN_INDEX[name]]
+
+    def last(self, name: str) -> float | None:
+        """Latest value of a column, or None if the series is empty"""
+        if not len(self.data):
+            return None
+        return float(self.data[-1, _COLUMN_INDEX[name]])
+
+    def frame(self) -> pd.DataFrame:
+        """The series as a DataFrame indexed by New York time (copies; for pandas consumers)"""
+        return _ohlcv_frame(self.data, SERIES_COLUMNS[1:])
+
+    def updated(self, data: np.ndarray) -> 'SeriesSnapshot':
+        """This snapshot if `data` is unchanged, otherwise a new version over `data`"""
+        if data.shape == self.data.shape and np.array_equal(data, self.data, equal_nan=True):
+            return self
+        return SeriesSnapshot(self.exchange, self.symbol, self.timeframe, data)
+
+
+class StrategySnapshot:
+    """
+    Everything the strategy pipeline produced in one run, keyed by
+    (exchange, symbol) then timeframe. `version` changes on every publish
+    while each series keeps its own version, so readers can skip the
+    series that did not change.
+    """
+    def __init__(self, series: Dict[Tuple[str, str], Dict[str, SeriesSnapshot]], error: str | None = None):
+        self.series = series
+        self.error = error
+        self.version = next(_versions)
+
+    def get(self, exchange: str, symbol: str, timeframe: str) -> SeriesSnapshot | None:
+        return self.series.get((exchange, symbol), {}).get(timeframe)
+
+    def keys(self) -> List[Tuple[str, str]]:
+        return list(self.series.keys())
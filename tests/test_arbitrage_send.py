@@ -0,0 +1,64 @@
+# tests/test_arbitrage_send.py
+
+import asyncio
+
+from solders.instruction import Instruction
+from solders.keypair import Keypair
+from solders.pubkey import Pubkey
+
+from src.client.quotes import PoolQuote
+from src.client.solana import SolanaClient
+
+POOL_A = str(Keypair().pubkey())
+POOL_B = str(Keypair().pubkey())
+
+
+class FakeResult:
+    ok = True
+    error = None
+    signature = "sig"
+    latency = 0.01
+
+
+class FakePipeline:
+    def __init__(self):
+        self.sent = []
+
+    async def send(self, instructions, signers=()):
+        self.sent.append(list(instructions))
+        return FakeResult()
+
+
+def client_with_quotes() -> tuple[SolanaClient, FakePipeline]:
+    client = SolanaClient("http://127.0.0.1:1", "", str(Keypair().pubkey()))
+
+    async def get_pool_quotes(pools):
+        # Pool b pays 2% more for token_a than pool a
+        return {POOL_A: PoolQuote(1_000.0, 100_000.0, 0.0025), POOL_B: PoolQuote(1_000.0, 102_000.0, 0.0025)}
+
+    pipeline = FakePipeline()
+    client.get_pool_quotes = get_pool_quotes
+    client._pipeline = lambda: pipeline
+    return client, pipeline
+
+
+def test_execute_arbitrage_sends_built_swaps():
+    client, pipeline = client_with_quotes()
+    swap = Instruction(Pubkey.default(), b"swap", [])
+    legs = []
+
+    def build_swaps(sell_amm, buy_amm, size, min_out):
+        legs.append((sell_amm, buy_amm, size, min_out))
+        return [swap, swap]
+
+    assert asyncio.run(client.execute_arbitrage(POOL_A, POOL_B, "A", "B", 5.0, build_swaps))
+    sell_amm, buy_amm, size, min_out = legs[0]
+    assert (sell_amm, buy_amm) == (POOL_B, POOL_A)
+    assert 0 < size <= 5.0 and min_out > size
+    assert pipeline.sent == [[swap, swap]]
+
+
+def test_execute_arbitrage_never_sends_empty_transaction():
+    client, pipeline = client_with_quotes()
+    assert not asyncio.run(client.execute_arbitrage(POOL_A, POOL_B, "A", "B", 5.0, lambda *leg: []))
+    assert pipeline.sent == []
@@ -0,0 +1,148 @@
+# tests/test_endpoints.py
+
+import asyncio
+
+from aiohttp import web
+
+from src.client.endpoints import EndpointPool
+from src.client.metrics import metrics
+
+
+class StubRpc:
+    """A local JSON-RPC node answering getSlot after `delay` seconds, or failing with a 500."""
+    def __init__(self, slot: int, delay: float = 0.0, failing: bool = False):
+        self.slot = slot
+        self.delay = delay
+        self.failing = failing
+        self.requests = 0
+        self.url = ""
+        self._runner: web.AppRunner | None = None
+
+    async def handle(self, request: web.Request) -> web.Response:
+        body = await request.json()
+        self.requests += 1
+        await asyncio.sleep(self.delay)
+        if self.failing:
+            return web.Response(status=500)
+        return web.json_response({"jsonrpc": "2.0", "id": body["id"], "result": self.slot})
+
+    async def start(self, path: str = "/") -> 'StubRpc':
+        app = web.Application()
+        app.router.add_post("/{tail:.*}", self.handle)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, "127.0.0.1", 0).start()
+        port = self._runner.addresses[0][1]
+        self.url = f"http://127.0.0.1:{port}{path}"
+        return self
+
+    async def close(self):
+        await self._runner.cleanup()
+
+
+async def slot(pool: EndpointPool) -> int:
+    return (await pool.read(lambda client: client.get_slot())).value
+
+
+def test_read_races_top_endpoints_and_takes_first_answer():
+    async def run():
+        fast, slow = await StubRpc(100).start(), await StubRpc(200, delay=0.5).start()
+        pool = EndpointPool([slow.url, fast.url], hedge=2)
+        try:
+            start = asyncio.get_running_loop().time()
+            value = await slot(pool)
+            elapsed = asyncio.get_running_loop().time() - start
+            return value, elapsed, slow.requests
+        finally:
+            await pool.close()
+            await fast.close()
+            await slow.close()
+
+    value, elapsed, slow_requests = asyncio.run(run())
+    assert value == 100
+    assert elapsed < 0.4
+    assert slow_requests == 1 # raced, then cancelled
+
+
+def test_read_falls_back_to_reserves_when_racers_fail():
+    async def run():
+        broken, healthy = await StubRpc(100, failing=True).start(), await StubRpc(101).start()
+        pool = EndpointPool([broken.url, healthy.url], hedge=1)
+        try:
+            return await slot(pool), pool.endpoints[0].failures
+        finally:
+            await pool.close()
+            await broken.close()
+            await healthy.close()
+
+    value, failures = asyncio.run(run())
+    assert value == 101
+    assert failures == 1
+
+
+def test_probe_scores_latency_and_slot_lag():
+    async def run():
+        slow = await StubRpc(1000, delay=0.1).start()
+        lagging = await StubRpc(995).start()
+        best = await StubRpc(1000).start()
+        pool = EndpointPool([slow.url, lagging.url, best.url], max_slot_lag=20)
+        try:
+            await pool.probe()
+            ranked = [endpoint.url for endpoint in pool.ranked()]
+            return ranked, [endpoint.slot_lag for endpoint in pool.endpoints], [slow.url, lagging.url, best.url]
+        finally:
+            await pool.close()
+            for stub in (slow, lagging, best):
+                await stub.close()
+
+    ranked, lags, (slow, lagging, best) = asyncio.run(run())
+    assert lags == [0, 5, 0]
+    # 5 slots of lag (2s) costs more than 100ms of latency
+    assert ranked == [best, slow, lagging]
+
+
+def test_probe_ejects_and_readmits():
+    async def run():
+        lagging = await StubRpc(900).start()
+        flaky = await StubRpc(1000, failing=True).start()
+        best = await StubRpc(1000).start()
+        pool = EndpointPool([lagging.url, flaky.url, best.url], max_slot_lag=20, eject_after=2)
+        try:
+            await pool.probe()
+            await pool.probe()
+            ejected = [not endpoint.healthy for endpoint in pool.endpoints]
+            reasons = [endpoint.eject_reason for endpoint in pool.endpoints]
+            in_rotation = [endpoint.url for endpoint in pool.ranked()]
+
+            # Both recover: caught up again and answering
+            lagging.slot, flaky.failing = 1000, False
+            await pool.probe()
+            readmitted = [endpoint.healthy for endpoint in pool.endpoints]
+            return ejected, reasons, in_rotation, readmitted, best.url
+        finally:
+            await pool.close()
+            for stub in (lagging, flaky, best):
+                await stub.close()
+
+    ejected, reasons, in_rotation, readmitted, best = asyncio.run(run())
+    assert ejected == [True, True, False]
+    assert "slots behind" in reasons[0] and "consecutive failures" in reasons[1]
+    assert in_rotation == [best]
+    assert readmitted == [True, True, True]
+
+
+def test_metric_labels_never_carry_the_rpc_key():
+    async def run():
+        stub = await StubRpc(100).start(path="/v1/SECRETKEY?api-key=SECRETKEY")
+        pool = EndpointPool([stub.url])
+        try:
+            await slot(pool)
+            return pool.endpoints[0].name, repr(pool.endpoints[0])
+        finally:
+            await pool.close()
+            await stub.close()
+
+    name, text = asyncio.run(run())
+    assert "SECRETKEY" not in name and "SECRETKEY" not in text
+    assert name.startswith("http://127.0.0.1:")
+    assert "SECRETKEY" not in metrics.prometheus()
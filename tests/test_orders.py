@@ -0,0 +1,48 @@
+# tests/test_orders.py
+
+import asyncio
+
+import pytest
+
+from src.client.orders import OrderEngine, OrderRequest
+
+
+class HungVenue:
+    """A venue whose first order never gets an answer; later ones fill at once"""
+
+    def __init__(self):
+        self.orders = 0
+
+    async def create_order(self, symbol, side, amount, price, params=None, raise_errors=False):
+        self.orders += 1
+        if self.orders == 1:
+            await asyncio.Event().wait()
+        return {"id": str(self.orders), "clientOrderId": params["clientOrderId"]}
+
+
+def test_hung_batch_does_not_stop_pruning():
+    async def run():
+        engine = OrderEngine({"venue": HungVenue()}, max_known=3)
+        engine.submit_batch([OrderRequest("venue", "SOL/USDC", "buy", 1.0)])
+        for _ in range(5):
+            await engine.place("venue", "SOL/USDC", "buy", 1.0)
+        engine.submit_batch([OrderRequest("venue", "SOL/USDC", "buy", 1.0)])
+        known = len(engine._known)
+        await engine.close()
+        return known
+
+    assert asyncio.run(run()) <= 3 + 1
+
+
+def test_close_cancels_waiting_callers():
+    async def run():
+        engine = OrderEngine({"venue": HungVenue()})
+        waiting = asyncio.create_task(engine.place("venue", "SOL/USDC", "buy", 1.0))
+        await asyncio.sleep(0.05)
+        await engine.close()
+        with pytest.raises(asyncio.CancelledError):
+            await asyncio.wait_for(waiting, timeout=1.0)
+        return engine
+
+    engine = asyncio.run(run())
+    assert not engine._unsettled
@@ -0,0 +1,109 @@
+# tests/test_pool_stream.py
+
+import asyncio
+import base64
+import json
+import math
+import struct
+
+import websockets
+from solders.keypair import Keypair
+from solders.pubkey import Pubkey
+
+from src.client import solana
+from src.client.pools import OrcaWhirlpoolDecoder, ORCA_WHIRLPOOL_PROGRAM_ID, MINT_DECIMALS_OFFSET
+from src.client.solana import SolanaClient
+
+POOL = str(Keypair().pubkey())
+MINT_A = str(Keypair().pubkey())
+MINT_B = str(Keypair().pubkey())
+PRICE = 150.0  # token a in token b, decimals 9 and 6
+
+
+def whirlpool_data(price: float) -> bytes:
+    data = bytearray(OrcaWhirlpoolDecoder.account_size)
+    sqrt_price = int(math.sqrt(price / 10 ** 3) * 2 ** 64)
+    struct.pack_into("<QQ", data, OrcaWhirlpoolDecoder.SQRT_PRICE, sqrt_price & (2 ** 64 - 1), sqrt_price >> 64)
+    data[OrcaWhirlpoolDecoder.TOKEN_MINT_A:OrcaWhirlpoolDecoder.TOKEN_MINT_A + 32] = bytes(Pubkey.from_string(MINT_A))
+    data[OrcaWhirlpoolDecoder.TOKEN_MINT_B:OrcaWhirlpoolDecoder.TOKEN_MINT_B + 32] = bytes(Pubkey.from_string(MINT_B))
+    return bytes(data)
+
+
+def mint_data(decimals: int) -> bytes:
+    data = bytearray(82)
+    data[MINT_DECIMALS_OFFSET] = decimals
+    return bytes(data)
+
+
+class FakePubsub:
+    """
+    accountSubscribe server. The first `refuse` connections are dropped
+    before any subscription is acked; every later one acks, sends one
+    accountNotification and drops.
+    """
+    def __init__(self, refuse: int):
+        self.refuse = refuse
+        self.connections = []   # loop time of each connection
+        self.subscribed = []    # addresses subscribed, per connection
+
+    async def handler(self, ws):
+        self.connections.append(asyncio.get_running_loop().time())
+        subscribed = []
+        self.subscribed.append(subscribed)
+        if len(self.connections) <= self.refuse:
+            await ws.close()
+            return
+        request = json.loads(await ws.recv())
+        subscribed.append(request["params"][0])
+        await ws.send(json.dumps({"jsonrpc": "2.0", "id": request["id"], "result": 7}))
+        await ws.send(json.dumps({
+            "jsonrpc": "2.0",
+            "method": "accountNotification",
+            "params": {
+                "subscription": 7,
+                "result": {
+                    "context": {"slot": 1},
+                    "value": {
+                        "data": [base64.b64encode(whirlpool_data(PRICE)).decode(), "base64"],
+                        "owner": ORCA_WHIRLPOOL_PROGRAM_ID,
+                    },
+                },
+            },
+        }))
+        await ws.close()
+
+
+def test_stream_decodes_reconnects_and_resets_backoff(monkeypatch):
+    monkeypatch.setattr(solana, "STREAM_BACKOFF_MIN", 0.05)
+    monkeypatch.setattr(solana, "STREAM_BACKOFF_MAX", 1.0)
+
+    async def run():
+        pubsub = FakePubsub(refuse=3)
+        prices = []
+        async with websockets.serve(pubsub.handler, "127.0.0.1", 0) as server:
+            port = server.sockets[0].getsockname()[1]
+            client = SolanaClient("http://127.0.0.1:1", "", str(Keypair().pubkey()), ws_url=f"ws://127.0.0.1:{port}")
+            # Mints never change, so seeding them keeps the test off RPC entirely
+            client._static_accounts = {MINT_A: mint_data(9), MINT_B: mint_data(6)}
+
+            stream = asyncio.create_task(client.stream_pool_prices(
+                {"SOL/USDC": (POOL, MINT_A, MINT_B)},
+                lambda symbol, price: prices.append((symbol, price)),
+            ))
+            while len(pubsub.connections) < 6:
+                await asyncio.sleep(0.01)
+            stream.cancel()
+        return pubsub, prices
+
+    pubsub, prices = asyncio.run(run())
+
+    assert prices and all(symbol == "SOL/USDC" for symbol, _ in prices)
+    assert math.isclose(prices[0][1], PRICE, rel_tol=1e-9)
+    # Every accepted connection subscribes to the pool again
+    assert pubsub.subscribed[3:5] == [[POOL], [POOL]]
+
+    gaps = [b - a for a, b in zip(pubsub.connections, pubsub.connections[1:])]
+    # Refused connections back off exponentially: 0.05, 0.1, 0.2
+    assert gaps[2] >= 0.18
+    # An acked subscription resets it, so the drop after it retries at the minimum
+    assert gaps[3] < 0.15 and gaps[4] < 0.15
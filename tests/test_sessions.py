@@ -0,0 +1,76 @@
+# tests/test_sessions.py
+
+import asyncio
+
+import ccxt.async_support as ccxt
+
+from src.client.sessions import SessionRegistry
+from .test_endpoints import StubRpc
+
+
+def count_calls(obj, name: str) -> list:
+    """Wraps an async method so every call is recorded"""
+    calls = []
+    original = getattr(obj, name)
+
+    async def wrapper(*args, **kwargs):
+        calls.append(args)
+        return await original(*args, **kwargs)
+
+    setattr(obj, name, wrapper)
+    return calls
+
+
+def test_rpc_clients_share_one_http_pool():
+    async def run():
+        node = await StubRpc(slot=100).start("/a")
+        urls = [node.url, node.url.replace("/a", "/b")] # Two URLs, e.g. two API keys, on one host
+        registry = SessionRegistry(max_per_host=4)
+        try:
+            first = registry.acquire_rpc(urls[0])
+            second = registry.acquire_rpc(urls[1])
+            assert second is not first
+            assert registry.acquire_rpc(urls[0]) is first # Reference counted per URL
+
+            session = first._provider.session
+            assert second._provider.session is session
+            # Same host, same in-flight cap
+            assert first._provider.limit is second._provider.limit
+            slots = [(await client.get_slot()).value for client in (first, second)]
+
+            closes = count_calls(session, "aclose")
+            await registry.release_rpc(urls[0])
+            await registry.release_rpc(urls[0])
+            assert not session.is_closed # Clients never close the shared pool
+            await registry.close()
+            await registry.close()
+            return slots, node.requests, session.is_closed, len(closes)
+        finally:
+            await node.close()
+
+    slots, requests, closed, closes = asyncio.run(run())
+    assert slots == [100, 100] and requests == 2
+    assert closed and closes == 1
+
+
+def test_exchanges_share_one_aiohttp_session():
+    async def run():
+        registry = SessionRegistry()
+        exchanges = [ccxt.binance(), ccxt.kraken()]
+        for exchange in exchanges:
+            assert registry.attach_exchange(exchange)
+        session = exchanges[0].session
+        same = exchanges[1].session is session
+
+        closes = count_calls(session, "close")
+        for exchange in exchanges:
+            await exchange.close()
+        open_after_exchanges = not session.closed
+        await registry.close()
+        await registry.close()
+        return same, open_after_exchanges, session.closed, len(closes)
+
+    same, open_after_exchanges, closed, closes = asyncio.run(run())
+    assert same
+    assert open_after_exchanges # ccxt leaves a session it did not create open
+    assert closed and closes == 1
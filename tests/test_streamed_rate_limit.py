@@ -0,0 +1,60 @@
+# tests/test_streamed_rate_limit.py
+
+import asyncio
+
+import ccxt.pro as ccxtpro
+
+from src.client.manager import DexManager
+from src.client.ratelimit import PRIORITY_MARKET_DATA
+
+CONFIG = """
+active_exchanges = ["binance"]
+persist_market_data = false
+
+[exchanges.binance]
+id = "binance"
+symbols = ["BTC/USDT"]
+stream = true
+"""
+
+
+def test_streamed_venue_rest_call_passes_one_limiter(tmp_path):
+    config = tmp_path / "config.toml"
+    config.write_text(CONFIG)
+
+    async def run():
+        manager = DexManager(config)
+        client = manager.clients["binance"]
+        raw = client._client
+        calls = {"limiter": 0, "ccxt_throttle": 0, "http": 0}
+
+        acquire = client.limiter.acquire
+
+        async def counted_acquire(*args, **kwargs):
+            calls["limiter"] += 1
+            return await acquire(*args, **kwargs)
+
+        throttle = raw.throttle
+
+        async def counted_throttle(*args, **kwargs):
+            calls["ccxt_throttle"] += 1
+            return await throttle(*args, **kwargs)
+
+        async def fetch(url, method="GET", headers=None, body=None):
+            calls["http"] += 1
+            return {"serverTime": 1}
+
+        client.limiter.acquire = counted_acquire
+        raw.throttle = counted_throttle
+        raw.fetch = fetch
+        try:
+            result = await client._request(PRIORITY_MARKET_DATA, 'fetch_time')
+        finally:
+            await manager.close_all()
+        return raw, result, calls
+
+    raw, result, calls = asyncio.run(run())
+    assert isinstance(raw, ccxtpro.Exchange)
+    assert not raw.enableRateLimit
+    assert result == 1
+    assert calls == {"limiter": 1, "ccxt_throttle": 0, "http": 1}